@@ -3,6 +3,7 @@ import os
 import json
 import sys
 import getpass
+import signal
 from munch import Munch
 from aeternity import _version
 
@@ -12,6 +13,7 @@ from aeternity.identifiers import NETWORK_ID_MAINNET
 from . import utils, signing, aens, defaults, exceptions
 from aeternity.compiler import CompilerClient
 from aeternity.openapi import OpenAPIClientException
+from aeternity.key_agent import KeyAgent, KeyAgentClient
 from datetime import datetime, timezone
 
 
@@ -24,6 +26,7 @@ CTX_AET_DOMAIN = 'AET_NAME'
 CTX_FORCE_COMPATIBILITY = 'CTX_FORCE_COMPATIBILITY'
 CTX_BLOCKING_MODE = 'CTX_BLOCKING_MODE'
 CTX_OUTPUT_JSON = 'CTX_OUTPUT_JSON'
+CTX_AGENT_SOCKET = 'CTX_AGENT_SOCKET'
 
 
 def _node_cli(network_id=None):
@@ -36,7 +39,8 @@ def _node_cli(network_id=None):
             websocket_url=ctx.obj.get(CTX_NODE_WS),
             force_compatibility=ctx.obj.get(CTX_FORCE_COMPATIBILITY),
             blocking_mode=ctx.obj.get(CTX_BLOCKING_MODE),
-            network_id=network_id
+            network_id=network_id,
+            api_spec_cache=defaults.API_SPEC_CACHE_DIR,
         )
         # load the aeternity node client
         return NodeClient(cfg)
@@ -47,9 +51,10 @@ def _node_cli(network_id=None):
         _print_error(e, exit_code=1)
 
 
-def _account(keystore_name, password=None):
+def _account(keystore_name, password=None, use_agent=True):
     """
     utility function to get the keypair from the click context
+    :param use_agent: whenever to use the account unlocked in the key agent, if any, the agent does not expose the secret key
     :return: (account, keypath)
     """
     ctx = click.get_current_context()
@@ -57,6 +62,15 @@ def _account(keystore_name, password=None):
     if not os.path.exists(kf):
         print(f'Key file {kf} does not exits.')
         exit(1)
+    # use the account unlocked in the key agent, if any
+    agent_socket = ctx.obj.get(CTX_AGENT_SOCKET)
+    if use_agent and password is None and agent_socket is not None and os.path.exists(agent_socket):
+        try:
+            account = KeyAgentClient(agent_socket).account(path=kf)
+            if account is not None:
+                return account, os.path.abspath(kf)
+        except exceptions.KeyAgentException:
+            pass
     try:
         if password is None:
             password = getpass.getpass("Enter the account password: ")
@@ -227,15 +241,18 @@ def set_global_options(json_, force=False, wait=False):
 @click.version_option()
 @click.option('--url', '-u', default='https://sdk-mainnet.aepps.com', envvar='NODE_URL', help='Aeternity node url', metavar='URL')
 @click.option('--debug-url', '-d', default=None, envvar='NODE_URL_DEBUG', metavar='URL')
+@click.option('--agent-socket', default=defaults.KEY_AGENT_SOCKET, envvar='KEY_AGENT_SOCKET',
+              help='Key agent socket, the accounts unlocked in the agent are used without a password', metavar='PATH')
 @global_options
 @click.version_option(version=_version())
-def cli(ctx, url, debug_url, json_):
+def cli(ctx, url, debug_url, agent_socket, json_):
     """
     Welcome to the Python CLI for the Aeternty blockchain
 
     """
     ctx.obj[CTX_NODE_URL] = url
     ctx.obj[CTX_NODE_URL_DEBUG] = debug_url
+    ctx.obj[CTX_AGENT_SOCKET] = agent_socket
 
 
 @cli.command('config', help="Print the client configuration")
@@ -314,7 +331,7 @@ def account_save(keystore_name, secret_key, password, overwrite, json_):
 def account_address(password, keystore_name, secret_key, json_):
     try:
         set_global_options(json_)
-        account, _ = _account(keystore_name, password=password)
+        account, _ = _account(keystore_name, password=password, use_agent=not secret_key)
         o = {'Address': account.get_address()}
         if secret_key:
             click.confirm(f'!Warning! this will print your secret key on the screen, are you sure?', abort=True)
@@ -414,6 +431,80 @@ def account_sign(keystore_name, password, network_id, unsigned_transaction, json
     except Exception as e:
         _print_error(e, exit_code=1)
 
+
+@cli.group(help="Hold unlocked accounts in a key agent, to sign without decrypting the keystores for each command")
+def agent():
+    pass
+
+
+@agent.command('start', help="Start a key agent, unlocking the given keystores, and serve the clients until interrupted")
+@click.argument('keystore_names', nargs=-1)
+@click.option('--idle-timeout', type=float, default=defaults.KEY_AGENT_IDLE_TIMEOUT, show_default=True,
+              help="Time in seconds after which an unused account is removed from the agent, 0 to keep the accounts")
+@click.option('--processes', type=int, default=None, help="Number of processes used to unlock the keystores in parallel")
+@global_options
+@account_options
+@click.pass_context
+def agent_start(ctx, keystore_names, idle_timeout, processes, password, json_):
+    try:
+        set_global_options(json_)
+        key_agent = KeyAgent(ctx.obj.get(CTX_AGENT_SOCKET), idle_timeout=idle_timeout)
+        if password is None and len(keystore_names) > 0:
+            password = getpass.getpass("Enter the accounts password: ")
+        addresses = key_agent.add_keystores([(k, password) for k in keystore_names], processes=processes)
+        _print_object({
+            'Socket': key_agent.socket_path,
+            'Accounts': addresses,
+        }, title='key agent')
+        sys.stdout.flush()
+        # exit cleanly on termination, removing the socket
+        signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+        key_agent.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    except Exception as e:
+        _print_error(e, exit_code=1)
+
+
+@agent.command('add', help="Unlock a keystore in the key agent")
+@click.argument('keystore_name', required=True)
+@global_options
+@account_options
+@click.pass_context
+def agent_add(ctx, keystore_name, password, json_):
+    try:
+        set_global_options(json_)
+        if password is None:
+            password = getpass.getpass("Enter the account password: ")
+        address = KeyAgentClient(ctx.obj.get(CTX_AGENT_SOCKET)).add_keystore(keystore_name, password)
+        _print_object({'Address': address, 'Path': os.path.abspath(keystore_name)}, title='account')
+    except Exception as e:
+        _print_error(e, exit_code=1)
+
+
+@agent.command('list', help="List the accounts unlocked in the key agent")
+@global_options
+@click.pass_context
+def agent_list(ctx, json_):
+    try:
+        set_global_options(json_)
+        accounts = KeyAgentClient(ctx.obj.get(CTX_AGENT_SOCKET)).list()
+        _print_object({"Accounts": [{"Address": a["address"], "Path": a["path"]} for a in accounts]}, title="key agent")
+    except Exception as e:
+        _print_error(e, exit_code=1)
+
+
+@agent.command('lock', help="Remove all the accounts from the key agent")
+@global_options
+@click.pass_context
+def agent_lock(ctx, json_):
+    try:
+        set_global_options(json_)
+        KeyAgentClient(ctx.obj.get(CTX_AGENT_SOCKET)).lock_all()
+    except Exception as e:
+        _print_error(e, exit_code=1)
+
+
 #   _________  ____  ____
 #  |  _   _  ||_  _||_  _|
 #  |_/ | | \_|  \ \  / /
@@ -973,23 +1064,19 @@ def chain_play(height,  limit, force, wait, json_):
     try:
         set_global_options(json_, force, wait)
         cli = _node_cli()
-        g = cli.get_generation_by_height(height=height) if height is not None else cli.get_current_generation()
         # check the limit
-        limit = limit if limit > 0 else 0
-        while g is not None and limit > 0:
-            v = g
+        if limit <= 0:
+            return
+        to_height = height if height is not None else cli.get_current_key_block_height()
+        from_height = max(0, to_height - limit + 1)
+        for g in cli.iter_generations(from_height, to_height, reverse=True, decode=False):
+            v = {"key_block": g.key_block, "micro_blocks": []}
             # if there are microblocks print the transactions
             if len(g.micro_blocks) > 0:
-                txs = []
-                for mb in g.micro_blocks:
-                    txs.append(cli.get_micro_block_transactions_by_hash(hash=mb))
+                txs = [{"transactions": mb.transactions} for mb in g.micro_blocks]
                 v = {"keyblock": g.key_block, "Microblocks": txs}
             _print_object(v, title='generation')
             print('')
-            limit -= 1
-            if limit <= 0:
-                break
-            g = cli.get_generation_by_hash(hash=g.key_block.prev_key_hash)
     except Exception as e:
         _print_error(e)
 
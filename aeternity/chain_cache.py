@@ -0,0 +1,224 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+
+from munch import Munch
+
+from aeternity import defaults
+
+logger = logging.getLogger(__name__)
+
+
+def _generation_height(reply):
+    return reply.key_block.height
+
+
+def _block_height(reply):
+    return reply.height
+
+
+def _transactions_height(reply):
+    # the micro block height is only known through its transactions
+    txs = reply.get("transactions", [])
+    return txs[0].block_height if len(txs) > 0 else None
+
+
+def _transaction_height(reply):
+    # the pending transactions have a negative height
+    return reply.block_height
+
+
+# the cached api methods: the names of the arguments that identify the reply,
+# the function to get the height from the reply, or the name of the argument holding the height
+CACHED_METHODS = {
+    "get_generation_by_height": (("height",), "height"),
+    "get_generation_by_hash": (("hash",), _generation_height),
+    "get_key_block_by_height": (("height",), "height"),
+    "get_key_block_by_hash": (("hash",), _block_height),
+    "get_micro_block_header_by_hash": (("hash",), _block_height),
+    "get_micro_block_transactions_by_hash": (("hash",), _transactions_height),
+    "get_transaction_by_hash": (("hash",), _transaction_height),
+    "get_account_by_pubkey_and_height": (("pubkey", "height"), "height"),
+}
+
+SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS entries (
+        key TEXT PRIMARY KEY,
+        value TEXT NOT NULL,
+        height INTEGER,
+        final INTEGER NOT NULL,
+        created REAL NOT NULL,
+        accessed REAL NOT NULL
+    )""",
+    "CREATE INDEX IF NOT EXISTS entries_mutable ON entries (final, accessed)",
+    """CREATE TABLE IF NOT EXISTS tx_index (
+        tx_hash TEXT PRIMARY KEY,
+        block_hash TEXT NOT NULL,
+        block_height INTEGER NOT NULL
+    )""",
+]
+
+
+class ChainCache:
+    """
+    A persistent cache of the chain data, stored in a SQLite database.
+    It wraps the api client of the NodeClient and exposes the same api methods.
+
+    The replies of the historical queries (generations, key and micro blocks, transactions
+    and accounts at a given height) are stored by hash and height.
+    The entries for the blocks that are at least finality_depth blocks below the top of the chain
+    never change and are kept forever, the more recent ones are mutable: they expire after
+    mutable_max_age seconds and at most max_mutable_entries are kept, evicting the least recently used.
+
+    The transactions of the cached micro blocks are indexed by hash, so that get_transaction_by_hash
+    is served from the cache for the transactions of the blocks already retrieved.
+
+    The cache is thread safe.
+
+    Args:
+        api: the api client to wrap, an OpenAPICli or a NodePool
+        path (str): the path of the SQLite database, ":memory:" for a cache that is not persisted
+        finality_depth (int): the number of blocks after which a block is considered final
+        max_mutable_entries (int): the max number of mutable entries kept in the cache
+        mutable_max_age (float): the time in seconds after which a mutable entry expires, it is also
+            the max age of the top height used to tell if a block is final
+    """
+
+    def __init__(self, api, path,
+                 finality_depth=defaults.CHAIN_CACHE_FINALITY_DEPTH,
+                 max_mutable_entries=defaults.CHAIN_CACHE_MAX_MUTABLE_ENTRIES,
+                 mutable_max_age=defaults.CHAIN_CACHE_MUTABLE_MAX_AGE):
+        self.api = api
+        self.path = path
+        self.finality_depth = finality_depth
+        self.max_mutable_entries = max_mutable_entries
+        self.mutable_max_age = mutable_max_age
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        with self.lock, self.db:
+            for statement in SCHEMA:
+                self.db.execute(statement)
+        # the top height of the chain, refreshed every mutable_max_age seconds
+        self.top_height = None
+        self.top_height_at = 0
+        # statistics
+        self.hits = 0
+        self.misses = 0
+
+    def _get_top_height(self):
+        if self.top_height is None or time.time() - self.top_height_at >= self.mutable_max_age:
+            self.top_height = self.api.get_current_key_block_height()
+            self.top_height_at = time.time()
+        return self.top_height
+
+    def _is_final(self, height):
+        return height is not None and 0 <= height <= self._get_top_height() - self.finality_depth
+
+    def _response(self, value):
+        """convert a cached value to a reply, like the api client does"""
+        factory = getattr(self.api, "response_factory", Munch.fromDict)
+        return factory(json.loads(value))
+
+    def _load(self, key):
+        """get a valid entry from the cache, None if it is missing or expired"""
+        now = time.time()
+        with self.lock:
+            row = self.db.execute("SELECT value, final, created FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            value, final, created = row
+            if not final:
+                if now - created >= self.mutable_max_age:
+                    with self.db:
+                        self.db.execute("DELETE FROM entries WHERE key = ?", (key,))
+                    return None
+                with self.db:
+                    self.db.execute("UPDATE entries SET accessed = ? WHERE key = ?", (now, key))
+        return value
+
+    def _store(self, key, reply, height, final):
+        """store a reply in the cache, evicting the least recently used mutable entries if necessary"""
+        now = time.time()
+        value = json.dumps(Munch.toDict(reply))
+        with self.lock, self.db:
+            self.db.execute("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?)", (key, value, height, int(final), now, now))
+            if not final:
+                self.db.execute("""DELETE FROM entries WHERE key IN (
+                    SELECT key FROM entries WHERE final = 0 ORDER BY accessed DESC LIMIT -1 OFFSET ?)""", (self.max_mutable_entries,))
+
+    def _index_transactions(self, block_hash, reply):
+        """index the transactions of a micro block by hash"""
+        rows = [(tx.hash, block_hash, tx.block_height) for tx in reply.get("transactions", [])]
+        with self.lock, self.db:
+            self.db.executemany("INSERT OR REPLACE INTO tx_index VALUES (?, ?, ?)", rows)
+
+    def get_transaction_block(self, tx_hash):
+        """
+        Get the micro block including a transaction from the index
+
+        :param tx_hash: the transaction hash
+        :return: a tuple (block_hash, block_height), None if the transaction is not indexed
+        """
+        with self.lock:
+            return self.db.execute("SELECT block_hash, block_height FROM tx_index WHERE tx_hash = ?", (tx_hash,)).fetchone()
+
+    def _indexed_transaction(self, tx_hash):
+        """get a transaction from the cached transactions of its micro block"""
+        block = self.get_transaction_block(tx_hash)
+        if block is None:
+            return None
+        value = self._load(f"get_micro_block_transactions_by_hash:{block[0]}")
+        if value is None:
+            return None
+        for tx in json.loads(value).get("transactions", []):
+            if tx.get("hash") == tx_hash:
+                return json.dumps(tx)
+        return None
+
+    def _cached_call(self, method, kwargs):
+        arg_names, height_source = CACHED_METHODS[method]
+        key = ":".join([method, *[str(kwargs.get(name)) for name in arg_names]])
+        value = self._load(key)
+        if value is None and method == "get_transaction_by_hash":
+            value = self._indexed_transaction(kwargs.get("hash"))
+        if value is not None:
+            self.hits += 1
+            return self._response(value)
+        self.misses += 1
+        reply = getattr(self.api, method)(**kwargs)
+        height = kwargs.get(height_source) if isinstance(height_source, str) else height_source(reply)
+        if height is None or height < 0:
+            # not yet included in the chain
+            return reply
+        self._store(key, reply, height, self._is_final(height))
+        if method == "get_micro_block_transactions_by_hash":
+            self._index_transactions(kwargs.get("hash"), reply)
+        return reply
+
+    def clear(self):
+        """remove all the entries from the cache"""
+        with self.lock, self.db:
+            self.db.execute("DELETE FROM entries")
+            self.db.execute("DELETE FROM tx_index")
+
+    def close(self):
+        """close the database"""
+        with self.lock:
+            self.db.close()
+
+    def __getattr__(self, attr):
+        api = self.__dict__.get("api")
+        if api is None:
+            raise AttributeError(attr)
+        if attr not in CACHED_METHODS:
+            return getattr(api, attr)
+
+        def api_method(*args, **kwargs):
+            if len(args) > 0:
+                # the cache keys are built from the keyword arguments
+                return getattr(self.api, attr)(*args, **kwargs)
+            return self._cached_call(attr, kwargs)
+        api_method.__name__ = attr
+        return api_method
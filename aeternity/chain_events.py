@@ -0,0 +1,288 @@
+import asyncio
+import heapq
+import itertools
+import json
+import logging
+import threading
+from concurrent.futures import Future, TimeoutError
+from urllib.parse import urlparse
+
+import websockets
+
+from aeternity import defaults
+from aeternity.exceptions import TransactionWaitTimeoutExpired
+from aeternity.openapi import OpenAPIClientException
+
+logger = logging.getLogger(__name__)
+
+# the node websocket subscriptions
+SUBSCRIPTION_KEY_BLOCKS = "KeyBlocks"
+SUBSCRIPTION_MICRO_BLOCKS = "MicroBlocks"
+
+
+def _websocket_endpoint(url):
+    """get the url of the node websocket endpoint from the configured websocket url"""
+    parsed = urlparse(url)
+    scheme = {"http": "ws", "https": "wss"}.get(parsed.scheme, parsed.scheme)
+    path = parsed.path if parsed.path not in ["", "/"] else "/websocket"
+    return parsed._replace(scheme=scheme, path=path).geturl()
+
+
+class ChainEvents:
+    """
+    Follow the chain through the subscriptions to the key blocks and micro blocks
+    of the node websocket, and resolve the waits for transactions and heights from the events.
+
+    The websocket is handled by a background thread started with start, that reconnects
+    to the node when the connection is lost. The waits in progress when the connection
+    is lost fail with a ConnectionError, so that the caller can fall back to polling.
+
+    The awaited transactions are checked with the node api at each key block and every
+    recheck_interval seconds, so that the waits for the transactions dropped by the node
+    fail with the reason reported by the node.
+
+    When the client has a height cache, it is updated with the height of the key blocks.
+
+    Args:
+        client (NodeClient): the client used to retrieve the transactions of the micro blocks
+        websocket_url (str): the node websocket url
+        connect_timeout (float): the max time in seconds to wait for the first connection
+        reconnect_interval (float): the time in seconds between reconnection attempts
+        recheck_interval (float): the time in seconds between the checks of the awaited transactions
+    """
+
+    def __init__(self, client, websocket_url,
+                 connect_timeout=defaults.WEBSOCKET_CONNECT_TIMEOUT,
+                 reconnect_interval=defaults.WEBSOCKET_RECONNECT_INTERVAL,
+                 recheck_interval=defaults.WEBSOCKET_RECHECK_INTERVAL):
+        self.client = client
+        self.url = _websocket_endpoint(websocket_url)
+        self.connect_timeout = connect_timeout
+        self.reconnect_interval = reconnect_interval
+        self.recheck_interval = recheck_interval
+        # the top key block height, from the events
+        self.height = None
+        self.connected = threading.Event()
+        self.lock = threading.Lock()
+        # the futures waiting for a transaction, by transaction hash
+        self.tx_waiters = {}
+        # the futures waiting for a height, as a heap of (height, sequence, future)
+        self.height_waiters = []
+        self._sequence = itertools.count()
+        self._thread = None
+        self._loop = None
+        self._task = None
+
+    def start(self):
+        """
+        Start following the chain, if not started yet
+
+        :return: true if the websocket is connected, waiting up to connect_timeout seconds for the first connection
+        """
+        with self.lock:
+            starting = self._thread is None
+            if starting:
+                self._thread = threading.Thread(target=self._run_loop, name="chain-events", daemon=True)
+                self._thread.start()
+        if starting:
+            self.connected.wait(self.connect_timeout)
+        return self.connected.is_set()
+
+    def stop(self):
+        """close the websocket and stop following the chain"""
+        with self.lock:
+            loop, task, thread = self._loop, self._task, self._thread
+            self._thread = None
+        if loop is not None and task is not None:
+            loop.call_soon_threadsafe(task.cancel)
+        if thread is not None:
+            thread.join()
+
+    def _run_loop(self):
+        self._loop = asyncio.new_event_loop()
+        self._task = self._loop.create_task(self._follow())
+        try:
+            self._loop.run_until_complete(self._task)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self._loop.close()
+            self._loop = None
+
+    async def _follow(self):
+        """read the events from the node, reconnecting when the connection is lost"""
+        while True:
+            try:
+                async with websockets.connect(self.url) as ws:
+                    for subscription in [SUBSCRIPTION_KEY_BLOCKS, SUBSCRIPTION_MICRO_BLOCKS]:
+                        await ws.send(json.dumps({"op": "Subscribe", "payload": subscription}))
+                    self.connected.set()
+                    logger.debug(f"subscribed to the chain events of {self.url}")
+                    recheck = asyncio.get_event_loop().create_task(self._recheck_periodically())
+                    try:
+                        async for message in ws:
+                            self._handle(json.loads(message))
+                    finally:
+                        recheck.cancel()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"chain events connection to {self.url} failed: {e}")
+            finally:
+                self.connected.clear()
+                self._fail_waiters(ConnectionError(f"chain events connection to {self.url} lost"))
+            await asyncio.sleep(self.reconnect_interval)
+
+    async def _recheck_periodically(self):
+        """check the awaited transactions with the node every recheck_interval seconds"""
+        while True:
+            await asyncio.sleep(self.recheck_interval)
+            if len(self.tx_waiters) > 0:
+                self._run_in_executor(self._check_transactions)
+
+    def _run_in_executor(self, fn, *args):
+        """run a blocking function, like a node api call, without blocking the events"""
+        asyncio.get_event_loop().run_in_executor(None, fn, *args)
+
+    def _handle(self, message):
+        """handle a message from the node"""
+        if not isinstance(message, dict):
+            # subscriptions acknowledgement
+            return
+        subscription = message.get("subscription")
+        payload = message.get("payload", {})
+        if subscription == SUBSCRIPTION_KEY_BLOCKS:
+            self._on_height(payload.get("height"))
+            if len(self.tx_waiters) > 0:
+                self._run_in_executor(self._check_transactions)
+        elif subscription == SUBSCRIPTION_MICRO_BLOCKS and len(self.tx_waiters) > 0:
+            self._run_in_executor(self._check_micro_block, payload.get("hash"))
+
+    def _on_height(self, height):
+        """resolve the waits for the heights up to a new top height"""
+        if height is None:
+            return
+        with self.lock:
+            self.height = max(self.height or 0, height)
+            resolved = []
+            while len(self.height_waiters) > 0 and self.height_waiters[0][0] <= self.height:
+                resolved.append(heapq.heappop(self.height_waiters)[2])
+        height_cache = getattr(self.client, "height_cache", None)
+        if height_cache is not None:
+            height_cache.update(height)
+        for future in resolved:
+            if not future.done():
+                future.set_result(height)
+
+    def _on_transaction(self, tx_hash, block_height):
+        """resolve the waits for a transaction that has been included in a block"""
+        with self.lock:
+            futures = self.tx_waiters.pop(tx_hash, [])
+        for future in futures:
+            if not future.done():
+                future.set_result(block_height)
+
+    def _check_micro_block(self, block_hash):
+        """look for the awaited transactions in a new micro block"""
+        try:
+            reply = self.client.get_micro_block_transactions_by_hash(hash=block_hash)
+            for tx in reply.transactions:
+                self._on_transaction(tx.hash, tx.block_height)
+        except Exception as e:
+            logger.warning(f"cannot retrieve the transactions of micro block {block_hash}: {e}")
+
+    def _check_transaction(self, tx_hash):
+        """check with the node api if a transaction has been included already"""
+        try:
+            tx = self.client.get_transaction_by_hash(hash=tx_hash)
+        except OpenAPIClientException as e:
+            with self.lock:
+                futures = self.tx_waiters.pop(tx_hash, [])
+            for future in futures:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        if tx.block_height >= 0:
+            self._on_transaction(tx_hash, tx.block_height)
+
+    def _check_transactions(self):
+        """check with the node api the awaited transactions, the ones dropped by the node fail"""
+        with self.lock:
+            tx_hashes = list(self.tx_waiters.keys())
+        for tx_hash in tx_hashes:
+            try:
+                self._check_transaction(tx_hash)
+            except Exception as e:
+                logger.warning(f"cannot check the transaction {tx_hash}: {e}")
+
+    def _fail_waiters(self, error):
+        """fail the waits in progress, the events may be missed while disconnected"""
+        with self.lock:
+            futures = [f for fs in self.tx_waiters.values() for f in fs] + [w[2] for w in self.height_waiters]
+            self.tx_waiters = {}
+            self.height_waiters = []
+        for future in futures:
+            if not future.done():
+                future.set_exception(error)
+
+    def _wait(self, future, timeout, tx_hash, reason):
+        try:
+            return future.result(timeout)
+        except TimeoutError:
+            raise TransactionWaitTimeoutExpired(tx_hash=tx_hash, reason=reason)
+
+    def wait_for_transaction(self, tx_hash, timeout):
+        """
+        Wait for a transaction to be included in a block
+
+        :param tx_hash: the hash of the transaction
+        :param timeout: the max time to wait in seconds
+        :return: the height of the block including the transaction
+        :raises TransactionWaitTimeoutExpired: if the transaction is not included before the timeout
+            or it is not known to the node
+        :raises ConnectionError: if the websocket is not connected or the connection is lost while waiting
+        """
+        if not self.connected.is_set():
+            raise ConnectionError(f"chain events not connected to {self.url}")
+        future = Future()
+        with self.lock:
+            self.tx_waiters.setdefault(tx_hash, []).append(future)
+        # the transaction may be included already
+        self._check_transaction(tx_hash)
+        try:
+            return self._wait(future, timeout, tx_hash, f"The transaction was not included in {timeout} seconds, wait aborted")
+        except OpenAPIClientException as e:
+            reason = e.reason if hasattr(e, "reason") else "Timeout expired"
+            raise TransactionWaitTimeoutExpired(tx_hash=tx_hash, reason=reason)
+        finally:
+            with self.lock:
+                futures = self.tx_waiters.get(tx_hash, [])
+                if future in futures:
+                    futures.remove(future)
+                if len(futures) == 0:
+                    self.tx_waiters.pop(tx_hash, None)
+
+    def wait_for_height(self, height, timeout, tx_hash=None):
+        """
+        Wait for the chain to reach a key block height
+
+        :param height: the height to wait for
+        :param timeout: the max time to wait in seconds
+        :param tx_hash: the transaction the wait is for, used for reporting
+        :return: the top height of the chain
+        :raises TransactionWaitTimeoutExpired: if the height is not reached before the timeout
+        :raises ConnectionError: if the websocket is not connected or the connection is lost while waiting
+        """
+        if not self.connected.is_set():
+            raise ConnectionError(f"chain events not connected to {self.url}")
+        future = Future()
+        with self.lock:
+            heapq.heappush(self.height_waiters, (height, next(self._sequence), future))
+        # the height may be reached already
+        self._on_height(self.client.get_current_key_block_height())
+        try:
+            return self._wait(future, timeout, tx_hash, f"The height {height} was not reached in {timeout} seconds, wait aborted")
+        finally:
+            with self.lock:
+                self.height_waiters = [w for w in self.height_waiters if w[2] is not future]
+                heapq.heapify(self.height_waiters)
@@ -0,0 +1,263 @@
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from aeternity import defaults, transactions
+from aeternity.exceptions import TransactionWaitTimeoutExpired
+from aeternity.nonce_manager import _tx_sender_nonce
+from aeternity.openapi import OpenAPIClientException
+
+logger = logging.getLogger(__name__)
+
+
+class TrackedTransaction:
+    """
+    The state of a transaction tracked by a ConfirmationTracker
+    """
+
+    def __init__(self, tx_hash, future):
+        self.tx_hash = tx_hash
+        self.future = future
+        # the sender, nonce and ttl of the transaction, known once the transaction has been retrieved
+        self.sender = None
+        self.nonce = None
+        self.ttl = 0
+        # the height of the block including the transaction, None if it is not included
+        self.block_height = None
+        # whenever the transaction has been looked up already
+        self.looked_up = False
+
+    def set_fields(self, tx):
+        """set the sender, nonce and ttl from a TxObject or the tx of a node reply"""
+        self.sender, self.nonce = _tx_sender_nonce(tx)
+        self.ttl = tx.get("ttl") or 0
+
+
+class ConfirmationTracker:
+    """
+    Track the confirmation of many transactions in shared rounds.
+
+    Each round retrieves the chain height once, scans the micro blocks added since the previous
+    round for the tracked transactions and checks the expiry of the transactions not yet included,
+    so that the load on the node grows with the number of rounds and blocks instead of with
+    the number of transactions. A transaction is looked up individually only when it starts
+    being tracked, when its sender nonce shows that it may have been replaced, and when it
+    reaches the confirmation depth, to verify that it has not been dropped by a micro fork.
+
+    A transaction is confirmed when the chain height is at least its block height plus confirmations,
+    its future is resolved with the block height.
+    It expires, and its future fails with TransactionWaitTimeoutExpired, when:
+    - the node does not know the transaction
+    - the chain height is past the ttl of the transaction and it has not been included
+    - the nonce of the sender has been used by another transaction
+
+    The rounds are run by poll, or in a background thread with start. The tracker is thread safe.
+
+    Args:
+        client (NodeClient): the client used to query the node
+        confirmations (int): the number of key blocks after the transaction block required to confirm it,
+            default to the key_block_confirmation_num of the client configuration
+        max_in_flight (int): the max number of concurrent requests in a round,
+            default to the http_pool_maxsize of the client configuration
+    """
+
+    def __init__(self, client, confirmations=None, max_in_flight=None):
+        self.client = client
+        self.confirmations = confirmations if confirmations is not None else client.config.key_block_confirmation_num
+        self.max_in_flight = max_in_flight or client.config.http_pool_maxsize
+        self.lock = threading.Lock()
+        self.round_lock = threading.Lock()
+        # the tracked transactions by hash
+        self.tracked = {}
+        # the height scanned by the last round, its micro blocks are scanned again for the new ones
+        self.scanned_height = None
+        self.scanned_micro_blocks = set()
+        # statistics
+        self.rounds = 0
+        self._stop = None
+
+    @property
+    def pending(self):
+        """the number of transactions tracked and not yet confirmed or expired"""
+        return len(self.tracked)
+
+    def track(self, tx, callback=None) -> Future:
+        """
+        Track the confirmation of a transaction
+
+        :param tx: the TxObject or the hash of the transaction
+        :param callback: a function called with the future when the transaction is confirmed or expired
+        :return: a Future resolved with the block height of the transaction
+        """
+        tx_hash = tx.hash if isinstance(tx, transactions.TxObject) else tx
+        with self.lock:
+            entry = self.tracked.get(tx_hash)
+            if entry is None:
+                entry = TrackedTransaction(tx_hash, Future())
+                if isinstance(tx, transactions.TxObject):
+                    entry.set_fields(tx)
+                self.tracked[tx_hash] = entry
+        if callback is not None:
+            entry.future.add_done_callback(callback)
+        return entry.future
+
+    def track_many(self, txs, callback=None) -> list:
+        """
+        Track the confirmation of a list of transactions, see track
+
+        :return: the list of futures, in the same order of the transactions
+        """
+        return [self.track(tx, callback=callback) for tx in txs]
+
+    def _done(self, entry, block_height=None, error=None):
+        with self.lock:
+            self.tracked.pop(entry.tx_hash, None)
+        if entry.future.done():
+            return
+        if error is not None:
+            entry.future.set_exception(error)
+        else:
+            entry.future.set_result(block_height)
+
+    def _expire(self, entry, reason):
+        logger.debug(f"transaction {entry.tx_hash} expired: {reason}")
+        self._done(entry, error=TransactionWaitTimeoutExpired(tx_hash=entry.tx_hash, reason=reason))
+
+    def _lookup(self, entry):
+        """look up a transaction, return False if the node does not know it"""
+        try:
+            reply = self.client.get_transaction_by_hash(hash=entry.tx_hash)
+        except OpenAPIClientException as e:
+            self._expire(entry, e.reason if hasattr(e, "reason") else "Transaction not found")
+            return False
+        if not entry.looked_up:
+            entry.set_fields(reply.tx)
+            entry.looked_up = True
+        entry.block_height = reply.block_height if reply.block_height >= 0 else None
+        return True
+
+    def _fetch_micro_blocks(self, height):
+        """get the transaction hashes of the micro blocks of a generation that have not been scanned yet"""
+        generation = self.client.get_generation_by_height(height=height)
+        micro_blocks = [mb_hash for mb_hash in generation.micro_blocks if mb_hash not in self.scanned_micro_blocks]
+        return [(mb_hash, [tx.hash for tx in self.client.get_micro_block_transactions_by_hash(hash=mb_hash).transactions])
+                for mb_hash in micro_blocks]
+
+    def _scan(self, executor, height, entries):
+        """look for the tracked transactions in the micro blocks added since the previous round"""
+        if self.scanned_height is None:
+            # the transactions included before are found by their first lookup
+            self.scanned_height = height
+        heights = range(self.scanned_height, height + 1)
+        scanned = set()
+        for generation_height, micro_blocks in zip(heights, executor.map(self._fetch_micro_blocks, heights)):
+            for mb_hash, tx_hashes in micro_blocks:
+                scanned.add(mb_hash)
+                for tx_hash in tx_hashes:
+                    entry = entries.get(tx_hash)
+                    if entry is not None and entry.block_height is None:
+                        entry.block_height = generation_height
+        # only the micro blocks of the top generation can be scanned again
+        if height > self.scanned_height:
+            self.scanned_micro_blocks = set()
+        self.scanned_micro_blocks |= scanned
+        self.scanned_height = height
+
+    def poll(self):
+        """
+        Run a tracking round
+
+        :return: the number of transactions still pending after the round
+        """
+        with self.round_lock:
+            with self.lock:
+                entries = dict(self.tracked)
+            if len(entries) == 0:
+                return 0
+            self.rounds += 1
+            height = self.client.get_current_key_block_height()
+            with ThreadPoolExecutor(max_workers=self.max_in_flight) as executor:
+                self._round(executor, height, entries)
+            return self.pending
+
+    def _round(self, executor, height, entries):
+        self._scan(executor, height, entries)
+        # the transactions tracked since the previous round may have been included before the scanned blocks
+        new_entries = [e for e in entries.values() if not e.looked_up and e.block_height is None]
+        list(executor.map(self._lookup, new_entries))
+        # the transactions that reached the confirmation depth are verified once, in case of micro forks
+        confirmable = [e for e in entries.values() if e.block_height is not None and height >= e.block_height + self.confirmations]
+        for entry, found in zip(confirmable, executor.map(self._lookup, confirmable)):
+            if found and entry.block_height is not None and height >= entry.block_height + self.confirmations:
+                self._done(entry, block_height=entry.block_height)
+        # expire the transactions that are not included
+        pending = [e for e in entries.values() if e.block_height is None and not e.future.done()]
+        senders = {}
+        for entry in pending:
+            if 0 < entry.ttl < height:
+                self._expire(entry, f"The transaction ttl {entry.ttl} has been reached at height {height}")
+            elif entry.sender is not None:
+                senders.setdefault(entry.sender, []).append(entry)
+        for sender, nonce in zip(senders.keys(), executor.map(self._sender_nonce, senders.keys())):
+            replaced = [e for e in senders[sender] if e.nonce <= nonce]
+            # the transaction may have been included after the scan, or replaced by another one
+            for entry, found in zip(replaced, executor.map(self._lookup, replaced)):
+                if found and entry.block_height is None:
+                    self._expire(entry, f"The nonce {entry.nonce} of {sender} has been used by another transaction")
+
+    def _sender_nonce(self, sender):
+        try:
+            return self.client.get_account_by_pubkey(pubkey=sender).nonce
+        except OpenAPIClientException:
+            # the account is not yet known to the node
+            return 0
+
+    def wait(self, futures=None, timeout=None, interval=defaults.CONFIRMATION_ROUND_INTERVAL):
+        """
+        Run tracking rounds until the given futures, or all the tracked transactions, are done
+
+        :param futures: the futures to wait for, default to all the tracked transactions
+        :param timeout: the max time to wait in seconds, the transactions still pending then
+            fail with TransactionWaitTimeoutExpired, None to wait until they are confirmed or expired
+        :param interval: the interval in seconds between rounds
+        """
+        deadline = time.time() + timeout if timeout is not None else None
+        while True:
+            if futures is not None and all(f.done() for f in futures):
+                return
+            if self.poll() == 0:
+                return
+            if deadline is not None and time.time() + interval > deadline:
+                break
+            time.sleep(interval)
+        with self.lock:
+            entries = list(self.tracked.values())
+        for entry in entries:
+            if futures is None or entry.future in futures:
+                self._expire(entry, f"The transaction was not confirmed in {timeout} seconds, wait aborted")
+
+    def start(self, interval=defaults.CONFIRMATION_ROUND_INTERVAL):
+        """
+        Run the tracking rounds in a background thread
+
+        :param interval: the interval in seconds between rounds
+        """
+        if self._stop is not None:
+            return
+        self._stop = threading.Event()
+
+        def run(stop):
+            while not stop.wait(interval):
+                try:
+                    self.poll()
+                except Exception as e:
+                    logger.warning(f"error tracking the transactions confirmations: {e}")
+
+        threading.Thread(target=run, args=(self._stop,), name="confirmation-tracker", daemon=True).start()
+
+    def stop(self):
+        """stop the background rounds"""
+        if self._stop is not None:
+            self._stop.set()
+            self._stop = None
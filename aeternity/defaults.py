@@ -1,3 +1,5 @@
+import os
+
 from aeternity import identifiers
 
 # fee calculation
@@ -30,6 +32,19 @@ POLL_TX_MAX_RETRIES = 8  # used in exponential backoff when checking a transacti
 POLL_TX_RETRIES_INTERVAL = 2  # in seconds
 POLL_BLOCK_MAX_RETRIES = 20  # number of retries
 POLL_BLOCK_RETRIES_INTERVAL = 30  # in seconds
+# http connection pool
+HTTP_POOL_CONNECTIONS = 10  # number of per-host connection pools to cache
+HTTP_POOL_MAXSIZE = 10  # max number of connections kept alive per host
+HTTP_POOL_BLOCK = False  # whenever to block when the pool has no free connections
+HTTP_KEEP_ALIVE = True  # reuse connections between requests
+HTTP_CONNECT_TIMEOUT = 10  # in seconds
+HTTP_READ_TIMEOUT = 60  # in seconds
+# node api specification cache
+API_SPEC_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "aeternity", "api")  # used by the aecli
+API_SPEC_CACHE_MAX_AGE = 3600  # in seconds, cached specifications younger than this are used without revalidation
+# node api replies
+API_JSON_BACKEND = "auto"  # one of auto, orjson, simplejson, json
+API_LAZY_RESPONSES = True  # wrap the nested objects of the replies only when accessed
 # channels
 CHANNEL_ENDPOINT = 'channel'
 CHANNEL_URL = 'ws://127.0.0.1:3014'
@@ -97,3 +112,44 @@ NAME_BID_TIMEOUTS = {
 # dry run
 DRY_RUN_ADDRESS = "ak_11111111111111111111111111111111273Yts"
 DRY_RUN_AMOUNT = 100000000000000000000000000000000000
+# node pool, used when the client is configured with multiple nodes
+NODE_POOL_STRATEGY = "least_outstanding"  # one of latency, least_outstanding
+NODE_POOL_MAX_HEIGHT_LAG = 2  # max number of blocks a node can be behind the others before being ejected
+NODE_POOL_HEALTH_CHECK_INTERVAL = 10  # in seconds
+# local nonce management
+NONCE_MANAGER = False  # whenever to allocate the nonces locally instead of querying the node for each transaction
+NONCE_SYNC_INTERVAL = 30  # in seconds, how often the local nonces of an account are synchronized with the node
+NONCE_RECLAIM_AFTER = 60  # in seconds, after which a reserved nonce unknown to the node is reused
+# chain height cache, used to compute the absolute ttl of the transactions
+HEIGHT_CACHE_MAX_AGE = 0  # in seconds, 0 disables the cache
+# account kind cache, used to sign the transactions without retrieving the account from the node
+ACCOUNT_CACHE_MAX_AGE = 0  # in seconds, 0 disables the cache
+# identifiers
+BASE58_BACKEND = "auto"  # one of auto, table, base58
+IDENTIFIER_CACHE_SIZE = 16384  # max number of identifiers kept by each of the encoding and decoding caches
+# key agent, holding the unlocked accounts for the aecli and the worker processes
+KEY_AGENT_SOCKET = os.path.join(os.path.expanduser("~"), ".cache", "aeternity", "agent.sock")
+KEY_AGENT_IDLE_TIMEOUT = 900  # in seconds, after which an unused account is removed from the agent, 0 to keep them
+KEY_AGENT_TIMEOUT = 30  # in seconds, max time to wait for a reply of the agent, unlocking a keystore takes seconds
+# signatures verification
+VERIFY_KEY_CACHE_SIZE = 4096  # max number of cached verification keys
+# chain cache
+CHAIN_CACHE_PATH = None  # the path of the SQLite database of the chain cache, None disables the cache
+CHAIN_CACHE_FINALITY_DEPTH = 100  # number of blocks after which a block is considered final
+CHAIN_CACHE_MAX_MUTABLE_ENTRIES = 1000  # max number of cached entries for the blocks that are not yet final
+CHAIN_CACHE_MUTABLE_MAX_AGE = 10  # in seconds, how long the entries for the blocks that are not yet final are valid
+# chain events
+WEBSOCKET_EVENTS = False  # whenever to wait for the transactions and confirmations with the node websocket events
+WEBSOCKET_CONNECT_TIMEOUT = 5  # in seconds, max time to wait for the websocket connection before polling
+WEBSOCKET_RECONNECT_INTERVAL = 5  # in seconds, interval between the reconnection attempts to the websocket
+WEBSOCKET_RECHECK_INTERVAL = 30  # in seconds, interval between the checks with the node of the awaited transactions
+# confirmation tracker
+CONFIRMATION_ROUND_INTERVAL = 5  # in seconds, interval between the rounds checking the tracked transactions
+# pending transactions manager
+PENDING_MANAGER = False  # whenever to track the broadcast transactions until they are mined
+PENDING_CHECK_INTERVAL = 10  # in seconds, interval between the checks of the pending transactions
+PENDING_STUCK_AFTER = 60  # in seconds, after which a pending transaction with the next nonce of the account is stuck
+PENDING_FEE_BUMP_FACTOR = 1.2  # factor applied to the fee of a stuck transaction
+PENDING_MAX_FEE_BUMPS = 3  # max number of fee increases for a transaction
+# chain iterator
+CHAIN_ITERATOR_WINDOW = 8  # number of generations fetched ahead
@@ -84,3 +84,13 @@ class UnsupportedTransactionType(Exception):
 class TransactionFeeTooLow(Exception):
     """Raised for transaction fee with too low value"""
     pass
+
+
+class KeyAgentException(Exception):
+    """Raised when the key agent cannot be reached or refuses a request"""
+    pass
+
+
+class TransactionNotSent(Exception):
+    """Raised when a transaction of a batch has not been broadcast because a previous nonce has been rejected"""
+    pass
@@ -1,5 +1,6 @@
 import base58
 import base64
+import functools
 import hashlib
 import rlp
 import secrets
@@ -8,17 +9,115 @@ import math
 from nacl.hash import blake2b
 from nacl.encoding import RawEncoder
 
-from aeternity import identifiers
+from aeternity import identifiers, defaults
+
+# the prefixes of the identifiers (accounts, contracts, names...), that are encoded and decoded
+# over and over when building and parsing transactions, their encoding and decoding is cached
+_CACHED_PREFIXES = frozenset(identifiers.ID_PREFIX_TO_TAG.keys())
+# the id tags encoded as bytes, by prefix
+_ID_TAGS = {prefix: tag.to_bytes(1, "big") for prefix, tag in identifiers.ID_PREFIX_TO_TAG.items()}
+
+
+_B58_ALPHABET = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+# the base58 strings of two digits, by value, and their values, by string
+_B58_PAIRS = [a + b for a in _B58_ALPHABET for b in _B58_ALPHABET]
+_B58_PAIR_VALUES = {pair: value for value, pair in enumerate(_B58_PAIRS)}
+_B58_PAIR_BASE = 58 ** 2
+_B58_QUAD_BASE = 58 ** 4
+_B58_CHUNK_BASE = 58 ** 8
+
+
+def _b58encode_check_table(data: bytes) -> str:
+    """
+    Encode bytes to base58 with checksum, converting the number 8 digits at a time
+    and the digits to characters 2 at a time with a lookup table
+    """
+    data = data + _checksum(data)
+    # the leading zero bytes are encoded as leading 1s
+    padding = len(data) - len(data.lstrip(b"\0"))
+    n = int.from_bytes(data, "big")
+    chunks = []
+    while n > 0:
+        n, chunk = divmod(n, _B58_CHUNK_BASE)
+        high, low = divmod(chunk, _B58_QUAD_BASE)
+        chunks.append(_B58_PAIRS[high // _B58_PAIR_BASE] + _B58_PAIRS[high % _B58_PAIR_BASE]
+                      + _B58_PAIRS[low // _B58_PAIR_BASE] + _B58_PAIRS[low % _B58_PAIR_BASE])
+    return "1" * padding + "".join(reversed(chunks)).lstrip("1")
+
+
+def _b58decode_check_table(encoded_str) -> bytes:
+    """
+    Decode a base58 with checksum string to bytes, converting the characters 2 at a time
+    with a lookup table and the number 4 digits at a time
+    """
+    if isinstance(encoded_str, bytes):
+        encoded_str = encoded_str.decode("ascii")
+    encoded_str = encoded_str.rstrip()
+    # the leading 1s are the leading zero bytes
+    padding = len(encoded_str) - len(encoded_str.lstrip("1"))
+    # pad the string with zeros to a multiple of 4 digits
+    digits = "1" * (-len(encoded_str) % 4) + encoded_str
+    n = 0
+    try:
+        for i in range(0, len(digits), 4):
+            n = n * _B58_QUAD_BASE + _B58_PAIR_VALUES[digits[i:i + 2]] * _B58_PAIR_BASE + _B58_PAIR_VALUES[digits[i + 2:i + 4]]
+    except KeyError:
+        raise ValueError("Invalid character in base58 string")
+    raw = b"\0" * padding + n.to_bytes((n.bit_length() + 7) // 8, "big")
+    data, check = raw[:-4], raw[-4:]
+    if len(raw) < 4 or check != _checksum(data):
+        raise ValueError("Invalid checksum")
+    return data
+
+
+def _b58encode_check_library(data: bytes) -> str:
+    """encode bytes to base58 with checksum using the base58 library"""
+    return base58.b58encode_check(data).decode("ascii")
+
+
+# available base58 codecs, as (encode, decode) functions, by name
+BASE58_BACKENDS = {
+    "table": (_b58encode_check_table, _b58decode_check_table),
+    "base58": (_b58encode_check_library, base58.b58decode_check),
+}
+
+_base58_codec = None
+
+
+def set_base58_backend(backend=defaults.BASE58_BACKEND):
+    """
+    Set the codec used to encode and decode the base58 strings with checksum
+
+    Args:
+        backend (str|tuple): the name of the backend, one of auto, table or base58, auto selects table,
+            or a tuple of functions (encode, decode) with the signatures of _base58_encode and _base58_decode,
+            for example to use a compiled extension
+    Raises:
+        ValueError: if the backend is unknown
+    """
+    global _base58_codec
+    if isinstance(backend, tuple):
+        _base58_codec = backend
+        return
+    if backend == "auto":
+        backend = "table"
+    codec = BASE58_BACKENDS.get(backend)
+    if codec is None:
+        raise ValueError(f"Unsupported base58 backend {backend}, available backends are: auto, {', '.join(BASE58_BACKENDS)}")
+    _base58_codec = codec
+
+
+set_base58_backend()
 
 
 def _base58_encode(data):
     """create a base58 encoded string with checksum"""
-    return base58.b58encode_check(data).decode("ascii")
+    return _base58_codec[0](data)
 
 
 def _base58_decode(encoded_str):
     """decode a base58 with checksum string to bytes"""
-    return base58.b58decode_check(encoded_str)
+    return _base58_codec[1](encoded_str)
 
 
 def _checksum(data: bytes) -> bytes:
@@ -59,13 +158,48 @@ def _sha256(data):
     return hashlib.sha256(data).digest()
 
 
-def encode(prefix: str, data) -> str:
+@functools.lru_cache(maxsize=defaults.IDENTIFIER_CACHE_SIZE)
+def _encode_identifier(prefix: str, data: bytes) -> str:
+    """encode an identifier, the results are cached"""
+    return f"{prefix}_{_base58_encode(data)}"
+
+
+@functools.lru_cache(maxsize=defaults.IDENTIFIER_CACHE_SIZE)
+def _decode_identifier(data: str) -> bytes:
+    """decode an identifier, the results are cached, the invalid identifiers are not"""
+    return _base58_decode(data[3:])
+
+
+def cache_info() -> dict:
+    """
+    Get the statistics of the identifiers encoding and decoding caches
+
+    Returns:
+        a dict with the statistics of the "encode" and "decode" caches, as dicts with the fields hits, misses, maxsize and currsize
+    """
+    return {
+        "encode": _encode_identifier.cache_info()._asdict(),
+        "decode": _decode_identifier.cache_info()._asdict(),
+    }
+
+
+def cache_clear():
+    """
+    Clear the identifiers encoding and decoding caches
+    """
+    _encode_identifier.cache_clear()
+    _decode_identifier.cache_clear()
+
+
+def encode(prefix: str, data, cache: bool = True) -> str:
     """
     Encode data using the default encoding/decoding algorithm and prepending the prefix with a prefix, ex: ak_encoded_data, th_encoded_data,...
 
     Args:
         prefix(str): the prefix for the encoded string (see identifiers.IDENTIFIERS_B58 and IDENTIFIERS_B64)
         data(str|bytes): the data to encode
+        cache(bool): whenever to use the identifiers cache, disable it when encoding many identifiers
+            that are not used again, so that they do not evict the cached ones (default True)
     Returns:
         The encoded string using the correct encoding based on the prefix
     Raises:
@@ -74,6 +208,8 @@ def encode(prefix: str, data) -> str:
     """
     if isinstance(data, str):
         data = data.encode("utf-8")
+    if cache and prefix in _CACHED_PREFIXES:
+        return _encode_identifier(prefix, bytes(data))
     if prefix in identifiers.IDENTIFIERS_B64:
         return f"{prefix}_{_base64_encode(data)}"
     elif prefix in identifiers.IDENTIFIERS_B58:
@@ -95,6 +231,8 @@ def decode(data: str) -> bytes:
     """
     if data is None or len(data.strip()) <= 3 or data[2] != '_':
         raise ValueError('Invalid input string')
+    if data[0:2] in _CACHED_PREFIXES:
+        return _decode_identifier(data)
     if data[0:2] in identifiers.IDENTIFIERS_B64:
         return _base64_decode(data[3:])
     if data[0:2] in identifiers.IDENTIFIERS_B58:
@@ -234,10 +372,10 @@ def _id(id_str):
     """
     # if not utils.is_valid_hash(id_str):
     #     raise ValueError(f"Unrecognized entity {id_str}")
-    id_tag = identifiers.ID_PREFIX_TO_TAG.get(id_str[0:2])
+    id_tag = _ID_TAGS.get(id_str[0:2])
     if id_tag is None:
         raise ValueError(f"Unrecognized prefix {id_str[0:2]}")
-    return _int(id_tag) + decode(id_str)
+    return id_tag + decode(id_str)
 
 
 def _id_decode(data):
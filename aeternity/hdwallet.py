@@ -1,10 +1,12 @@
 import hmac
 import hashlib
 import json
+from nacl.bindings import crypto_sign_seed_keypair
 from nacl.signing import SigningKey
 from mnemonic import Mnemonic
+from aeternity import hashing, utils
 from aeternity.signing import Account, keystore_seal, keystore_open, save_keystore_to_file, save_keystore_to_folder
-from aeternity.identifiers import SECRET_TYPE_BIP39
+from aeternity.identifiers import ACCOUNT_ID, SECRET_TYPE_BIP39
 
 
 class HDWallet():
@@ -22,6 +24,8 @@ class HDWallet():
         self.master_key = self._master_key_from_mnemonic(mnemonic)
         self.master_account = HDWallet._get_account(self.master_key["secret_key"])
         self.account_index = 0
+        # the derived keys of the intermediate path nodes, by path
+        self._nodes = {"m": self.master_key}
 
     @staticmethod
     def generate_mnemonic():
@@ -43,8 +47,44 @@ class HDWallet():
             account_index = self.account_index
             self.account_index += 1
         derivation_path = self.AETERNITY_DERIVATION_PATH % (account_index, address_index)
-        derived_keys = HDWallet._from_path(derivation_path, self.master_key)
-        return derivation_path, HDWallet._get_account(derived_keys[-1]["secret_key"])
+        derived_key = HDWallet._derive_child_key(self._node(derivation_path.rsplit("/", 1)[0]), address_index | HDWallet.HARDENED_OFFSET)
+        return derivation_path, HDWallet._get_account(derived_key["secret_key"])
+
+    def derive_children(self, account_index=None, start=0, count=1, addresses_only=False, processes=None):
+        """
+        Derives a range of addresses of an account in one pass, the keys of the path nodes
+        shared by the addresses are derived once
+        Args:
+            account_index(int): Account index to use for derivation path (optional)
+            start(int): The first address index to derive (default: 0)
+            count(int): The number of addresses to derive (default: 1)
+            addresses_only(bool): Return the addresses instead of the accounts (default: False)
+            processes(int): if set, the number of processes used to derive the addresses in parallel (optional)
+        Returns:
+            the list of the derivation paths and generated accounts, as returned by derive_child,
+            or the list of the addresses if addresses_only is set, in the order of the address indexes
+        """
+        if account_index is None:
+            account_index = self.account_index
+            self.account_index += 1
+        parent_path = (self.AETERNITY_DERIVATION_PATH % (account_index, 0)).rsplit("/", 1)[0]
+        parent_key = self._node(parent_path)
+        indexes = range(start, start + count)
+        children = utils.map_chunks(_derive_children_batch, indexes, processes, parent_key, addresses_only)
+        if addresses_only:
+            return children
+        return [(f"{parent_path}/{index}'", account) for index, account in zip(indexes, children)]
+
+    def _node(self, path):
+        """
+        Get the key of a hardened path node, the keys of the node and of its ancestors are cached
+        """
+        key = self._nodes.get(path)
+        if key is None:
+            parent_path, index = path.rsplit("/", 1)
+            key = HDWallet._derive_child_key(self._node(parent_path), int(index[:-1]) | HDWallet.HARDENED_OFFSET)
+            self._nodes[path] = key
+        return key
 
     def get_master_key(self):
         """
@@ -162,3 +202,30 @@ class HDWallet():
             keys.append(HDWallet._derive_child_key(k, index))
 
         return keys
+
+
+def _derive_children_batch(indexes, parent_key, addresses_only=False):
+    """
+    Derive the hardened children of a path node for a range of indexes
+    Args:
+        indexes(range): the indexes of the children
+        parent_key(dict): the key of the parent node, with 'secret_key' and 'chain_code'
+        addresses_only(bool): return the addresses instead of the accounts
+    Returns:
+        the list of the accounts, or of the addresses, of the children
+    """
+    # the hmac keyed with the chain code of the parent is shared by the children
+    parent_hmac = hmac.new(parent_key["chain_code"], digestmod=hashlib.sha512)
+    prefix = b'\x00' + parent_key["secret_key"]
+    children = []
+    for i in indexes:
+        child_hmac = parent_hmac.copy()
+        child_hmac.update(prefix + (i | HDWallet.HARDENED_OFFSET).to_bytes(length=4, byteorder='big'))
+        secret_key = child_hmac.digest()[:32]
+        if addresses_only:
+            public_key, _ = crypto_sign_seed_keypair(secret_key)
+            # encoded without the identifiers cache, that the bulk addresses would evict
+            children.append(hashing.encode(ACCOUNT_ID, public_key, cache=False))
+        else:
+            children.append(HDWallet._get_account(secret_key))
+    return children
@@ -45,6 +45,7 @@ IDENTIFIERS_B58 = set([
     PEER_ID,
     SIGNATURE,
     TRANSACTION_HASH,
+    STATE_HASH,
 ])
 
 # Identifiers with base64
@@ -0,0 +1,349 @@
+import json
+import logging
+import os
+import socket
+import socketserver
+import stat
+import threading
+import time
+
+from nacl.signing import VerifyKey
+
+from aeternity import defaults, hashing, signing
+from aeternity.exceptions import KeyAgentException
+
+logger = logging.getLogger(__name__)
+
+
+class _UnlockedAccount:
+    """
+    An account held by a KeyAgent
+    """
+
+    def __init__(self, account, path=None):
+        self.account = account
+        # the absolute path of the keystore the account has been loaded from
+        self.path = path
+        self.used_at = time.time()
+
+
+class _KeyAgentHandler(socketserver.StreamRequestHandler):
+    """handle the requests of a connection, one json object per line"""
+
+    def handle(self):
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+                reply = {"result": self.server.agent.handle_request(request.get("method"), request.get("params", {}))}
+            except Exception as e:
+                reply = {"error": str(e)}
+            self.wfile.write(json.dumps(reply).encode("utf-8") + b"\n")
+            self.wfile.flush()
+
+
+class _KeyAgentServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, agent):
+        self.agent = agent
+        super().__init__(agent.socket_path, _KeyAgentHandler)
+
+    def server_bind(self):
+        super().server_bind()
+        # the socket is only accessible by the owner
+        os.chmod(self.server_address, 0o600)
+
+    def service_actions(self):
+        self.agent.expire()
+
+
+class KeyAgent:
+    """
+    A key agent holds unlocked accounts in a long lived process and signs data for
+    the other processes of the same user, that connect to it through a Unix socket
+    (only accessible by the owner), so that the keystores do not have to be decrypted for each
+    command or worker. The secret keys never leave the agent.
+
+    The accounts that are not used for idle_timeout seconds are removed from the agent.
+
+    The agent is served by serve_forever, or in a background thread with start.
+
+    Args:
+        socket_path (str): the path of the Unix socket
+        idle_timeout (float): the time in seconds after which an unused account is removed, 0 to keep the accounts
+    """
+
+    def __init__(self, socket_path=defaults.KEY_AGENT_SOCKET, idle_timeout=defaults.KEY_AGENT_IDLE_TIMEOUT):
+        self.socket_path = socket_path
+        self.idle_timeout = idle_timeout
+        self.lock = threading.Lock()
+        # the unlocked accounts, by address
+        self.accounts = {}
+        self._server = None
+
+    def add_account(self, account, path=None) -> str:
+        """
+        Add an unlocked account to the agent
+
+        :param account: the Account
+        :param path: the path of the keystore of the account, if any
+        :return: the address of the account
+        """
+        with self.lock:
+            self.accounts[account.get_address()] = _UnlockedAccount(account, os.path.abspath(path) if path else None)
+        return account.get_address()
+
+    def add_keystores(self, keystores: list, processes: int = None) -> list:
+        """
+        Unlock many keystores and add their accounts to the agent, see signing.open_keystores
+
+        :param keystores: a list of (path, password) tuples
+        :param processes: if set, the number of processes used to open the keystores in parallel
+        :return: the list of the addresses of the accounts
+        """
+        accounts = signing.open_keystores(keystores, processes=processes)
+        return [self.add_account(account, path) for account, (path, _) in zip(accounts, keystores)]
+
+    def remove(self, address) -> bool:
+        """
+        Remove an account from the agent
+
+        :return: True if the account was held by the agent
+        """
+        with self.lock:
+            return self.accounts.pop(address, None) is not None
+
+    def lock_all(self):
+        """remove all the accounts from the agent"""
+        with self.lock:
+            self.accounts = {}
+
+    def expire(self):
+        """remove the accounts that have not been used for idle_timeout seconds"""
+        if not self.idle_timeout:
+            return
+        deadline = time.time() - self.idle_timeout
+        with self.lock:
+            for address in [a for a, e in self.accounts.items() if e.used_at < deadline]:
+                logger.debug(f"removing the idle account {address} from the agent")
+                del self.accounts[address]
+
+    def _get(self, address):
+        with self.lock:
+            entry = self.accounts.get(address)
+            if entry is None:
+                raise ValueError(f"Account {address} is not unlocked")
+            entry.used_at = time.time()
+            return entry.account
+
+    def handle_request(self, method, params):
+        """
+        Execute a request of a client
+
+        :param method: one of add, list, find, sign, remove, lock
+        :param params: the parameters of the method
+        :return: the result of the method
+        """
+        self.expire()
+        if method == "add":
+            return self.add_keystores([(params["path"], params["password"])])[0]
+        if method == "list":
+            now = time.time()
+            with self.lock:
+                return [{"address": a, "path": e.path, "idle": now - e.used_at} for a, e in self.accounts.items()]
+        if method == "find":
+            path = os.path.abspath(params["path"])
+            with self.lock:
+                return next((a for a, e in self.accounts.items() if e.path == path), None)
+        if method == "sign":
+            return self._get(params["address"]).sign(bytes.fromhex(params["data"])).hex()
+        if method == "remove":
+            return self.remove(params["address"])
+        if method == "lock":
+            self.lock_all()
+            return True
+        raise ValueError(f"Unknown method {method}")
+
+    def _bind(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.socket_path)), mode=0o700, exist_ok=True)
+        if os.path.lexists(self.socket_path):
+            if not stat.S_ISSOCK(os.lstat(self.socket_path).st_mode):
+                raise KeyAgentException(f"{self.socket_path} exists and is not a socket")
+            # refuse to replace the socket of a running agent
+            try:
+                with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+                    s.connect(self.socket_path)
+                raise KeyAgentException(f"A key agent is already listening on {self.socket_path}")
+            except ConnectionRefusedError:
+                os.unlink(self.socket_path)
+        self._server = _KeyAgentServer(self)
+
+    def serve_forever(self, poll_interval=1):
+        """
+        Serve the clients until stop is called
+
+        :param poll_interval: the interval in seconds between the checks of the idle accounts
+        """
+        if self._server is None:
+            self._bind()
+        server = self._server
+        try:
+            server.serve_forever(poll_interval=poll_interval)
+        finally:
+            server.server_close()
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+
+    def start(self, poll_interval=1):
+        """
+        Serve the clients in a background thread, the socket is ready when the method returns
+        """
+        self._bind()
+        threading.Thread(target=self.serve_forever, args=(poll_interval,), name="key-agent", daemon=True).start()
+
+    def stop(self):
+        """stop serving the clients and remove the socket"""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server = None
+
+
+class KeyAgentClient:
+    """
+    A client of a KeyAgent
+
+    Args:
+        socket_path (str): the path of the Unix socket of the agent
+        timeout (float): the timeout in seconds of the requests
+    """
+
+    def __init__(self, socket_path=defaults.KEY_AGENT_SOCKET, timeout=defaults.KEY_AGENT_TIMEOUT):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self.lock = threading.Lock()
+        self._socket = None
+        self._file = None
+
+    def _call(self, method, **params):
+        with self.lock:
+            try:
+                if self._socket is None:
+                    self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                    self._socket.settimeout(self.timeout)
+                    self._socket.connect(self.socket_path)
+                    self._file = self._socket.makefile("rwb")
+                self._file.write(json.dumps({"method": method, "params": params}).encode("utf-8") + b"\n")
+                self._file.flush()
+                line = self._file.readline()
+                if not line:
+                    raise ConnectionError("Connection closed by the agent")
+            except OSError as e:
+                self._close()
+                raise KeyAgentException(f"Key agent on {self.socket_path} unreachable: {e}")
+        reply = json.loads(line)
+        if "error" in reply:
+            raise KeyAgentException(reply["error"])
+        return reply["result"]
+
+    def _close(self):
+        if self._file is not None:
+            self._file.close()
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+            self._file = None
+
+    def close(self):
+        """close the connection to the agent"""
+        with self.lock:
+            self._close()
+
+    def is_running(self) -> bool:
+        """
+        Tell whenever the agent can be reached
+        """
+        try:
+            self._call("list")
+            return True
+        except KeyAgentException:
+            return False
+
+    def add_keystore(self, path, password) -> str:
+        """
+        Unlock a keystore in the agent
+
+        :param path: the path of the keystore, as seen by the agent
+        :param password: the password of the keystore
+        :return: the address of the account
+        """
+        return self._call("add", path=os.path.abspath(path), password=password)
+
+    def list(self) -> list:
+        """
+        List the unlocked accounts
+
+        :return: a list of dicts with the address, the keystore path and the idle time of each account
+        """
+        return self._call("list")
+
+    def find(self, path):
+        """
+        Get the address of the account unlocked from a keystore
+
+        :param path: the path of the keystore
+        :return: the address, None if the keystore has not been unlocked
+        """
+        return self._call("find", path=os.path.abspath(path))
+
+    def sign(self, address, data: bytes) -> bytes:
+        """
+        Sign data with an unlocked account
+
+        :param address: the address of the account
+        :param data: the data to sign
+        :return: the signature
+        """
+        return bytes.fromhex(self._call("sign", address=address, data=data.hex()))
+
+    def remove(self, address) -> bool:
+        """remove an account from the agent, return True if the account was unlocked"""
+        return self._call("remove", address=address)
+
+    def lock_all(self):
+        """remove all the accounts from the agent"""
+        self._call("lock")
+
+    def account(self, address=None, path=None):
+        """
+        Get an account that signs through the agent
+
+        :param address: the address of the account
+        :param path: the path of the keystore of the account, used if the address is not set
+        :return: an AgentAccount, None if the account is not unlocked
+        """
+        if address is None:
+            address = self.find(path)
+        elif address not in [a.get("address") for a in self.list()]:
+            address = None
+        return AgentAccount(self, address) if address is not None else None
+
+
+class AgentAccount(signing.Account):
+    """
+    An account unlocked in a key agent, the data is signed by the agent
+    """
+
+    def __init__(self, client, address, **kwargs):
+        super().__init__(None, VerifyKey(hashing.decode(address)), **kwargs)
+        self.client = client
+
+    def sign(self, data):
+        """
+        Sign data through the key agent
+        :param data: the data to sign
+        :return: the signature of the data
+        """
+        return self.client.sign(self.address, data)
+
+    def get_secret_key(self) -> str:
+        raise ValueError("The secret key of the account is held by the key agent")
@@ -1,18 +1,117 @@
 import logging
+import threading
 import time
 import random
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from munch import Munch
 
 from aeternity.signing import Account
 from aeternity.openapi import OpenAPIClientException
 from aeternity import aens, openapi, transactions, contract, oracles, defaults, identifiers, exceptions, utils, hashing, compiler
+from aeternity import node_pool, nonce_manager, chain_cache, chain_events, confirmations, pending_transactions
 from aeternity.exceptions import TransactionWaitTimeoutExpired, TransactionHashMismatch
 from aeternity import __node_compatibility__
 
 logger = logging.getLogger(__name__)
 
 
+def _parse_payments(payments):
+    """
+    Validate a list of payments for a batch of spend transactions
+
+    :param payments: a list of (recipient_id, amount) tuples, the recipient_id can be an address or an AENS name
+    :return: the list of (recipient_id, amount) with the names converted to name_id and the amounts to aettos
+    :raises TypeError: if a recipient_id is not valid
+    """
+    parsed = []
+    for recipient_id, amount in payments:
+        if utils.is_valid_aens_name(recipient_id):
+            recipient_id = hashing.name_id(recipient_id)
+        elif not utils.is_valid_hash(recipient_id, prefix="ak"):
+            raise TypeError(f"Invalid recipient_id {recipient_id}. Please provide a valid AENS name or account pub_key.")
+        parsed.append((recipient_id, utils.amount_to_aettos(amount)))
+    return parsed
+
+
+def _chain_heights(from_height, to_height, reverse):
+    """
+    Get the heights of a chain walk
+
+    :param from_height: the lowest height of the range, included
+    :param to_height: the highest height of the range, included
+    :param reverse: whenever to walk from the highest height to the lowest
+    :return: the range of heights in walking order
+    """
+    if reverse:
+        return range(to_height, from_height - 1, -1)
+    return range(from_height, to_height + 1)
+
+
+def _generation_item(generation, micro_blocks):
+    """
+    Build the item yielded by the chain iterators
+
+    :param generation: the generation reply of the node
+    :param micro_blocks: the list of (micro block hash, transactions) of the generation
+    """
+    return Munch(
+        height=generation.key_block.height,
+        key_block=generation.key_block,
+        micro_blocks=[Munch(hash=mb_hash, transactions=txs) for mb_hash, txs in micro_blocks],
+    )
+
+
+def _sign_spends(tx_builder, signer, payments, nonces, payload, fee, ttl):
+    """
+    Build and sign the spend transactions for a batch of payments
+
+    :return: the list of the payment outcomes, see NodeClient.spend_many
+    """
+    sender_id = signer.account.get_address()
+    results = []
+    for (recipient_id, amount), nonce in zip(payments, nonces):
+        tx = tx_builder.tx_spend(sender_id, recipient_id, amount, payload, fee, ttl, nonce)
+        tx = tx_builder.tx_signed([signer.sign_transaction(tx)], tx)
+        results.append(Munch(recipient_id=recipient_id, amount=amount, tx=tx, tx_hash=tx.hash, error=None))
+    return results
+
+
+def _end_of_wave(ordered, end, nonce_manager):
+    """
+    Check a wave of broadcasts of a batch of spend transactions, if the node has rejected a nonce
+    the transactions not yet broadcast are marked as not sent and their nonces released
+
+    :param ordered: the (nonce, outcome) tuples of the batch, sorted by nonce
+    :param end: the index in ordered of the first transaction after the wave
+    :param nonce_manager: the NonceManager of the client, None if not used
+    :return: True if the broadcast of the batch has to stop
+    """
+    rejected = next((nonce for nonce, result in ordered[:end] if result.error is not None), None)
+    if rejected is None:
+        return False
+    for _, result in ordered[end:]:
+        result.error = exceptions.TransactionNotSent(f"Transaction not broadcast, the nonce {rejected} has been rejected")
+        if nonce_manager is not None:
+            nonce_manager.release_transaction(result.tx)
+    return True
+
+
+def _last_accepted_nonce(ordered, default):
+    """
+    Get the highest nonce of a batch of spend transactions accepted without gaps by the node
+
+    :param ordered: the (nonce, outcome) tuples of the batch, sorted by nonce
+    :param default: the nonce to return if the first transaction has not been accepted
+    """
+    for nonce, result in ordered:
+        if result.error is not None:
+            break
+        default = nonce
+    return default
+
+
 class Config:
     def __init__(self,
                  external_url='http://localhost:3013',
@@ -24,8 +123,9 @@ class Config:
         Initialize a configuration object to be used with the NodeClient
 
         Args:
-            external_url (str): the node external url
-            internal_url (str): the node internal url
+            external_url (str|list): the node external url, or a list of urls to spread the requests among multiple nodes
+            internal_url (str|list): the node internal url, or a list of urls matching the external ones when using multiple nodes;
+                when using multiple nodes a single url is used for the first node only
             websocket_url (str): the node websocket url
             force_compatibility (bool): ignore node version compatibility check (default False)
 
@@ -45,8 +145,73 @@ class Config:
             :poll_tx_retries_interval (int): the interval in seconds between retries
             :poll_block_max_retries (int): TODO
             :poll_block_retries_interval (int): TODO
-            :offline (bool): whenever the node should not contact the node for any information
+            :offline (bool): whenever the node should not contact the node for any information,
+                when signing transactions the kind declared in the Account object (basic or generalized) is used
             :debug (bool): enable debug logging for api calls
+            :http_session (requests.Session): a http session to share among clients, if not set a pooled session is created
+                from the http_* parameters below on first use and shared by all the clients using this configuration
+            :http_pool_connections (int): the number of per-host connection pools to cache [optional, default: defaults.HTTP_POOL_CONNECTIONS]
+            :http_pool_maxsize (int): the max number of connections kept open per host [optional, default: defaults.HTTP_POOL_MAXSIZE]
+            :http_pool_block (bool): block when no connection is available in the pool [optional, default: defaults.HTTP_POOL_BLOCK]
+            :http_keep_alive (bool): reuse connections between requests [optional, default: defaults.HTTP_KEEP_ALIVE]
+            :http_connect_timeout (float): the connect timeout in seconds [optional, default: defaults.HTTP_CONNECT_TIMEOUT]
+            :http_read_timeout (float): the read timeout in seconds [optional, default: defaults.HTTP_READ_TIMEOUT]
+            :api_spec (dict|str): the node api specification to use instead of downloading it from the node,
+                either a dict, a path to a json file or the version of a specification bundled with the sdk [optional]
+            :api_spec_cache (str): the folder where to cache the api specification downloaded from the node,
+                if not set the specification is downloaded every time a client is created [optional]
+            :api_spec_cache_max_age (int): the number of seconds a cached specification is used without revalidating it
+                with the node [optional, default: defaults.API_SPEC_CACHE_MAX_AGE]
+            :api_json_backend (str): the json backend used to decode the api replies: auto, orjson, simplejson or json,
+                auto selects orjson when installed [optional, default: defaults.API_JSON_BACKEND]
+            :api_lazy_responses (bool): wrap the nested objects of the api replies only when they are accessed,
+                instead of converting the whole reply upfront [optional, default: defaults.API_LAZY_RESPONSES]
+            :node_pool_strategy (str): when using multiple nodes, how to select the node for read requests:
+                latency or least_outstanding [optional, default: defaults.NODE_POOL_STRATEGY]
+            :node_pool_max_height_lag (int): when using multiple nodes, the max number of blocks a node can be behind
+                the others before being ejected [optional, default: defaults.NODE_POOL_MAX_HEIGHT_LAG]
+            :node_pool_health_check_interval (float): when using multiple nodes, the interval in seconds between
+                health checks of the nodes [optional, default: defaults.NODE_POOL_HEALTH_CHECK_INTERVAL]
+            :nonce_manager (bool): allocate the nonces of the transactions locally with a NonceManager, allowing to send
+                concurrent transactions from the same account [optional, default: defaults.NONCE_MANAGER]
+            :nonce_sync_interval (float): the interval in seconds between the synchronizations of the local nonces
+                of an account with the node [optional, default: defaults.NONCE_SYNC_INTERVAL]
+            :nonce_reclaim_after (float): the time in seconds after which a reserved nonce unknown to the node
+                is reused [optional, default: defaults.NONCE_RECLAIM_AFTER]
+            :pending_manager (bool): track the broadcast transactions until they are mined with a PendingTransactionManager,
+                that rebroadcasts the dropped ones [optional, default: defaults.PENDING_MANAGER]
+            :pending_check_interval (float): the interval in seconds between the checks of the pending transactions,
+                0 to run the checks explicitly with check [optional, default: defaults.PENDING_CHECK_INTERVAL]
+            :pending_stuck_after (float): the time in seconds after which a pending transaction with the next nonce
+                of the account is stuck [optional, default: defaults.PENDING_STUCK_AFTER]
+            :pending_fee_bump_factor (float): the factor applied to the fee of a stuck transaction
+                [optional, default: defaults.PENDING_FEE_BUMP_FACTOR]
+            :pending_max_fee_bumps (int): the max number of fee increases for a transaction
+                [optional, default: defaults.PENDING_MAX_FEE_BUMPS]
+            :height_cache_max_age (float): cache the chain height used to compute the transactions ttl for this
+                number of seconds, 0 to disable the cache [optional, default: defaults.HEIGHT_CACHE_MAX_AGE]
+            :height_cache_refresh (bool): refresh the cached chain height in a background thread,
+                instead of when it is stale [optional, default: False]
+            :account_cache_max_age (float): cache the kind of the accounts used to sign transactions for this
+                number of seconds, an account made generalized by another client is signed as a basic account
+                until its entry expires, 0 to disable the cache [optional, default: defaults.ACCOUNT_CACHE_MAX_AGE]
+            :chain_cache_path (str): the path of the SQLite database where the historical chain data is cached,
+                None to disable the cache [optional, default: defaults.CHAIN_CACHE_PATH]
+            :chain_cache_finality_depth (int): the number of blocks after which the cached blocks are considered final
+                [optional, default: defaults.CHAIN_CACHE_FINALITY_DEPTH]
+            :chain_cache_max_mutable_entries (int): the max number of cached entries for the blocks that are
+                not yet final [optional, default: defaults.CHAIN_CACHE_MAX_MUTABLE_ENTRIES]
+            :chain_cache_mutable_max_age (float): the time in seconds the entries of the blocks that are not yet final
+                are valid [optional, default: defaults.CHAIN_CACHE_MUTABLE_MAX_AGE]
+            :websocket_events (bool): wait for the transactions and their confirmations with the key block and micro block
+                events of the node websocket, polling only when it is not available [optional, default: defaults.WEBSOCKET_EVENTS]
+            :websocket_connect_timeout (float): the max time in seconds to wait for the websocket connection
+                [optional, default: defaults.WEBSOCKET_CONNECT_TIMEOUT]
+            :websocket_reconnect_interval (float): the interval in seconds between the reconnection attempts
+                to the websocket [optional, default: defaults.WEBSOCKET_RECONNECT_INTERVAL]
+            :websocket_recheck_interval (float): the interval in seconds between the checks with the node of the
+                transactions awaited with the websocket events, to detect the dropped ones, they are also checked
+                at each key block [optional, default: defaults.WEBSOCKET_RECHECK_INTERVAL]
 
         """
         # endpoint URLs
@@ -74,15 +239,237 @@ class Config:
         self.poll_tx_retries_interval = kwargs.get("poll_tx_retries_interval", defaults.POLL_TX_RETRIES_INTERVAL)
         self.poll_block_max_retries = kwargs.get("poll_block_max_retries", defaults.POLL_BLOCK_MAX_RETRIES)
         self.poll_block_retries_interval = kwargs.get("poll_block_retries_interval", defaults.POLL_BLOCK_RETRIES_INTERVAL)
+        # http connection pool
+        self._http_session = kwargs.get("http_session")
+        self.http_pool_connections = kwargs.get("http_pool_connections", defaults.HTTP_POOL_CONNECTIONS)
+        self.http_pool_maxsize = kwargs.get("http_pool_maxsize", defaults.HTTP_POOL_MAXSIZE)
+        self.http_pool_block = kwargs.get("http_pool_block", defaults.HTTP_POOL_BLOCK)
+        self.http_keep_alive = kwargs.get("http_keep_alive", defaults.HTTP_KEEP_ALIVE)
+        self.http_connect_timeout = kwargs.get("http_connect_timeout", defaults.HTTP_CONNECT_TIMEOUT)
+        self.http_read_timeout = kwargs.get("http_read_timeout", defaults.HTTP_READ_TIMEOUT)
+        # api specification
+        self.api_spec = kwargs.get("api_spec")
+        self.api_spec_cache = kwargs.get("api_spec_cache")
+        self.api_spec_cache_max_age = kwargs.get("api_spec_cache_max_age", defaults.API_SPEC_CACHE_MAX_AGE)
+        # api replies
+        self.api_json_backend = kwargs.get("api_json_backend", defaults.API_JSON_BACKEND)
+        self.api_lazy_responses = kwargs.get("api_lazy_responses", defaults.API_LAZY_RESPONSES)
+        # node pool
+        self.node_pool_strategy = kwargs.get("node_pool_strategy", defaults.NODE_POOL_STRATEGY)
+        self.node_pool_max_height_lag = kwargs.get("node_pool_max_height_lag", defaults.NODE_POOL_MAX_HEIGHT_LAG)
+        self.node_pool_health_check_interval = kwargs.get("node_pool_health_check_interval", defaults.NODE_POOL_HEALTH_CHECK_INTERVAL)
+        # nonces
+        self.nonce_manager = kwargs.get("nonce_manager", defaults.NONCE_MANAGER)
+        self.nonce_sync_interval = kwargs.get("nonce_sync_interval", defaults.NONCE_SYNC_INTERVAL)
+        self.nonce_reclaim_after = kwargs.get("nonce_reclaim_after", defaults.NONCE_RECLAIM_AFTER)
+        # pending transactions
+        self.pending_manager = kwargs.get("pending_manager", defaults.PENDING_MANAGER)
+        self.pending_check_interval = kwargs.get("pending_check_interval", defaults.PENDING_CHECK_INTERVAL)
+        self.pending_stuck_after = kwargs.get("pending_stuck_after", defaults.PENDING_STUCK_AFTER)
+        self.pending_fee_bump_factor = kwargs.get("pending_fee_bump_factor", defaults.PENDING_FEE_BUMP_FACTOR)
+        self.pending_max_fee_bumps = kwargs.get("pending_max_fee_bumps", defaults.PENDING_MAX_FEE_BUMPS)
+        # chain height cache
+        self.height_cache_max_age = kwargs.get("height_cache_max_age", defaults.HEIGHT_CACHE_MAX_AGE)
+        self.height_cache_refresh = kwargs.get("height_cache_refresh", False)
+        # account kind cache
+        self.account_cache_max_age = kwargs.get("account_cache_max_age", defaults.ACCOUNT_CACHE_MAX_AGE)
+        # chain data cache
+        self.chain_cache_path = kwargs.get("chain_cache_path", defaults.CHAIN_CACHE_PATH)
+        self.chain_cache_finality_depth = kwargs.get("chain_cache_finality_depth", defaults.CHAIN_CACHE_FINALITY_DEPTH)
+        self.chain_cache_max_mutable_entries = kwargs.get("chain_cache_max_mutable_entries", defaults.CHAIN_CACHE_MAX_MUTABLE_ENTRIES)
+        self.chain_cache_mutable_max_age = kwargs.get("chain_cache_mutable_max_age", defaults.CHAIN_CACHE_MUTABLE_MAX_AGE)
+        # chain events
+        self.websocket_events = kwargs.get("websocket_events", defaults.WEBSOCKET_EVENTS)
+        self.websocket_connect_timeout = kwargs.get("websocket_connect_timeout", defaults.WEBSOCKET_CONNECT_TIMEOUT)
+        self.websocket_reconnect_interval = kwargs.get("websocket_reconnect_interval", defaults.WEBSOCKET_RECONNECT_INTERVAL)
+        self.websocket_recheck_interval = kwargs.get("websocket_recheck_interval", defaults.WEBSOCKET_RECHECK_INTERVAL)
+        # offline mode
+        self.offline = kwargs.get("offline", False)
         # debug
         self.debug = kwargs.get("debug", False)
         if self.debug:
             logging.root.setLevel(logging.DEBUG)
 
+    @property
+    def http_session(self):
+        """
+        The http session shared by the clients using this configuration,
+        it is created on first access
+        """
+        if self._http_session is None:
+            self._http_session = openapi.build_http_session(
+                pool_connections=self.http_pool_connections,
+                pool_maxsize=self.http_pool_maxsize,
+                pool_block=self.http_pool_block,
+                keep_alive=self.http_keep_alive
+            )
+        return self._http_session
+
+    @property
+    def spec_cache(self):
+        """
+        The cache for the node api specification, None if the cache is disabled
+        """
+        if self.api_spec_cache is None:
+            return None
+        return openapi.SpecCache(self.api_spec_cache, max_age=self.api_spec_cache_max_age)
+
+    @property
+    def nodes(self):
+        """
+        The list of (external_url, internal_url) of the nodes when using multiple nodes, None otherwise
+        """
+        if not isinstance(self.api_url, (list, tuple)):
+            return None
+        internal_urls = self.api_url_internal
+        if not isinstance(internal_urls, (list, tuple)):
+            internal_urls = [internal_urls]
+        internal_urls = list(internal_urls) + [None] * (len(self.api_url) - len(internal_urls))
+        return list(zip(self.api_url, internal_urls))
+
+    @property
+    def http_timeout(self):
+        """
+        The (connect, read) timeout tuple for the http requests
+        """
+        return (self.http_connect_timeout, self.http_read_timeout)
+
     def __str__(self):
         return f'ws:{self.websocket_url} ext:{self.api_url} int:{self.api_url_internal}'
 
 
+class HeightCache:
+    """
+    Cache the current height of the chain, the height is retrieved again
+    when it is older than max_age seconds.
+
+    The cache can also be refreshed in background with start or kept
+    up to date by an external source (for example a websocket subscription) with update.
+
+    Args:
+        fetch (callable): a function returning the current height of the chain
+        max_age (float): the max age in seconds of the cached height
+    """
+
+    def __init__(self, fetch, max_age=defaults.HEIGHT_CACHE_MAX_AGE):
+        self.fetch = fetch
+        self.max_age = max_age
+        self.height = None
+        self.updated_at = 0
+        self.lock = threading.Lock()
+        self._stop = None
+
+    @property
+    def age(self):
+        """the age in seconds of the cached height, None if the height has never been retrieved"""
+        if self.height is None:
+            return None
+        return time.time() - self.updated_at
+
+    def is_fresh(self):
+        """tells if the cached height can be used"""
+        return self.height is not None and time.time() - self.updated_at < self.max_age
+
+    def update(self, height):
+        """set the current height of the chain"""
+        with self.lock:
+            # the height never goes back, unless it has expired
+            if self.height is None or height >= self.height or not self.is_fresh():
+                self.height = height
+            self.updated_at = time.time()
+
+    def get(self):
+        """get the current height of the chain, retrieving it if the cached one is stale"""
+        if not self.is_fresh():
+            self.update(self.fetch())
+        return self.height
+
+    def start(self, interval=None):
+        """
+        Refresh the height in a background thread
+
+        :param interval: the interval in seconds between refreshes, default to half the max_age
+        """
+        if self._stop is not None:
+            return
+        interval = interval if interval is not None else self.max_age / 2
+        self._stop = threading.Event()
+
+        def refresh(stop):
+            while not stop.wait(interval):
+                try:
+                    self.update(self.fetch())
+                except Exception as e:
+                    logger.warning(f"error refreshing the chain height: {e}")
+
+        threading.Thread(target=refresh, args=(self._stop,), name="height-cache", daemon=True).start()
+
+    def stop(self):
+        """stop the background refresh"""
+        if self._stop is not None:
+            self._stop.set()
+            self._stop = None
+
+
+class AccountCache:
+    """
+    Cache the kind of the accounts (basic or generalized) and, for generalized accounts,
+    the auth_fun and contract_id, to sign transactions without retrieving the account from the node.
+
+    An account can only go from basic to generalized, entries expire after max_age seconds
+    and can be invalidated explicitly.
+
+    Args:
+        max_age (float): the max age in seconds of the entries
+    """
+
+    def __init__(self, max_age=defaults.ACCOUNT_CACHE_MAX_AGE):
+        self.max_age = max_age
+        self.entries = {}
+        self.lock = threading.Lock()
+
+    def get(self, address):
+        """
+        Get the cached data of an account
+
+        :param address: the account address
+        :return: a Munch with kind, auth_fun and contract_id, or None if the account is not cached or expired
+        """
+        with self.lock:
+            entry = self.entries.get(address)
+            if entry is None:
+                return None
+            if time.time() - entry.cached_at >= self.max_age:
+                del self.entries[address]
+                return None
+            return entry
+
+    def put(self, address, kind, auth_fun=None, contract_id=None):
+        """
+        Store the data of an account
+
+        :param address: the account address
+        :param kind: the kind of the account, basic or generalized
+        :param auth_fun: the authentication function of a generalized account
+        :param contract_id: the contract of a generalized account
+        :return: the cached entry
+        """
+        entry = Munch(kind=kind, auth_fun=auth_fun, contract_id=contract_id, cached_at=time.time())
+        with self.lock:
+            self.entries[address] = entry
+        return entry
+
+    def invalidate(self, address=None):
+        """
+        Remove an account from the cache, or all the accounts if the address is None
+        """
+        with self.lock:
+            if address is None:
+                self.entries = {}
+            else:
+                self.entries.pop(address, None)
+
+
 class NodeClient:
 
     def __init__(self, config=Config()):
@@ -102,29 +489,95 @@ class NodeClient:
         )
 
         # instantiate the api client
-        self.api = openapi.OpenAPICli(url=config.api_url,
-                                      url_internal=config.api_url_internal,
-                                      debug=config.debug,
-                                      force_compatibility=config.force_compatibility,
-                                      compatibility_version_range=__node_compatibility__)
+        if config.nodes is not None:
+            # spread the requests among multiple nodes
+            self.api = node_pool.NodePool(config.nodes, self._create_api_client,
+                                          strategy=config.node_pool_strategy,
+                                          max_height_lag=config.node_pool_max_height_lag,
+                                          health_check_interval=config.node_pool_health_check_interval)
+        else:
+            self.api = self._create_api_client(config.api_url, config.api_url_internal)
+        # cache the historical chain data
+        if config.chain_cache_path is not None:
+            self.api = chain_cache.ChainCache(self.api, config.chain_cache_path,
+                                              finality_depth=config.chain_cache_finality_depth,
+                                              max_mutable_entries=config.chain_cache_max_mutable_entries,
+                                              mutable_max_age=config.chain_cache_mutable_max_age)
+
+        # local nonces allocation
+        self.nonce_manager = None
+        if config.nonce_manager:
+            self.nonce_manager = nonce_manager.NonceManager(self,
+                                                            sync_interval=config.nonce_sync_interval,
+                                                            reclaim_after=config.nonce_reclaim_after)
+
+        # broadcast transactions tracking
+        self.pending_manager = None
+        if config.pending_manager:
+            self.pending_manager = pending_transactions.PendingTransactionManager(self,
+                                                                                  stuck_after=config.pending_stuck_after,
+                                                                                  fee_bump_factor=config.pending_fee_bump_factor,
+                                                                                  max_fee_bumps=config.pending_max_fee_bumps)
+            if config.pending_check_interval > 0:
+                self.pending_manager.start(config.pending_check_interval)
+
+        # chain height cache
+        self.height_cache = None
+        if config.height_cache_max_age > 0:
+            self.height_cache = HeightCache(lambda: self.get_current_key_block_height(), max_age=config.height_cache_max_age)
+            if config.height_cache_refresh:
+                self.height_cache.start()
+
+        # chain events, started by the first wait
+        self.chain_events = None
+        if config.websocket_events:
+            self.chain_events = chain_events.ChainEvents(self, config.websocket_url,
+                                                         connect_timeout=config.websocket_connect_timeout,
+                                                         reconnect_interval=config.websocket_reconnect_interval,
+                                                         recheck_interval=config.websocket_recheck_interval)
+
+        # account kind cache
+        self.account_cache = AccountCache(max_age=config.account_cache_max_age) if config.account_cache_max_age > 0 else None
 
         # auto-configure network_id
         if self.config.network_id is None:
             self.config.network_id = self.api.get_status().network_id
 
+    def _create_api_client(self, url, url_internal):
+        """
+        Create the api client for a node
+
+        :param url: the node external url
+        :param url_internal: the node internal url
+        :return: the OpenAPICli for the node
+        """
+        return openapi.OpenAPICli(url=url,
+                                  url_internal=url_internal,
+                                  debug=self.config.debug,
+                                  force_compatibility=self.config.force_compatibility,
+                                  compatibility_version_range=__node_compatibility__,
+                                  session=self.config.http_session,
+                                  timeout=self.config.http_timeout,
+                                  spec=self.config.api_spec,
+                                  spec_cache=self.config.spec_cache,
+                                  json_backend=self.config.api_json_backend,
+                                  lazy_responses=self.config.api_lazy_responses)
+
     # enable composition
     def __getattr__(self, attr):
         return getattr(self.api, attr)
 
     def compute_absolute_ttl(self, relative_ttl):
         """
-        Compute the absolute ttl by adding the ttl to the current height of the chain
+        Compute the absolute ttl by adding the ttl to the current height of the chain,
+        the height is taken from the height cache when enabled in the configuration
 
         :param relative_ttl: the relative ttl, if 0 will set the ttl to 0
         """
+        height = self.height_cache.get() if self.height_cache is not None else self.get_current_key_block_height()
         ttl = dict(
             absolute_ttl=0,
-            height=self.get_current_key_block_height(),
+            height=height,
             estimated_expiration=datetime.now()
         )
         if relative_ttl > 0:
@@ -136,7 +589,9 @@ class NodeClient:
         """
         Get the next nonce to be used for a transaction for an account.
         If account is an instance Account, the cached value of the account.nonce will be used
-        unless the parameter use_cached is set to False
+        unless the parameter use_cached is set to False.
+        If the nonce manager is enabled in the configuration the nonce is reserved
+        by the nonce manager and the cached value is ignored
 
         Args:
             account: the account instance or account address of get the nonce for
@@ -152,6 +607,10 @@ class NodeClient:
             except Exception:
                 return 0
 
+        # reserve the nonce locally
+        if self.nonce_manager is not None:
+            address = account.get_address() if isinstance(account, Account) else account
+            return self.nonce_manager.reserve(address)
         # use cache nonce value
         if isinstance(account, Account):
             if account.nonce > 0 and use_cached:
@@ -199,6 +658,91 @@ class NodeClient:
             block = self.api.get_micro_block_header_by_hash(hash=hash)
         return block
 
+    def _fetch_generation(self, height, decode, executor):
+        """retrieve a generation and the transactions of its micro blocks, fetched concurrently on executor"""
+        generation = self.get_generation_by_height(height=height)
+        futures = [executor.submit(self.get_micro_block_transactions_by_hash, hash=mb_hash) for mb_hash in generation.micro_blocks]
+        micro_blocks = []
+        for mb_hash, future in zip(generation.micro_blocks, futures):
+            reply = future.result()
+            micro_blocks.append((mb_hash, self.tx_builder.parse_transactions(reply) if decode else reply.transactions))
+        return _generation_item(generation, micro_blocks)
+
+    def iter_generations(self, from_height: int = 0, to_height: int = None, reverse: bool = False,
+                         window: int = defaults.CHAIN_ITERATOR_WINDOW, decode: bool = True):
+        """
+        Walk the chain generation by generation.
+
+        The generations and the transactions of their micro blocks are fetched concurrently,
+        with at most window generations fetched ahead of the one being consumed and at most
+        window micro block requests in flight, and they are yielded in height order.
+
+        :param from_height: the lowest height to walk, included
+        :param to_height: the highest height to walk, included, default to the current height
+        :param reverse: whenever to walk the chain backwards, from to_height to from_height
+        :param window: the max number of generations fetched ahead
+        :param decode: whenever to decode the transactions to TxObjects, if false the node replies are returned
+        :return: a generator of Munch with the fields height, key_block and micro_blocks,
+            the micro_blocks are a list of Munch with the fields hash and transactions
+        """
+        if to_height is None:
+            to_height = self.get_current_key_block_height()
+        heights = iter(_chain_heights(from_height, to_height, reverse))
+        executor = ThreadPoolExecutor(max_workers=max(window, 1))
+        # the micro blocks have their own workers, the generation workers wait for them
+        micro_block_executor = ThreadPoolExecutor(max_workers=max(window, 1))
+        pending = deque()
+        try:
+            for height in heights:
+                pending.append(executor.submit(self._fetch_generation, height, decode, micro_block_executor))
+                if len(pending) >= window:
+                    break
+            while len(pending) > 0:
+                item = pending.popleft().result()
+                # keep the window full
+                height = next(heights, None)
+                if height is not None:
+                    pending.append(executor.submit(self._fetch_generation, height, decode, micro_block_executor))
+                yield item
+        finally:
+            # cancel the generations fetched ahead that are not needed anymore
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=False)
+            micro_block_executor.shutdown(wait=False)
+
+    def iter_transactions(self, from_height: int = 0, to_height: int = None, reverse: bool = False,
+                          window: int = defaults.CHAIN_ITERATOR_WINDOW):
+        """
+        Walk the transactions of the chain, see iter_generations for the parameters.
+        The transactions of a generation are yielded in the order they are included in the micro blocks,
+        also when walking the chain backwards.
+
+        :return: a generator of TxObject
+        """
+        for generation in self.iter_generations(from_height, to_height, reverse=reverse, window=window):
+            for micro_block in generation.micro_blocks:
+                yield from micro_block.transactions
+
+    def _is_generalized(self, account: Account) -> bool:
+        """
+        Tells if an account is generalized, using the kind declared in the Account in offline mode,
+        otherwise the account cache or the account retrieved from the node
+
+        :param account: the account to check
+        :return: true if the account is generalized
+        """
+        if self.config.offline:
+            return account.is_generalized()
+        address = account.get_address()
+        entry = self.account_cache.get(address) if self.account_cache is not None else None
+        if entry is None:
+            on_chain_account = self.get_account(address)
+            if self.account_cache is None:
+                return on_chain_account.is_generalized()
+            entry = self.account_cache.put(address, on_chain_account.kind, on_chain_account.auth_fun, on_chain_account.contract_id)
+        return entry.kind == identifiers.ACCOUNT_KIND_GENERALIZED
+
     def broadcast_transaction(self, tx: transactions.TxObject):
         """
         Post a transaction to the chain and verify that the hash match the local calculated hash
@@ -209,9 +753,17 @@ class NodeClient:
 
         :raises TransactionHashMismatch: if the transaction hash returned by the node is different from the one calculated
         """
-        reply = self.post_transaction(body={"tx": tx.tx})
+        try:
+            reply = self.post_transaction(body={"tx": tx.tx})
+        except OpenAPIClientException as e:
+            # the transaction was rejected, its nonce can be used again
+            if self.nonce_manager is not None:
+                self.nonce_manager.release_transaction(tx)
+            raise e
         if reply.tx_hash != tx.hash:
             raise TransactionHashMismatch(f"Transaction hash doesn't match, expected {tx.hash} got {reply.tx_hash}")
+        if self.pending_manager is not None:
+            self.pending_manager.record(tx)
 
         if self.config.blocking_mode:
             self.wait_for_transaction(reply.tx_hash)
@@ -241,12 +793,8 @@ class NodeClient:
         :raises TypeError: if the gas for auth_func is gt defaults.GA_MAX_AUTH_FUN_GAS
 
         """
-        # first retrieve the account from the node
-        # so we can check if it is generalized or not
-        on_chain_account = self.get_account(account.get_address())
-
         # if the account is not generalized sign and return the transaction
-        if not on_chain_account.is_generalized():
+        if not self._is_generalized(account):
             s = transactions.TxSigner(account, self.config.network_id)
             signature = s.sign_transaction(tx, metadata)
             return self.tx_builder.tx_signed([signature], tx, metadata=metadata)
@@ -350,17 +898,85 @@ class NodeClient:
         # parse amount and fee
         amount, fee = utils._amounts_to_aettos(amount, fee)
         # retrieve the nonce
-        account.nonce = self.get_next_nonce(account)
+        nonce = self.get_next_nonce(account)
+        account.nonce = nonce
         # retrieve ttl
         tx_ttl = self.compute_absolute_ttl(tx_ttl)
         # build the transaction
-        tx = self.tx_builder.tx_spend(account.get_address(), recipient_id, amount, payload, fee, tx_ttl.absolute_ttl, account.nonce)
+        tx = self.tx_builder.tx_spend(account.get_address(), recipient_id, amount, payload, fee, tx_ttl.absolute_ttl, nonce)
         # get the signature
         tx = self.sign_transaction(account, tx)
         # post the signed transaction transaction
         self.broadcast_transaction(tx)
         return tx
 
+    def spend_many(self, account: Account,
+                   payments: list,
+                   payload: str = "",
+                   fee: int = defaults.FEE,
+                   tx_ttl: int = defaults.TX_TTL,
+                   max_in_flight: int = None) -> list:
+        """
+        Create and execute a batch of spend transactions from the same account.
+
+        The nonce, the ttl and the kind of the account are retrieved once for the whole batch,
+        the transactions are signed with consecutive nonces and broadcast in nonce order, in waves of
+        max_in_flight concurrent requests: within a wave the transactions may reach the node out of order,
+        the node keeps the ones with a nonce gap in the mempool until the previous ones arrive.
+
+        If the node rejects a transaction the broadcast stops after its wave: the following transactions
+        are reported with a TransactionNotSent error and their nonces are released to the nonce manager.
+        The transactions of the same wave with a higher nonce stay in the mempool until the rejected
+        nonce is used again, the account.nonce is set to the last nonce accepted without gaps.
+
+        :param account: the account signing the spend transactions (sender), it must be a basic account
+        :param payments: a list of (recipient_id, amount) tuples, the recipient_id can be an address or an AENS name
+        :param payload: the payload for the transactions
+        :param fee: the fee for each transaction (automatically calculated if not provided)
+        :param tx_ttl: the transactions ttl expressed in relative number of blocks
+        :param max_in_flight: the max number of concurrent broadcasts, default to the http_pool_maxsize of the configuration
+
+        :return: the outcome of each payment, in the same order of the payments, as a Munch with the fields
+            recipient_id, amount, tx (the signed TxObject), tx_hash and error (the exception raised broadcasting
+            the transaction, TransactionNotSent if it has not been broadcast, None if it has been accepted by the node)
+
+        :raises TypeError: if a recipient_id is not a valid name_id or address or if the account is generalized
+        """
+        payments = _parse_payments(payments)
+        fee = utils.amount_to_aettos(fee)
+        # retrieve the account, the nonces and the ttl once for the whole batch
+        on_chain_account = self.get_account(account.get_address())
+        if on_chain_account.is_generalized():
+            raise TypeError("spend_many is not supported for generalized accounts")
+        ttl = self.compute_absolute_ttl(tx_ttl).absolute_ttl if tx_ttl > 0 else 0
+        if self.nonce_manager is not None:
+            nonces = [self.nonce_manager.reserve(account.get_address()) for _ in payments]
+        else:
+            first_nonce = max(on_chain_account.nonce, account.nonce) + 1
+            nonces = list(range(first_nonce, first_nonce + len(payments)))
+        # sign the transactions
+        signer = transactions.TxSigner(account, self.config.network_id)
+        results = _sign_spends(self.tx_builder, signer, payments, nonces, payload, fee, ttl)
+
+        def broadcast(result):
+            try:
+                self.broadcast_transaction(result.tx)
+            except Exception as e:
+                result.error = e
+
+        # broadcast the transactions in waves of consecutive nonces, a wave starts when the previous one
+        # has been accepted, so a transaction reaches the node at most max_in_flight nonces ahead of the
+        # lower pending one, and the node keeps it in the mempool until the gap is filled
+        max_in_flight = max_in_flight or self.config.http_pool_maxsize
+        ordered = sorted(zip(nonces, results), key=lambda x: x[0])
+        with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+            for i in range(0, len(ordered), max_in_flight):
+                list(executor.map(broadcast, [result for _, result in ordered[i:i + max_in_flight]]))
+                if _end_of_wave(ordered, i + max_in_flight, self.nonce_manager):
+                    break
+        account.nonce = _last_accepted_nonce(ordered, account.nonce)
+        return results
+
     def wait_for_transaction(self, tx, max_retries=None, polling_interval=None) -> int:
         """
         Wait for a transaction to be mined for an account
@@ -385,10 +1001,17 @@ class NodeClient:
         if retries <= 0:
             raise ValueError("Retries must be greater than 0")
 
+        tx_hash = tx.hash if isinstance(tx, transactions.TxObject) else tx
+        if self.chain_events is not None and self.chain_events.start():
+            # wait for the micro block events, as long as the polling would
+            timeout = sum(interval ** n + 1 for n in range(1, retries))
+            try:
+                return self.chain_events.wait_for_transaction(tx_hash, timeout)
+            except ConnectionError as e:
+                logger.debug(f"falling back to polling for transaction {tx_hash}: {e}")
         # start polling
         n = 1
         total_sleep = 0
-        tx_hash = tx.hash if isinstance(tx, transactions.TxObject) else tx
         # tx_height = -1
         while True:
             # query the transaction
@@ -438,6 +1061,13 @@ class NodeClient:
         interval = polling_interval if polling_interval is not None else self.config.poll_block_retries_interval
         if retries <= 0 or interval <= 0:
             raise ValueError("max_retries and polling_interval must be greater than 0")
+        if self.chain_events is not None and self.chain_events.start():
+            # wait for the key block events, as long as the polling would
+            try:
+                self.chain_events.wait_for_height(min_block_height, retries * interval, tx_hash=tx_hash)
+                return tx_height
+            except ConnectionError as e:
+                logger.debug(f"falling back to polling for the confirmation of transaction {tx_hash}: {e}")
         # start polling
         n = 1
         total_sleep = 0
@@ -455,6 +1085,35 @@ class NodeClient:
             n += 1
         return tx_height
 
+    def wait_for_confirmations(self, txs: list, timeout: float = None, polling_interval: float = None) -> list:
+        """
+        Wait for many transactions to be confirmed by at least "key_block_confirmation_num" blocks,
+        checking them together in shared rounds with a ConfirmationTracker instead of polling each of them
+
+        Args:
+            txs (list): the TxObjects or transaction hashes of the transactions to wait for
+            timeout (float): the max time in seconds to wait, default to poll_block_max_retries * poll_block_retries_interval
+            polling_interval (float): the interval in seconds between the rounds, default to defaults.CONFIRMATION_ROUND_INTERVAL
+        Returns:
+            the outcome of each transaction, in the same order of the transactions, as a Munch with the fields
+            tx_hash, block_height (None if the transaction has not been confirmed) and error
+            (the TransactionWaitTimeoutExpired raised for the transaction, None if it has been confirmed)
+        """
+        timeout = timeout if timeout is not None else self.config.poll_block_max_retries * self.config.poll_block_retries_interval
+        interval = polling_interval if polling_interval is not None else defaults.CONFIRMATION_ROUND_INTERVAL
+        tracker = confirmations.ConfirmationTracker(self)
+        futures = tracker.track_many(txs)
+        tracker.wait(timeout=timeout, interval=interval)
+        results = []
+        for tx, future in zip(txs, futures):
+            error = future.exception()
+            results.append(Munch(
+                tx_hash=tx.hash if isinstance(tx, transactions.TxObject) else tx,
+                block_height=future.result() if error is None else None,
+                error=error,
+            ))
+        return results
+
     def transfer_funds(self, account: Account,
                        recipient_id: str,
                        percentage: float,
@@ -477,17 +1136,18 @@ class NodeClient:
         account_on_chain = self.get_account_by_pubkey(pubkey=account.get_address())
         request_transfer_amount = int(account_on_chain.balance * percentage)
         # retrieve the nonce
-        account.nonce = account_on_chain.nonce + 1
+        nonce = account_on_chain.nonce + 1 if self.nonce_manager is None else self.get_next_nonce(account)
+        account.nonce = nonce
         # retrieve ttl
         tx_ttl = self.compute_absolute_ttl(tx_ttl)
         # build the transaction
-        tx = self.tx_builder.tx_spend(account.get_address(), recipient_id, request_transfer_amount, payload, fee, tx_ttl.absolute_ttl, account.nonce)
+        tx = self.tx_builder.tx_spend(account.get_address(), recipient_id, request_transfer_amount, payload, fee, tx_ttl.absolute_ttl, nonce)
         # if the request_transfer_amount should include the fee keep calculating the fee
         if include_fee:
             amount = request_transfer_amount
             while (amount + tx.data.fee) > request_transfer_amount:
                 amount = request_transfer_amount - tx.data.fee
-                tx = self.tx_builder.tx_spend(account.get_address(), recipient_id, amount, payload, fee, tx_ttl.absolute_ttl, account.nonce)
+                tx = self.tx_builder.tx_spend(account.get_address(), recipient_id, amount, payload, fee, tx_ttl.absolute_ttl, nonce)
         # execute the transaction
         tx = self.sign_transaction(account, tx)
         # post the transaction
@@ -593,6 +1253,14 @@ class NodeClient:
         tx = self.sign_transaction(account, tx)
         # broadcast the transaction
         self.broadcast_transaction(tx)
+        if self.account_cache is not None:
+            if self.config.blocking_mode:
+                # the transaction has been included, the account is now generalized
+                self.account_cache.put(account.get_address(), identifiers.ACCOUNT_KIND_GENERALIZED,
+                                       auth_fun_hash, hashing.contract_id(account.get_address(), nonce))
+            else:
+                # the kind of the account is retrieved again from the node, that knows when the attach is included
+                self.account_cache.invalidate(account.get_address())
         return tx
 
     def delegate_name_preclaim_signature(self, account: Account, contract_id: str):
@@ -0,0 +1,796 @@
+import asyncio
+import logging
+import random
+from collections import deque
+from datetime import datetime, timedelta
+from munch import Munch
+
+from aeternity.signing import Account
+from aeternity.openapi import OpenAPIClientException
+from aeternity.node import Config, AccountCache, HeightCache, _parse_payments, _sign_spends, _chain_heights, _generation_item
+from aeternity.node import _end_of_wave, _last_accepted_nonce
+from aeternity.aens import AEName
+from aeternity import openapi, transactions, defaults, identifiers, exceptions, utils, hashing, nonce_manager
+from aeternity.exceptions import TransactionWaitTimeoutExpired, TransactionHashMismatch
+from aeternity import __node_compatibility__
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncNodeClient:
+    """
+    An asyncio version of the NodeClient, the methods that interact with the node
+    are coroutines and the api methods generated from the node OpenAPI definition
+    are available as coroutines too.
+
+    It requires the optional dependency aiohttp.
+
+    Example:
+        async with AsyncNodeClient(Config(external_url=url)) as client:
+            txs = await asyncio.gather(*[client.get_transaction(th) for th in hashes])
+    """
+
+    def __init__(self, config=Config()):
+        """
+        Initialize a new AsyncNodeClient
+
+        Args:
+            config: the configuration to use or empty for default
+        """
+        self.config = config
+        # instantiate the transaction builder object
+        self.tx_builder = transactions.TxBuilder(
+            base_gas=config.tx_base_gas,
+            gas_per_byte=config.tx_gas_per_byte,
+            gas_price=config.tx_gas_price,
+            key_block_interval=config.key_block_interval
+        )
+
+        # instantiate the api client
+        self.api = openapi.AsyncOpenAPICli(url=config.api_url,
+                                           url_internal=config.api_url_internal,
+                                           debug=config.debug,
+                                           force_compatibility=config.force_compatibility,
+                                           compatibility_version_range=__node_compatibility__,
+                                           session=config.http_session,
+                                           timeout=config.http_timeout,
+                                           pool_maxsize=config.http_pool_maxsize,
+                                           keep_alive=config.http_keep_alive,
+                                           spec=config.api_spec,
+                                           spec_cache=config.spec_cache,
+                                           json_backend=config.api_json_backend,
+                                           lazy_responses=config.api_lazy_responses)
+
+        # local nonces allocation
+        self.nonce_manager = None
+        if config.nonce_manager:
+            self.nonce_manager = nonce_manager.AsyncNonceManager(self,
+                                                                 sync_interval=config.nonce_sync_interval,
+                                                                 reclaim_after=config.nonce_reclaim_after)
+
+        # chain height cache, refreshed when stale
+        self.height_cache = None
+        if config.height_cache_max_age > 0:
+            self.height_cache = HeightCache(None, max_age=config.height_cache_max_age)
+
+        # account kind cache
+        self.account_cache = AccountCache(max_age=config.account_cache_max_age) if config.account_cache_max_age > 0 else None
+
+    # enable composition
+    def __getattr__(self, attr):
+        return getattr(self.api, attr)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def close(self):
+        """
+        Close the connections opened by the client
+        """
+        await self.api.close()
+
+    async def get_network_id(self) -> str:
+        """
+        Get the network id of the configuration,
+        if it is not set it will be retrieved from the node
+        """
+        if self.config.network_id is None:
+            status = await self.api.get_status()
+            self.config.network_id = status.network_id
+        return self.config.network_id
+
+    async def compute_absolute_ttl(self, relative_ttl):
+        """
+        Compute the absolute ttl by adding the ttl to the current height of the chain,
+        the height is taken from the height cache when enabled in the configuration
+
+        :param relative_ttl: the relative ttl, if 0 will set the ttl to 0
+        """
+        if self.height_cache is not None and self.height_cache.is_fresh():
+            height = self.height_cache.height
+        else:
+            height = await self.get_current_key_block_height()
+            if self.height_cache is not None:
+                self.height_cache.update(height)
+        ttl = dict(
+            absolute_ttl=0,
+            height=height,
+            estimated_expiration=datetime.now()
+        )
+        if relative_ttl > 0:
+            ttl["absolute_ttl"] = ttl["height"] + relative_ttl
+            ttl["estimated_expiration"] = datetime.now() + timedelta(minutes=self.config.key_block_interval * relative_ttl)
+        return Munch.fromDict(ttl)
+
+    async def get_next_nonce(self, account, use_cached=True):
+        """
+        Get the next nonce to be used for a transaction for an account.
+        If account is an instance Account, the cached value of the account.nonce will be used
+        unless the parameter use_cached is set to False.
+        If the nonce manager is enabled in the configuration the nonce is reserved
+        by the nonce manager and the cached value is ignored
+
+        Args:
+            account: the account instance or account address of get the nonce for
+            use_cached: use the cached value in the account.nonce property in case of an account object (default True)
+        Returns:
+            the next nonce for an account
+        """
+
+        async def get_nonce(pubkey):
+            try:
+                account = await self.api.get_account_by_pubkey(pubkey=pubkey)
+                return account.nonce
+            except Exception:
+                return 0
+
+        # reserve the nonce locally
+        if self.nonce_manager is not None:
+            address = account.get_address() if isinstance(account, Account) else account
+            return await self.nonce_manager.reserve(address)
+        # use cache nonce value
+        if isinstance(account, Account):
+            if account.nonce > 0 and use_cached:
+                return account.nonce + 1
+            return await get_nonce(account.get_address()) + 1
+        return await get_nonce(account) + 1
+
+    async def _get_nonce_ttl(self, account_address: str, relative_ttl: int):
+        """
+        Helper method to compute both absolute ttl and  nonce for an account
+
+        :return: (nonce, ttl)
+        """
+        ttl = (await self.compute_absolute_ttl(relative_ttl)).absolute_ttl if relative_ttl > 0 else 0
+        nonce = await self.get_next_nonce(account_address)
+        return nonce, ttl
+
+    async def get_top_block(self):
+        """
+        Override the native method to transform the get top block response object
+        to a Block
+
+        :return: a block (either key block or micro block)
+        """
+        b = await self.api.get_top_block()
+        return b.key_block if hasattr(b, 'key_block') else b.micro_block
+
+    async def _fetch_generation(self, height, decode):
+        """retrieve a generation and the transactions of its micro blocks"""
+        generation = await self.get_generation_by_height(height=height)
+        replies = await asyncio.gather(*[self.get_micro_block_transactions_by_hash(hash=mb_hash) for mb_hash in generation.micro_blocks])
+        micro_blocks = [(mb_hash, self.tx_builder.parse_transactions(reply) if decode else reply.transactions)
+                        for mb_hash, reply in zip(generation.micro_blocks, replies)]
+        return _generation_item(generation, micro_blocks)
+
+    async def iter_generations(self, from_height: int = 0, to_height: int = None, reverse: bool = False,
+                               window: int = defaults.CHAIN_ITERATOR_WINDOW, decode: bool = True):
+        """
+        Walk the chain generation by generation, see NodeClient.iter_generations
+
+        :return: an async generator of Munch with the fields height, key_block and micro_blocks
+        """
+        if to_height is None:
+            to_height = await self.get_current_key_block_height()
+        heights = iter(_chain_heights(from_height, to_height, reverse))
+        pending = deque()
+        try:
+            for height in heights:
+                pending.append(asyncio.ensure_future(self._fetch_generation(height, decode)))
+                if len(pending) >= window:
+                    break
+            while len(pending) > 0:
+                item = await pending.popleft()
+                # keep the window full
+                height = next(heights, None)
+                if height is not None:
+                    pending.append(asyncio.ensure_future(self._fetch_generation(height, decode)))
+                yield item
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def iter_transactions(self, from_height: int = 0, to_height: int = None, reverse: bool = False,
+                                window: int = defaults.CHAIN_ITERATOR_WINDOW):
+        """
+        Walk the transactions of the chain, see NodeClient.iter_transactions
+
+        :return: an async generator of TxObject
+        """
+        async for generation in self.iter_generations(from_height, to_height, reverse=reverse, window=window):
+            for micro_block in generation.micro_blocks:
+                for tx in micro_block.transactions:
+                    yield tx
+
+    async def _is_generalized(self, account: Account) -> bool:
+        """
+        Tells if an account is generalized, see NodeClient._is_generalized
+        """
+        if self.config.offline:
+            return account.is_generalized()
+        address = account.get_address()
+        entry = self.account_cache.get(address) if self.account_cache is not None else None
+        if entry is None:
+            on_chain_account = await self.get_account(address)
+            if self.account_cache is None:
+                return on_chain_account.is_generalized()
+            entry = self.account_cache.put(address, on_chain_account.kind, on_chain_account.auth_fun, on_chain_account.contract_id)
+        return entry.kind == identifiers.ACCOUNT_KIND_GENERALIZED
+
+    async def broadcast_transaction(self, tx: transactions.TxObject):
+        """
+        Post a transaction to the chain and verify that the hash match the local calculated hash
+        It waits for the transaction to be included if in blocking_mode
+
+        :param tx: the transaction to broadcast
+        :return: the transaction hash of the transaction
+
+        :raises TransactionHashMismatch: if the transaction hash returned by the node is different from the one calculated
+        """
+        try:
+            reply = await self.post_transaction(body={"tx": tx.tx})
+        except OpenAPIClientException as e:
+            # the transaction was rejected, its nonce can be used again
+            if self.nonce_manager is not None:
+                self.nonce_manager.release_transaction(tx)
+            raise e
+        if reply.tx_hash != tx.hash:
+            raise TransactionHashMismatch(f"Transaction hash doesn't match, expected {tx.hash} got {reply.tx_hash}")
+
+        if self.config.blocking_mode:
+            await self.wait_for_transaction(reply.tx_hash)
+        return reply.tx_hash
+
+    async def sign_transaction(self, account: Account, tx: transactions.TxObject, metadata: dict = {}, **kwargs) -> transactions.TxObject:
+        """
+        The function sign a transaction to be broadcast to the chain.
+        It automatically detect if the account is Basic or GA and return
+        the correct transaction to be broadcast.
+
+        See NodeClient.sign_transaction for the supported kwargs
+
+        :param account: the account signing the transaction
+        :param tx: the transaction to be signed
+        :param metadata: additional metadata to maintain in the TxObject
+
+        :return: a TxObject of the signed transaction or metat transaction for GA
+        :raises TypeError: if the auth_data is missing and the account is GA
+        :raises TypeError: if the gas for auth_func is gt defaults.GA_MAX_AUTH_FUN_GAS
+        """
+        # if the account is not generalized sign and return the transaction
+        if not await self._is_generalized(account):
+            s = transactions.TxSigner(account, await self.get_network_id())
+            signature = s.sign_transaction(tx, metadata)
+            return self.tx_builder.tx_signed([signature], tx, metadata=metadata)
+
+        # if the account is generalized then prepare the ga_meta_tx
+        # 1. wrap the tx into a signed tx (without signatures)
+        sg_tx = self.tx_builder.tx_signed([], tx)
+        # 2. wrap the tx into a ga_meta_tx
+        # get the absolute ttl
+        ttl = (await self.compute_absolute_ttl(kwargs.get("ttl", defaults.TX_TTL))).absolute_ttl
+        # get abi version
+        _, abi = await self.get_vm_abi_versions()
+        # check that the parameter auth_data is provided
+        auth_data = kwargs.get("auth_data")
+        if auth_data is None:
+            raise TypeError("the auth_data parameter is required for ga accounts")
+        # verify the gas amount TODO: add a tx verification
+        gas = kwargs.get("gas", defaults.GA_MAX_AUTH_FUN_GAS)
+        if gas > defaults.GA_MAX_AUTH_FUN_GAS:
+            raise TypeError(f"the maximum gas value for ga auth_fun is {defaults.GA_MAX_AUTH_FUN_GAS}, got {gas}")
+        # build the
+        ga_sg_tx = self.tx_builder.tx_ga_meta(
+            account.get_address(),
+            auth_data,
+            kwargs.get("abi_version", abi),
+            kwargs.get("fee", defaults.FEE),
+            gas,
+            kwargs.get("gas_price", defaults.CONTRACT_GAS_PRICE),
+            ttl,
+            sg_tx
+        )
+        # 3. wrap the the ga into a signed transaction
+        sg_ga_sg_tx = self.tx_builder.tx_signed([], ga_sg_tx, metadata=metadata)
+        return sg_ga_sg_tx
+
+    async def _sign_and_broadcast(self, account: Account, tx: transactions.TxObject, metadata: dict = {}) -> transactions.TxObject:
+        """
+        Helper method to sign and broadcast a transaction
+
+        :return: the signed TxObject
+        """
+        tx_signed = await self.sign_transaction(account, tx, metadata=metadata)
+        await self.broadcast_transaction(tx_signed)
+        return tx_signed
+
+    async def get_account(self, address: str) -> Account:
+        """
+        Retrieve an account by it's public key
+        """
+        if not utils.is_valid_hash(address, identifiers.ACCOUNT_ID):
+            raise TypeError(f"Input {address} is not a valid aeternity address")
+        remote_account = await self.get_account_by_pubkey(pubkey=address)
+        return Account.from_node_api(remote_account)
+
+    async def get_balance(self, account) -> int:
+        """
+        Retrieve the balance of an account, return 0 if the account has not balance
+
+        :param account: either an account address or a signing.Account object
+        :return: the account balance or 0 if the account is not known to the network
+        """
+        address = account.get_address() if isinstance(account, Account) else account
+        try:
+            return (await self.get_account(address)).balance
+        except Exception:
+            return 0
+
+    async def get_transaction(self, transaction_hash: str) -> transactions.TxObject:
+        """
+        Retrieve a transaction by it's hash.
+
+        Args:
+            transaction_hash: the hash of the transaction to retrieve
+        Returns:
+           the TxObject of the transaction
+        Raises:
+            ValueError: if the transaction  hash is not a valid hash for transactions
+        """
+        if not utils.is_valid_hash(transaction_hash, identifiers.TRANSACTION_HASH):
+            raise ValueError(f"Input {transaction_hash} is not a valid aeternity address")
+        tx = await self.get_transaction_by_hash(hash=transaction_hash)
+        return self.tx_builder.parse_node_reply(tx)
+
+    async def spend(self, account: Account,
+                    recipient_id: str,
+                    amount,
+                    payload: str = "",
+                    fee: int = defaults.FEE,
+                    tx_ttl: int = defaults.TX_TTL) -> transactions.TxObject:
+        """
+        Create and execute a spend transaction,
+        automatically retrieve the nonce for the siging account
+        and calculate the absolut ttl.
+
+        :param account: the account signing the spend transaction (sender)
+        :param recipient_id: the recipient address or name_id
+        :param amount: the amount to spend
+        :param payload: the payload for the transaction
+        :param fee: the fee for the transaction (automatically calculated if not provided)
+        :param tx_ttl: the transaction ttl expressed in relative number of blocks
+
+        :return: the TxObject of the transaction
+
+        :raises TypeError:  if the recipient_id is not a valid name_id or address
+        """
+        if utils.is_valid_aens_name(recipient_id):
+            recipient_id = hashing.name_id(recipient_id)
+        elif not utils.is_valid_hash(recipient_id, prefix="ak"):
+            raise TypeError("Invalid recipient_id. Please provide a valid AENS name or account pub_key.")
+        # parse amount and fee
+        amount, fee = utils._amounts_to_aettos(amount, fee)
+        # retrieve the nonce and ttl
+        nonce = await self.get_next_nonce(account)
+        account.nonce = nonce
+        tx_ttl = await self.compute_absolute_ttl(tx_ttl)
+        # build the transaction
+        tx = self.tx_builder.tx_spend(account.get_address(), recipient_id, amount, payload, fee, tx_ttl.absolute_ttl, nonce)
+        # sign and post the transaction
+        return await self._sign_and_broadcast(account, tx)
+
+    async def spend_many(self, account: Account,
+                         payments: list,
+                         payload: str = "",
+                         fee: int = defaults.FEE,
+                         tx_ttl: int = defaults.TX_TTL,
+                         max_in_flight: int = None) -> list:
+        """
+        Create and execute a batch of spend transactions from the same account.
+        See NodeClient.spend_many for details
+
+        :param account: the account signing the spend transactions (sender), it must be a basic account
+        :param payments: a list of (recipient_id, amount) tuples, the recipient_id can be an address or an AENS name
+        :param payload: the payload for the transactions
+        :param fee: the fee for each transaction (automatically calculated if not provided)
+        :param tx_ttl: the transactions ttl expressed in relative number of blocks
+        :param max_in_flight: the max number of concurrent broadcasts, default to the http_pool_maxsize of the configuration
+
+        :return: the outcome of each payment, in the same order of the payments
+        :raises TypeError: if a recipient_id is not a valid name_id or address or if the account is generalized
+        """
+        payments = _parse_payments(payments)
+        fee = utils.amount_to_aettos(fee)
+        # retrieve the account, the nonces and the ttl once for the whole batch
+        on_chain_account = await self.get_account(account.get_address())
+        ttl = (await self.compute_absolute_ttl(tx_ttl)).absolute_ttl if tx_ttl > 0 else 0
+        if on_chain_account.is_generalized():
+            raise TypeError("spend_many is not supported for generalized accounts")
+        if self.nonce_manager is not None:
+            nonces = [await self.nonce_manager.reserve(account.get_address()) for _ in payments]
+        else:
+            first_nonce = max(on_chain_account.nonce, account.nonce) + 1
+            nonces = list(range(first_nonce, first_nonce + len(payments)))
+        # sign the transactions
+        signer = transactions.TxSigner(account, await self.get_network_id())
+        results = _sign_spends(self.tx_builder, signer, payments, nonces, payload, fee, ttl)
+
+        async def broadcast(result):
+            try:
+                await self.broadcast_transaction(result.tx)
+            except Exception as e:
+                result.error = e
+
+        # broadcast the transactions in waves of consecutive nonces, as NodeClient.spend_many
+        max_in_flight = max_in_flight or self.config.http_pool_maxsize
+        ordered = sorted(zip(nonces, results), key=lambda x: x[0])
+        for i in range(0, len(ordered), max_in_flight):
+            await asyncio.gather(*[broadcast(result) for _, result in ordered[i:i + max_in_flight]])
+            if _end_of_wave(ordered, i + max_in_flight, self.nonce_manager):
+                break
+        account.nonce = _last_accepted_nonce(ordered, account.nonce)
+        return results
+
+    async def wait_for_transaction(self, tx, max_retries=None, polling_interval=None) -> int:
+        """
+        Wait for a transaction to be mined for an account
+        See NodeClient.wait_for_transaction for details
+
+        Args:
+            tx (TxObject|str): the TxObject or transaction hash of the transaction to wait for
+            max_retries (int): the maximum number of retries to test for transaction
+            polling_interval (int): the interval between transaction polls
+        Returns:
+            the block height of the transaction if it has been found
+        Raises:
+            TransactionWaitTimeoutExpired: if the transaction hasn't been found
+        """
+        retries = max_retries if max_retries is not None else self.config.poll_tx_max_retries
+        interval = polling_interval if polling_interval is not None else self.config.poll_tx_retries_interval
+        if retries <= 0:
+            raise ValueError("Retries must be greater than 0")
+
+        # start polling
+        n = 1
+        total_sleep = 0
+        tx_hash = tx.hash if isinstance(tx, transactions.TxObject) else tx
+        while True:
+            # query the transaction
+            try:
+                tx = await self.get_transaction_by_hash(hash=tx_hash)
+            except OpenAPIClientException as e:
+                # it may fail because it is not found that means that
+                # or it was invalid or the ttl has expired
+                reason = e.reason if hasattr(e, "reason") else "Timeout expired"
+                raise TransactionWaitTimeoutExpired(tx_hash=tx_hash, reason=reason)
+            # if the tx.block_height >= min_block_height we are ok
+            if tx.block_height >= 0:
+                tx_height = tx.block_height
+                break
+            if n >= retries:
+                raise TransactionWaitTimeoutExpired(tx_hash=tx_hash, reason=f"The transaction was not included in {total_sleep} seconds, wait aborted")
+            # calculate sleep time
+            sleep_time = (interval ** n) + (random.randint(0, 1000) / 1000.0)
+            await asyncio.sleep(sleep_time)
+            total_sleep += sleep_time
+            # increment n
+            n += 1
+        return tx_height
+
+    async def wait_for_confirmation(self, tx, max_retries=None, polling_interval=None) -> int:
+        """
+        Wait for a transaction to be confirmed by at least "key_block_confirmation_num" blocks (default 3)
+        See NodeClient.wait_for_confirmation for details
+
+        Args:
+            tx (TxObject|str): the TxObject or transaction hash of the transaction to wait for
+            max_retries (int): the maximum number of retries to test for transaction
+            polling_interval (int): the interval between transaction polls
+        Returns:
+            the block height of the transaction if it has been found
+        Raises:
+            TransactionWaitTimeoutExpired: if the transaction hasn't been found
+        """
+        tx_hash = tx.hash if isinstance(tx, transactions.TxObject) else tx
+        # first wait for the transaction to be found
+        tx_height = await self.wait_for_transaction(tx_hash)
+        # now calculate the min block height
+        min_block_height = tx_height + self.config.key_block_confirmation_num
+        retries = max_retries if max_retries is not None else self.config.poll_block_max_retries
+        interval = polling_interval if polling_interval is not None else self.config.poll_block_retries_interval
+        if retries <= 0 or interval <= 0:
+            raise ValueError("max_retries and polling_interval must be greater than 0")
+        # start polling
+        n = 1
+        total_sleep = 0
+        while True:
+            current_height = await self.get_current_key_block_height()
+            # if the tx.block_height >= min_block_height we are ok
+            if current_height >= min_block_height:
+                break
+            if n >= retries:
+                raise TransactionWaitTimeoutExpired(tx_hash=tx_hash, reason=f"The transaction was not included in {total_sleep} seconds, wait aborted")
+            await asyncio.sleep(interval)
+            total_sleep += interval
+            n += 1
+        return tx_height
+
+    async def get_consensus_protocol_version(self, height: int = None) -> int:
+        """
+        Get the consensus protocol version number
+        :param height: the height to get the protocol version for, if None the current height will be used
+        :return: the version
+        """
+        if height is None:
+            height = await self.get_current_key_block_height()
+        if height < 0:
+            raise ValueError("height must be a number >= 0")
+        status = await self.get_status()
+        effective_at_height = -1
+        version = 0
+        for p in status.protocols:
+            if height >= p.effective_at_height and p.effective_at_height > effective_at_height:
+                version, effective_at_height = p.version, p.effective_at_height
+        return version
+
+    async def get_vm_abi_versions(self):
+        """
+        Check the version of the node and retrieve the correct values for abi and vm version
+        """
+        protocol_version = await self.get_consensus_protocol_version()
+        protocol_abi_vm = identifiers.PROTOCOL_ABI_VM.get(protocol_version)
+        if protocol_abi_vm is None:
+            raise exceptions.UnsupportedNodeVersion(f"Version {self.api_version} is not supported")
+        return (protocol_abi_vm.get("vm"), protocol_abi_vm.get("abi"))
+
+    #
+    # AENS
+    #
+
+    async def name_preclaim(self, account: Account, domain: str, fee=defaults.FEE, tx_ttl=defaults.TX_TTL) -> transactions.TxObject:
+        """
+        Execute a name pre-claim transaction
+
+        :param account: the account performing the pre-claim
+        :param domain: the name to pre-claim
+        :param fee: the fee for the transaction, [optional, calculated automatically]
+        :param tx_ttl: relative number of blocks for the validity of the transaction
+
+        :return: the TxObject of the pre-claim transaction, the salt used for the commitment_id is in the metadata
+        """
+        if not utils.is_valid_aens_name(domain):
+            raise ValueError("Invalid domain ", domain)
+        fee = utils.amount_to_aettos(fee)
+        commitment_id, salt = hashing.commitment_id(domain.lower())
+        nonce, ttl = await self._get_nonce_ttl(account.get_address(), tx_ttl)
+        tx = self.tx_builder.tx_name_preclaim(account.get_address(), commitment_id, fee, ttl, nonce)
+        return await self._sign_and_broadcast(account, tx, metadata={"salt": salt})
+
+    async def name_claim(self, account: Account, domain: str, name_salt: int,
+                         name_fee=defaults.NAME_FEE,
+                         fee=defaults.FEE,
+                         tx_ttl=defaults.TX_TTL) -> transactions.TxObject:
+        """
+        Execute a name claim transaction, the pre-claim transaction must have been confirmed
+
+        :param account: the account performing the claim
+        :param domain: the name to claim
+        :param name_salt: the salt used to calculated the commitment_id in the pre-claim phase
+        :param name_fee: the initial fee for the claim [optional, automatically calculated]
+        :param fee: the fee for the transaction, [optional, calculated automatically]
+        :param tx_ttl: relative number of blocks for the validity of the transaction
+
+        :return: the TxObject of the claim transaction
+
+        :raises TypeError: if the value of the name_fee is not sufficient to successfully execute the claim
+        """
+        name_fee, fee = utils._amounts_to_aettos(name_fee, fee)
+        min_name_fee = AEName.get_minimum_name_fee(domain)
+        if name_fee != defaults.NAME_FEE and name_fee < min_name_fee:
+            raise TypeError(f"the provided fee {name_fee} is not enough to execute the claim, required: {min_name_fee}")
+        name_fee = max(min_name_fee, name_fee)
+        nonce, ttl = await self._get_nonce_ttl(account.get_address(), tx_ttl)
+        tx = self.tx_builder.tx_name_claim_v2(account.get_address(), domain.lower(), name_salt, name_fee, fee, ttl, nonce)
+        return await self._sign_and_broadcast(account, tx)
+
+    async def name_update(self, account: Account, domain: str, *targets,
+                          name_ttl=defaults.NAME_MAX_TTL,
+                          client_ttl=defaults.NAME_MAX_CLIENT_TTL,
+                          fee=defaults.FEE,
+                          tx_ttl=defaults.TX_TTL) -> transactions.TxObject:
+        """
+        Update the pointers and/or the name_ttl of a claimed name, see AEName.update
+
+        :param account: the account singing the update transaction
+        :param domain: the name to update
+        :param targets: the list of pointers targets
+        :param name_ttl: the number of blocks before the name enters in the revoked state
+        :param client_ttl: the ttl for client to cache the name in seconds
+        :param fee: the fee for the transaction, [optional, calculated automatically]
+        :param tx_ttl: relative number of blocks for the validity of the transaction
+
+        :return: the TxObject of the update transaction
+        """
+        fee = utils.amount_to_aettos(fee)
+        name = AEName(domain, client=self)
+        pointers = name._get_pointers(targets)
+        nonce, ttl = await self._get_nonce_ttl(account.get_address(), tx_ttl)
+        tx = self.tx_builder.tx_name_update(account.get_address(), name.name_id, pointers, name_ttl, client_ttl, fee, ttl, nonce)
+        return await self._sign_and_broadcast(account, tx)
+
+    async def name_transfer(self, account: Account, domain: str, recipient_id: str, fee=defaults.FEE, tx_ttl=defaults.TX_TTL) -> transactions.TxObject:
+        """
+        Transfer ownership of a name to another account
+
+        :param account: the account singing the transfer transaction and owner of the name
+        :param domain: the name to transfer
+        :param recipient_id: the recipient of the name transfer that will become the new owner
+        :param fee: the fee for the transaction, [optional, calculated automatically]
+        :param tx_ttl: relative number of blocks for the validity of the transaction
+
+        :return: the TxObject of the transfer transaction
+        """
+        fee = utils.amount_to_aettos(fee)
+        nonce, ttl = await self._get_nonce_ttl(account.get_address(), tx_ttl)
+        tx = self.tx_builder.tx_name_transfer(account.get_address(), hashing.name_id(domain), recipient_id, fee, ttl, nonce)
+        return await self._sign_and_broadcast(account, tx)
+
+    async def name_revoke(self, account: Account, domain: str, fee=defaults.FEE, tx_ttl=defaults.TX_TTL) -> transactions.TxObject:
+        """
+        Revoke a registered name
+
+        :param account: the account singing the revoke transaction and owner of the name
+        :param domain: the name to revoke
+        :param fee: the fee for the transaction, [optional, calculated automatically]
+        :param tx_ttl: relative number of blocks for the validity of the transaction
+
+        :return: the TxObject of the revoke transaction
+        """
+        fee = utils.amount_to_aettos(fee)
+        nonce, ttl = await self._get_nonce_ttl(account.get_address(), tx_ttl)
+        tx = self.tx_builder.tx_name_revoke(account.get_address(), hashing.name_id(domain), fee, ttl, nonce)
+        return await self._sign_and_broadcast(account, tx)
+
+    #
+    # Oracles
+    #
+
+    async def oracle_register(self, account: Account, query_format, response_format,
+                              query_fee=defaults.ORACLE_QUERY_FEE,
+                              ttl_type=defaults.ORACLE_TTL_TYPE,
+                              ttl_value=defaults.ORACLE_TTL_VALUE,
+                              vm_version=defaults.ORACLE_VM_VERSION,
+                              fee=defaults.FEE,
+                              tx_ttl=defaults.TX_TTL) -> transactions.TxObject:
+        """
+        Execute a registration of an oracle, the oracle id is in the metadata of the returned transaction
+        """
+        nonce, ttl = await self._get_nonce_ttl(account.get_address(), tx_ttl)
+        tx = self.tx_builder.tx_oracle_register(account.get_address(), query_format, response_format,
+                                                query_fee, ttl_type, ttl_value, vm_version,
+                                                fee, ttl, nonce)
+        return await self._sign_and_broadcast(account, tx, metadata={"oracle_id": hashing.oracle_id(account.get_address())})
+
+    async def oracle_query(self, sender: Account, oracle_id: str, query,
+                           query_fee=defaults.ORACLE_QUERY_FEE,
+                           query_ttl_type=defaults.ORACLE_TTL_TYPE,
+                           query_ttl_value=defaults.ORACLE_QUERY_TTL_VALUE,
+                           response_ttl_type=defaults.ORACLE_TTL_TYPE,
+                           response_ttl_value=defaults.ORACLE_RESPONSE_TTL_VALUE,
+                           fee=defaults.FEE,
+                           tx_ttl=defaults.TX_TTL) -> transactions.TxObject:
+        """
+        Execute a query to an oracle, the query id is in the metadata of the returned transaction
+        """
+        nonce, ttl = await self._get_nonce_ttl(sender.get_address(), tx_ttl)
+        tx = self.tx_builder.tx_oracle_query(oracle_id, sender.get_address(), query,
+                                             query_fee, query_ttl_type, query_ttl_value,
+                                             response_ttl_type, response_ttl_value,
+                                             fee, ttl, nonce)
+        query_id = hashing.oracle_query_id(sender.get_address(), nonce, oracle_id)
+        return await self._sign_and_broadcast(sender, tx, metadata={"query_id": query_id})
+
+    async def oracle_respond(self, account: Account, query_id: str, response,
+                             response_ttl_type=defaults.ORACLE_TTL_TYPE,
+                             response_ttl_value=defaults.ORACLE_RESPONSE_TTL_VALUE,
+                             fee=defaults.FEE,
+                             tx_ttl=defaults.TX_TTL) -> transactions.TxObject:
+        """
+        Respond to an oracle query
+        """
+        oracle_id = hashing.oracle_id(account.get_address())
+        nonce, ttl = await self._get_nonce_ttl(account.get_address(), tx_ttl)
+        tx = self.tx_builder.tx_oracle_respond(oracle_id, query_id, response,
+                                               response_ttl_type, response_ttl_value,
+                                               fee, ttl, nonce)
+        return await self._sign_and_broadcast(account, tx)
+
+    async def oracle_extend(self, account: Account,
+                            ttl_type=defaults.ORACLE_TTL_TYPE,
+                            ttl_value=defaults.ORACLE_TTL_VALUE,
+                            fee=defaults.FEE,
+                            tx_ttl=defaults.TX_TTL) -> transactions.TxObject:
+        """
+        Extend the ttl of an oracle
+        """
+        oracle_id = hashing.oracle_id(account.get_address())
+        nonce, ttl = await self._get_nonce_ttl(account.get_address(), tx_ttl)
+        tx = self.tx_builder.tx_oracle_extend(oracle_id, ttl_type, ttl_value, fee, ttl, nonce)
+        return await self._sign_and_broadcast(account, tx)
+
+    #
+    # Contracts
+    #
+
+    async def contract_create(self, account: Account, bytecode: str, calldata: str,
+                              amount=defaults.CONTRACT_AMOUNT,
+                              deposit=defaults.CONTRACT_DEPOSIT,
+                              gas=defaults.CONTRACT_GAS,
+                              gas_price=defaults.CONTRACT_GAS_PRICE,
+                              fee=defaults.FEE,
+                              vm_version=None,
+                              abi_version=None,
+                              tx_ttl=defaults.TX_TTL) -> transactions.TxObject:
+        """
+        Create a contract and deploy it to the chain, the contract id is in the metadata of the returned transaction
+        """
+        amount, deposit, gas_price, fee = utils._amounts_to_aettos(amount, deposit, gas_price, fee)
+        if vm_version is None or abi_version is None:
+            vm, abi = await self.get_vm_abi_versions()
+            vm_version = vm if vm_version is None else vm_version
+            abi_version = abi if abi_version is None else abi_version
+        nonce, ttl = await self._get_nonce_ttl(account.get_address(), tx_ttl)
+        tx = self.tx_builder.tx_contract_create(account.get_address(), bytecode, calldata, amount, deposit,
+                                                gas, gas_price, vm_version, abi_version, fee, ttl, nonce)
+        contract_id = hashing.contract_id(account.get_address(), nonce)
+        return await self._sign_and_broadcast(account, tx, metadata={"contract_id": contract_id})
+
+    async def contract_call(self, account: Account, contract_id: str, function: str, calldata: str,
+                            amount=defaults.CONTRACT_AMOUNT,
+                            gas=defaults.CONTRACT_GAS,
+                            gas_price=defaults.CONTRACT_GAS_PRICE,
+                            fee=defaults.FEE,
+                            abi_version=None,
+                            tx_ttl=defaults.TX_TTL) -> transactions.TxObject:
+        """
+        Call a function of a contract deployed on the chain
+        """
+        amount, gas_price, fee = utils._amounts_to_aettos(amount, gas_price, fee)
+        if abi_version is None:
+            _, abi_version = await self.get_vm_abi_versions()
+        nonce, ttl = await self._get_nonce_ttl(account.get_address(), tx_ttl)
+        tx = self.tx_builder.tx_contract_call(account.get_address(), contract_id, calldata, function,
+                                              amount, gas, gas_price, abi_version, fee, ttl, nonce)
+        return await self._sign_and_broadcast(account, tx)
+
+    async def get_call_object(self, tx_hash: str):
+        """
+        Retrieve the call object of a contract call transaction
+        """
+        call_object = await self.get_transaction_info_by_hash(hash=tx_hash)
+        if hasattr(call_object, "call_info"):
+            return call_object.call_info
+        return call_object
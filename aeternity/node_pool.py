@@ -0,0 +1,217 @@
+import logging
+import threading
+import time
+
+import requests
+
+from aeternity import defaults
+from aeternity.exceptions import ConfigException
+from aeternity.openapi import OpenAPIClientException
+
+logger = logging.getLogger(__name__)
+
+# strategies to select the node serving a read request
+STRATEGY_LATENCY = "latency"
+STRATEGY_LEAST_OUTSTANDING = "least_outstanding"
+STRATEGIES = [STRATEGY_LATENCY, STRATEGY_LEAST_OUTSTANDING]
+
+
+class PoolNode:
+    """
+    A node of a NodePool, with its health and load statistics
+
+    Args:
+        url (str): the node external url
+        url_internal (str): the node internal url, if None the internal endpoints are not available on this node
+    """
+
+    def __init__(self, url, url_internal=None):
+        self.url = url
+        self.url_internal = url_internal
+        # the api client, created when the node is first reachable
+        self.api = None
+        self.healthy = False
+        # the top height reported by the last health check
+        self.height = -1
+        # moving average of the duration of the requests, in seconds
+        self.latency = None
+        # number of requests in progress
+        self.outstanding = 0
+
+    def record_latency(self, elapsed):
+        """update the moving average of the requests duration"""
+        self.latency = elapsed if self.latency is None else 0.8 * self.latency + 0.2 * elapsed
+
+    def __str__(self):
+        return self.url
+
+
+class NodePool:
+    """
+    Spread the api calls among multiple nodes, it exposes the same api methods
+    of an OpenAPICli and can be used in place of it by the NodeClient.
+
+    The read requests are sent to the healthy nodes according to the strategy:
+    - latency: the node with the lowest average request duration
+    - least_outstanding: the node with the least requests in progress, ties are broken by latency
+
+    The write requests (the POST endpoints, like post_transaction) are sent to the
+    primary node, that is the first healthy node in the configured order, and to
+    the next ones if it fails.
+
+    A node is ejected when a request fails because of a connection or server error,
+    when get_status fails or when its top height is more than max_height_lag
+    blocks behind the highest among the nodes. The health of the nodes is checked
+    again every health_check_interval seconds, in a background thread started by the first request
+    after the interval expires, the requests are not delayed by the checks.
+
+    Args:
+        nodes (list): the list of (url, url_internal) of the nodes, the first one is the primary
+        client_factory (callable): a function that takes url and url_internal and returns the OpenAPICli for a node
+        strategy (str): the strategy to select the node for the read requests, latency or least_outstanding
+        max_height_lag (int): the max number of blocks a node can be behind the others to be considered healthy
+        health_check_interval (float): the interval in seconds between health checks
+    Raises:
+        ConfigException: if the strategy is unknown or none of the nodes is available
+    """
+
+    def __init__(self, nodes, client_factory,
+                 strategy=defaults.NODE_POOL_STRATEGY,
+                 max_height_lag=defaults.NODE_POOL_MAX_HEIGHT_LAG,
+                 health_check_interval=defaults.NODE_POOL_HEALTH_CHECK_INTERVAL):
+        if strategy not in STRATEGIES:
+            raise ConfigException(f"Unknown node pool strategy {strategy}, supported strategies are {', '.join(STRATEGIES)}")
+        if len(nodes) == 0:
+            raise ConfigException("The node pool requires at least one node")
+        self.nodes = [PoolNode(url, url_internal) for url, url_internal in nodes]
+        self.client_factory = client_factory
+        self.strategy = strategy
+        self.max_height_lag = max_height_lag
+        self.health_check_interval = health_check_interval
+        # the http method of the api methods, by name
+        self.http_methods = {}
+        # protect the load statistics of the nodes
+        self.lock = threading.Lock()
+        # only one thread at the time runs the health checks
+        self.health_check_lock = threading.Lock()
+        self.last_health_check = 0
+        if len(self.check_health()) == 0:
+            raise ConfigException(f"None of the nodes {', '.join(map(str, self.nodes))} is available")
+
+    def check_health(self):
+        """
+        Check the status and the top height of all the nodes
+
+        :return: the list of healthy nodes
+        """
+        if not self.health_check_lock.acquire(blocking=False):
+            # another thread is running the health checks
+            return self.get_healthy_nodes()
+        try:
+            for node in self.nodes:
+                self._check_node(node)
+            top_height = max(node.height for node in self.nodes)
+            for node in self.nodes:
+                node.healthy = node.height >= 0 and node.height >= top_height - self.max_height_lag
+                if not node.healthy:
+                    logger.warning(f"node {node} is not healthy, height {node.height}, top height {top_height}")
+            self.last_health_check = time.time()
+        finally:
+            self.health_check_lock.release()
+        return self.get_healthy_nodes()
+
+    def _check_node(self, node):
+        """query the status of a node, creating the api client if necessary"""
+        try:
+            if node.api is None:
+                node.api = self.client_factory(node.url, node.url_internal)
+                for api in node.api.get_api_methods():
+                    self.http_methods[api.name] = api.http_method
+            start = time.time()
+            status = node.api.get_status()
+            node.record_latency(time.time() - start)
+            height = status.get("top_block_height")
+            node.height = height if height is not None else node.api.get_current_key_block_height()
+        except Exception as e:
+            logger.warning(f"health check failed for node {node}: {e}")
+            node.height = -1
+
+    def _schedule_health_check(self):
+        """run the health checks in a background thread if the interval has expired"""
+        if time.time() - self.last_health_check < self.health_check_interval or self.health_check_lock.locked():
+            return
+        # the following requests do not start other checks while this one runs
+        self.last_health_check = time.time()
+
+        def run():
+            try:
+                self.check_health()
+            except Exception as e:
+                logger.warning(f"error checking the health of the nodes: {e}")
+
+        threading.Thread(target=run, name="node-pool-health-check", daemon=True).start()
+
+    def get_healthy_nodes(self):
+        """get the list of the nodes that are currently healthy"""
+        return [node for node in self.nodes if node.healthy]
+
+    def _select_nodes(self, method, http_method):
+        """
+        get the nodes to try for a request, in order of preference
+        """
+        self._schedule_health_check()
+        nodes = [node for node in self.get_healthy_nodes() if hasattr(node.api, method)]
+        if len(nodes) == 0:
+            # no healthy node left, try all the available ones
+            nodes = [node for node in self.nodes if node.api is not None and hasattr(node.api, method)]
+        if http_method != "get":
+            # writes go to the primary node, the others are used for failover
+            return nodes
+        with self.lock:
+            if self.strategy == STRATEGY_LEAST_OUTSTANDING:
+                return sorted(nodes, key=lambda n: (n.outstanding, n.latency or 0))
+            return sorted(nodes, key=lambda n: n.latency or 0)
+
+    def _call(self, method, http_method, args, kwargs):
+        """execute an api call on the selected nodes, moving to the next one in case of failures"""
+        last_error = None
+        for node in self._select_nodes(method, http_method):
+            with self.lock:
+                node.outstanding += 1
+            start = time.time()
+            try:
+                result = getattr(node.api, method)(*args, **kwargs)
+                node.record_latency(time.time() - start)
+                return result
+            except OpenAPIClientException as e:
+                if e.code < 500:
+                    # the node replied, the error is about the request
+                    node.record_latency(time.time() - start)
+                    raise e
+                last_error = e
+            except requests.exceptions.RequestException as e:
+                last_error = e
+            finally:
+                with self.lock:
+                    node.outstanding -= 1
+            # eject the node until the next health check
+            logger.warning(f"request {method} failed on node {node}, ejecting it: {last_error}")
+            node.healthy = False
+        if last_error is None:
+            raise ConfigException(f"No node available for {method}")
+        raise last_error
+
+    def __getattr__(self, attr):
+        http_method = self.__dict__.get("http_methods", {}).get(attr)
+        if http_method is None:
+            # not an api method, use the primary node
+            nodes = [node for node in self.__dict__.get("nodes", []) if node.api is not None]
+            if len(nodes) == 0:
+                raise AttributeError(attr)
+            healthy_nodes = [node for node in nodes if node.healthy]
+            return getattr((healthy_nodes or nodes)[0].api, attr)
+
+        def api_method(*args, **kwargs):
+            return self._call(attr, http_method, args, kwargs)
+        api_method.__name__ = attr
+        return api_method
@@ -0,0 +1,276 @@
+import heapq
+import logging
+import threading
+import time
+
+from aeternity import defaults, identifiers
+from aeternity.openapi import OpenAPIClientException
+
+logger = logging.getLogger(__name__)
+
+# the transaction fields holding the account that pays for the transaction, in order of precedence
+SENDER_FIELDS = ["sender_id", "account_id", "owner_id", "caller_id", "oracle_id"]
+
+
+class AccountNonces:
+    """
+    The state of the nonces of an account
+    """
+
+    def __init__(self):
+        # the next nonce never used, None if the account has never been synchronized
+        self.next_nonce = None
+        # nonces that can be used again, as a heap
+        self.reclaimed = []
+        # reserved nonces that have not been mined yet, with the reservation time
+        self.reserved = {}
+        # when the state was last synchronized with the node
+        self.synced_at = 0
+
+
+def _pending_nonces(pending_reply):
+    """get the nonces of the transactions in a pending transactions reply"""
+    nonces = set()
+    for tx in pending_reply.get("transactions", []):
+        # the transactions are signed, the nonce is in the inner transaction
+        nonce = tx.get("tx", {}).get("nonce")
+        if nonce:
+            nonces.add(nonce)
+    return nonces
+
+
+def _tx_sender_nonce(tx):
+    """
+    get the account and the nonce of a transaction
+
+    :return: a tuple (address, nonce), (None, None) if the transaction does not use a nonce
+    """
+    nonce = tx.get("nonce")
+    if not nonce:
+        return None, None
+    for field in SENDER_FIELDS:
+        sender = tx.get(field)
+        if sender is not None:
+            # oracle operations are paid by the account with the same public key
+            if sender.startswith(f"{identifiers.ORACLE_ID}_"):
+                sender = f"{identifiers.ACCOUNT_ID}_{sender[3:]}"
+            return sender, nonce
+    return None, None
+
+
+class NonceManager:
+    """
+    Allocate the nonces for the transactions of the accounts locally,
+    so that multiple transactions from the same account can be prepared
+    concurrently without a round trip to the node for each of them.
+
+    The nonces are reserved locally and the state of an account is synchronized
+    with the node every sync_interval seconds, using the account nonce and the
+    transactions of the account in the pending pool. During the synchronization:
+    - the nonces that have been mined are forgotten
+    - the nonces reserved more than reclaim_after seconds before that are neither mined nor
+      in the pending pool (the transaction was rejected or expired) are reclaimed
+    - the gaps between the account nonce and the pending transactions are reclaimed
+    If the pending pool cannot be retrieved only the mined nonces are forgotten.
+
+    The reclaimed nonces are used first by the next reservations.
+    A nonce that is known not to have been broadcast can be reclaimed immediately with release.
+
+    The manager is thread safe.
+
+    Args:
+        client (NodeClient): the client used to synchronize the accounts with the node
+        sync_interval (float): the interval in seconds between synchronizations of an account
+        reclaim_after (float): the time in seconds after which a reserved nonce unknown to the node is reclaimed
+    """
+
+    def __init__(self, client,
+                 sync_interval=defaults.NONCE_SYNC_INTERVAL,
+                 reclaim_after=defaults.NONCE_RECLAIM_AFTER):
+        self.client = client
+        self.sync_interval = sync_interval
+        self.reclaim_after = reclaim_after
+        self.lock = threading.Lock()
+        self.accounts = {}
+
+    def _get_state(self, address):
+        """get the nonces state of an account"""
+        with self.lock:
+            state = self.accounts.get(address)
+            if state is None:
+                state = AccountNonces()
+                self.accounts[address] = state
+            return state
+
+    def _needs_sync(self, state):
+        return state.next_nonce is None or time.time() - state.synced_at >= self.sync_interval
+
+    def _fetch(self, address):
+        """retrieve the account nonce and the nonces of the pending transactions from the node"""
+        # the pending transactions are retrieved first, so a transaction mined in between
+        # is accounted for by the account nonce
+        try:
+            pending_nonces = _pending_nonces(self.client.get_pending_account_transactions_by_pubkey(pubkey=address))
+        except OpenAPIClientException as e:
+            # an account unknown to the node has no pending transactions, on other errors the pool is unknown
+            pending_nonces = set() if e.code == 404 else None
+        try:
+            account_nonce = self.client.get_account_by_pubkey(pubkey=address).nonce
+        except OpenAPIClientException:
+            # the account is not yet known to the node
+            account_nonce = 0
+        return account_nonce, pending_nonces
+
+    def _apply_sync(self, address, account_nonce, pending_nonces, started):
+        """
+        update the state of an account with the data retrieved from the node
+
+        :param address: the account address
+        :param account_nonce: the nonce of the account, that is the nonce of the last mined transaction
+        :param pending_nonces: the nonces of the transactions of the account in the pending pool,
+            None if the pending pool could not be retrieved
+        :param started: the time when the data was requested to the node
+        """
+        state = self._get_state(address)
+        with self.lock:
+            # forget the mined nonces
+            state.reserved = {n: t for n, t in state.reserved.items() if n > account_nonce}
+            reclaimed = set(n for n in state.reclaimed if n > account_nonce)
+            if pending_nonces is None:
+                # without the pending pool the reserved nonces may still be in flight, nothing is reclaimed
+                state.reclaimed = list(reclaimed)
+                heapq.heapify(state.reclaimed)
+                state.next_nonce = max(state.next_nonce or 0, account_nonce + 1)
+                state.synced_at = time.time()
+                return
+            # the nonces reserved before the sync that the node does not know about are lost
+            for nonce, reserved_at in list(state.reserved.items()):
+                if nonce not in pending_nonces and reserved_at < started - self.reclaim_after:
+                    logger.debug(f"reclaiming nonce {nonce} for {address}")
+                    del state.reserved[nonce]
+                    reclaimed.add(nonce)
+            # reclaim the gaps between the mined and the pending transactions
+            next_nonce = max(state.next_nonce or 0, account_nonce + 1, max(pending_nonces, default=0) + 1)
+            for nonce in range(account_nonce + 1, next_nonce):
+                if nonce not in pending_nonces and nonce not in state.reserved:
+                    reclaimed.add(nonce)
+            # the nonces in the pending pool have been used, possibly by someone else
+            reclaimed -= pending_nonces
+            state.reclaimed = list(reclaimed)
+            heapq.heapify(state.reclaimed)
+            state.next_nonce = next_nonce
+            state.synced_at = time.time()
+
+    def _allocate(self, address):
+        """reserve the lowest available nonce for an account"""
+        state = self._get_state(address)
+        with self.lock:
+            if len(state.reclaimed) > 0:
+                nonce = heapq.heappop(state.reclaimed)
+            else:
+                nonce = state.next_nonce
+                state.next_nonce += 1
+            state.reserved[nonce] = time.time()
+            return nonce
+
+    def sync(self, address):
+        """
+        Synchronize the state of an account with the node
+
+        :param address: the account address
+        """
+        started = time.time()
+        account_nonce, pending_nonces = self._fetch(address)
+        self._apply_sync(address, account_nonce, pending_nonces, started)
+
+    def reserve(self, address):
+        """
+        Reserve the next nonce for a transaction of an account,
+        the account is synchronized with the node first if required
+
+        :param address: the account address
+        :return: the nonce to use for the transaction
+        """
+        if self._needs_sync(self._get_state(address)):
+            self.sync(address)
+        return self._allocate(address)
+
+    def release(self, address, nonce):
+        """
+        Return a reserved nonce that has not been used, it will be used by the next reservation
+
+        :param address: the account address
+        :param nonce: the nonce to release
+        """
+        state = self._get_state(address)
+        with self.lock:
+            if state.reserved.pop(nonce, None) is not None:
+                heapq.heappush(state.reclaimed, nonce)
+
+    def release_transaction(self, tx):
+        """
+        Release the nonce of a transaction that has not been accepted by the node
+
+        :param tx: the TxObject of the transaction
+        """
+        address, nonce = _tx_sender_nonce(tx)
+        if address is not None:
+            self.release(address, nonce)
+
+    def reset(self, address=None):
+        """
+        Forget the state of an account, or of all the accounts if the address is None,
+        the next reservation will synchronize with the node again
+        """
+        with self.lock:
+            if address is None:
+                self.accounts = {}
+            else:
+                self.accounts.pop(address, None)
+
+
+class AsyncNonceManager(NonceManager):
+    """
+    A NonceManager for the AsyncNodeClient, sync and reserve are coroutines.
+    It can be shared among tasks and threads.
+
+    Args:
+        client (AsyncNodeClient): the client used to synchronize the accounts with the node
+        sync_interval (float): the interval in seconds between synchronizations of an account
+        reclaim_after (float): the time in seconds after which a reserved nonce unknown to the node is reclaimed
+    """
+
+    async def _fetch(self, address):
+        """retrieve the account nonce and the nonces of the pending transactions from the node"""
+        try:
+            pending_nonces = _pending_nonces(await self.client.get_pending_account_transactions_by_pubkey(pubkey=address))
+        except OpenAPIClientException as e:
+            # an account unknown to the node has no pending transactions, on other errors the pool is unknown
+            pending_nonces = set() if e.code == 404 else None
+        try:
+            account_nonce = (await self.client.get_account_by_pubkey(pubkey=address)).nonce
+        except OpenAPIClientException:
+            account_nonce = 0
+        return account_nonce, pending_nonces
+
+    async def sync(self, address):
+        """
+        Synchronize the state of an account with the node
+
+        :param address: the account address
+        """
+        started = time.time()
+        account_nonce, pending_nonces = await self._fetch(address)
+        self._apply_sync(address, account_nonce, pending_nonces, started)
+
+    async def reserve(self, address):
+        """
+        Reserve the next nonce for a transaction of an account,
+        the account is synchronized with the node first if required
+
+        :param address: the account address
+        :return: the nonce to use for the transaction
+        """
+        if self._needs_sync(self._get_state(address)):
+            await self.sync(address)
+        return self._allocate(address)
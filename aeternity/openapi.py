@@ -1,15 +1,33 @@
+import os
 import re
+import json
+import time
+import hashlib
 import requests
+from requests.adapters import HTTPAdapter
 import keyword
 from collections import namedtuple
 from munch import Munch
 import logging
 
 from aeternity.exceptions import UnsupportedNodeVersion, ConfigException
+from aeternity import defaults
 import semver
 
 import simplejson
 
+try:
+    # aiohttp is an optional dependency, only required by the AsyncOpenAPICli
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+try:
+    # orjson is an optional dependency, used to speed up the decoding of the replies
+    import orjson
+except ImportError:
+    orjson = None
+
 
 class OpenAPIArgsException(Exception):
     """Raised when there is an error in method arguments"""
@@ -34,9 +52,255 @@ class OpenAPIException(Exception):
         self.message = message
 
 
+def build_http_session(pool_connections=defaults.HTTP_POOL_CONNECTIONS,
+                       pool_maxsize=defaults.HTTP_POOL_MAXSIZE,
+                       pool_block=defaults.HTTP_POOL_BLOCK,
+                       keep_alive=defaults.HTTP_KEEP_ALIVE):
+    """
+    Create a http session backed by a connection pool, the session
+    can be shared among multiple clients
+
+    Args:
+        pool_connections (int): the number of per-host connection pools to cache
+        pool_maxsize (int): the maximum number of connections to keep open for a single host
+        pool_block (bool): whenever to block waiting for a free connection when the pool is exhausted
+        keep_alive (bool): whenever to keep the connections open between requests
+    Returns:
+        a requests.Session instance
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, pool_block=pool_block)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    if not keep_alive:
+        session.headers["Connection"] = "close"
+    return session
+
+
+# translation table mapping all the digits to 0, to look for long numbers in a document
+_DIGITS_TO_ZERO = bytes.maketrans(b"123456789", b"000000000")
+# numbers with 19 or more digits may not fit in 64 bits
+_LONG_NUMBER = b"0" * 19
+
+
+def _orjson_loads(text):
+    """
+    Decode a json document using orjson.
+
+    orjson decodes the integers that do not fit in 64 bits as floats, losing precision,
+    and amounts in aettos easily exceed that limit: the documents containing numbers
+    with 19 or more digits are decoded with simplejson instead.
+    """
+    data = text.encode() if isinstance(text, str) else text
+    if _LONG_NUMBER in data.translate(_DIGITS_TO_ZERO):
+        return simplejson.loads(data)
+    return orjson.loads(data)
+
+
+# available json decoders, by name
+JSON_BACKENDS = {
+    "simplejson": simplejson.loads,
+    "json": json.loads,
+}
+if orjson is not None:
+    JSON_BACKENDS["orjson"] = _orjson_loads
+
+
+def get_json_decoder(backend=defaults.API_JSON_BACKEND):
+    """
+    Get the function to decode the json replies of the api
+
+    Args:
+        backend (str): the name of the json backend, one of auto, orjson, simplejson or json,
+            auto selects orjson when it is installed and simplejson otherwise
+    Returns:
+        a function that takes a json document (str or bytes) and returns the decoded value
+    Raises:
+        ConfigException: if the backend is unknown or not installed
+    """
+    if backend == "auto":
+        backend = "orjson" if orjson is not None else "simplejson"
+    decoder = JSON_BACKENDS.get(backend)
+    if decoder is None:
+        raise ConfigException(f"Unsupported json backend {backend}, available backends are: auto, {', '.join(JSON_BACKENDS)}")
+    return decoder
+
+
+def lazy_munch(value):
+    """
+    Wrap a decoded json value for attribute access, dicts are wrapped in a LazyMunch
+    and the dicts contained in lists are wrapped as well, other values are returned as they are
+    """
+    value_type = type(value)
+    if value_type is dict:
+        return LazyMunch(value)
+    if value_type is list:
+        return [lazy_munch(v) for v in value]
+    return value
+
+
+class LazyMunch(Munch):
+    """
+    A Munch for the decoded api replies that wraps the nested objects only when they are accessed.
+
+    Munch.fromDict copies the whole document upfront, that is expensive for large replies
+    like generations or lists of transactions where only a few fields are used.
+    The nested values are wrapped on first access and stored back, so the following accesses
+    return the same object; Munch.toDict and the json encoders work as for a Munch.
+    """
+
+    def __getitem__(self, k):
+        value = dict.__getitem__(self, k)
+        value_type = type(value)
+        if value_type is dict or value_type is list:
+            value = lazy_munch(value)
+            dict.__setitem__(self, k, value)
+        return value
+
+    def _wrap_all(self):
+        """wrap all the direct children of the object"""
+        for k in dict.keys(self):
+            self[k]
+
+    def values(self):
+        self._wrap_all()
+        return dict.values(self)
+
+    def items(self):
+        self._wrap_all()
+        return dict.items(self)
+
+
+# folder containing the api specifications distributed with the sdk, named <version>.json
+BUNDLED_SPECS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "specs")
+
+
+def load_spec(spec):
+    """
+    Load an api specification
+
+    Args:
+        spec (dict|str): the api specification, either a dict, the path of a json file
+            or the version of one of the specifications bundled with the sdk (see BUNDLED_SPECS_DIR)
+    Returns:
+        the api specification as dict
+    Raises:
+        ConfigException: if the specification cannot be found
+    """
+    if isinstance(spec, dict):
+        return spec
+    path = spec if os.path.isfile(spec) else os.path.join(BUNDLED_SPECS_DIR, f"{spec}.json")
+    if not os.path.isfile(path):
+        raise ConfigException(f"Api specification {spec} not found")
+    with open(path) as fp:
+        return simplejson.load(fp)
+
+
+class SpecCache(object):
+    """
+    Persistent cache for the api specifications retrieved from the nodes.
+    Entries are stored as json files, keyed by the node url and the api version, and contain
+    the validators (ETag, Last-Modified) used for conditional revalidation.
+    The version last retrieved from each url is recorded, to find the entry of the url
+    before contacting the node.
+
+    Args:
+        path (str): the folder where to store the cache entries
+        max_age (int): the number of seconds an entry is used without being revalidated with the node
+    """
+
+    def __init__(self, path, max_age=defaults.API_SPEC_CACHE_MAX_AGE):
+        self.path = path
+        self.max_age = max_age
+
+    def _entry_path(self, url, version=None):
+        key = url.rstrip("/") if version is None else f"{url.rstrip('/')}@{version}"
+        return os.path.join(self.path, f"{hashlib.sha256(key.encode('utf-8')).hexdigest()[:32]}.json")
+
+    def _load(self, path):
+        try:
+            with open(path) as fp:
+                return simplejson.load(fp)
+        except (OSError, ValueError):
+            return None
+
+    def _write(self, path, data):
+        os.makedirs(self.path, exist_ok=True)
+        # write to a temporary file and rename it to avoid partial entries
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as fp:
+            simplejson.dump(data, fp)
+        os.replace(tmp_path, path)
+
+    def get(self, url, version=None):
+        """
+        Get the cache entry for an url
+
+        :param url: the node url
+        :param version: the api version, default to the version last retrieved from the url
+        :return: the cache entry or None if there is no (valid) entry for the url and version
+        """
+        url = url.rstrip("/")
+        if version is None:
+            index = self._load(self._entry_path(url))
+            if index is None or index.get("url") != url:
+                return None
+            version = index.get("version")
+        entry = self._load(self._entry_path(url, version))
+        if entry is None or entry.get("url") != url or entry.get("version") != version:
+            return None
+        return entry
+
+    def put(self, url, spec, etag=None, last_modified=None):
+        """
+        Store the api specification of an url
+
+        :param url: the node url
+        :param spec: the api specification
+        :param etag: the ETag header of the node reply
+        :param last_modified: the Last-Modified header of the node reply
+        :return: the stored entry
+        """
+        url = url.rstrip("/")
+        version = spec.get("info", {}).get("version")
+        entry = {
+            "url": url,
+            "version": version,
+            "etag": etag,
+            "last_modified": last_modified,
+            "fetched_at": time.time(),
+            "spec": spec,
+        }
+        try:
+            self._write(self._entry_path(url, version), entry)
+            self._write(self._entry_path(url), {"url": url, "version": version})
+        except OSError as e:
+            logging.getLogger(__name__).warning(f"Cannot write the api specification cache at {self.path}: {e}")
+        return entry
+
+    def is_fresh(self, entry):
+        """
+        Tells if an entry can be used without revalidation
+        """
+        return (time.time() - entry.get("fetched_at", 0)) < self.max_age
+
+
 class OpenAPICli(object):
     """
     Generates a OpenAPI client
+
+    Args:
+        url (str): the base url of the api
+        url_internal (str): the base url of the internal api, if None the internal endpoints are not generated
+        debug (bool): enable debug logging
+        compatibility_version_range (tuple): the (min, max) api versions supported
+        force_compatibility (bool): ignore the version compatibility check
+        session (requests.Session): the http session used for the requests, if None a new pooled session is created
+        timeout (tuple): the (connect, read) timeouts in seconds for the requests
+        spec (dict|str): the api specification to use instead of downloading it from {url}/api, see load_spec
+        spec_cache (SpecCache): a persistent cache for the api specification downloaded from {url}/api
+        json_backend (str): the json backend used to decode the replies, see get_json_decoder
+        lazy_responses (bool): wrap the nested objects of the replies only when accessed, see LazyMunch
     """
     # openapi versions
     open_api_versions = ["2.0"]
@@ -46,14 +310,27 @@ class OpenAPICli(object):
         "integer": "int",
         "boolean": "bool",
     }
+    oa2py_types = {
+        "string": str,
+        "integer": int,
+        "boolean": bool,
+    }
 
-    def __init__(self, url, url_internal=None, debug=False, compatibility_version_range=(None, None), force_compatibility=False):
+    def __init__(self, url, url_internal=None, debug=False, compatibility_version_range=(None, None), force_compatibility=False,
+                 session=None, timeout=(defaults.HTTP_CONNECT_TIMEOUT, defaults.HTTP_READ_TIMEOUT),
+                 spec=None, spec_cache=None,
+                 json_backend=defaults.API_JSON_BACKEND, lazy_responses=defaults.API_LAZY_RESPONSES):
+        # decoding of the replies
+        self.json_loads = get_json_decoder(json_backend)
+        self.response_factory = lazy_munch if lazy_responses else Munch.fromDict
         try:
             self.url, self.url_internal = url, url_internal
             self.skip_tags = set(["obsolete"])
-            # load the openapi json file from the node
-            api_reply = requests.get(f"{url}/api")
-            self.api_def = api_reply.json()
+            # http session, shared connection pool for all the requests
+            self.session = session if session is not None else build_http_session()
+            self.timeout = timeout
+            # load the openapi json file
+            self.api_def = load_spec(spec) if spec is not None else self._fetch_api_def(spec_cache)
             if self.api_def.get('api') is not None:  # TODO: workaround for different swagger styles
                 self.api_def = self.api_def.get('api', {})
             self.api_version = self.api_def.get("info", {}).get("version", "unknown")
@@ -69,6 +346,8 @@ class OpenAPICli(object):
                     f"unsupported node version {self.url}@{self.api_version}, supported version are {lower_bound} and {upper_bound}")
         except requests.exceptions.ConnectionError:
             raise ConfigException(f"Error connecting to the node at {self.url}, connection unavailable")
+        except requests.exceptions.Timeout:
+            raise ConfigException(f"Error connecting to the node at {self.url}, timeout expired")
         except simplejson.errors.JSONDecodeError:
             raise ConfigException(f"Error interpreting response from node at {self.url}, is there a aeternity node listening?")
         except Exception as e:
@@ -165,71 +444,180 @@ class OpenAPICli(object):
                 # create the method
                 self._add_api_method(api)
 
+    def _fetch_api_def(self, spec_cache=None):
+        """
+        download the openapi json file from the node, using
+        and updating the spec_cache if provided
+        """
+        entry = spec_cache.get(self.url) if spec_cache is not None else None
+        if entry is not None and spec_cache.is_fresh(entry):
+            return entry.get("spec")
+        # revalidate the cached entry
+        headers = {}
+        if entry is not None and entry.get("etag") is not None:
+            headers["If-None-Match"] = entry.get("etag")
+        if entry is not None and entry.get("last_modified") is not None:
+            headers["If-Modified-Since"] = entry.get("last_modified")
+        api_reply = self.session.get(f"{self.url}/api", headers=headers, timeout=self.timeout)
+        etag, last_modified = api_reply.headers.get("ETag"), api_reply.headers.get("Last-Modified")
+        if api_reply.status_code == 304 and entry is not None:
+            # not modified, keep the cached specification
+            api_def = entry.get("spec")
+            etag = etag if etag is not None else entry.get("etag")
+            last_modified = last_modified if last_modified is not None else entry.get("last_modified")
+        elif api_reply.status_code == 200:
+            api_def = api_reply.json()
+        else:
+            # never cache the error replies
+            raise ConfigException(f"Error retrieving the api specification from {self.url}/api, status code {api_reply.status_code}")
+        if spec_cache is not None:
+            spec_cache.put(self.url, api_def, etag=etag, last_modified=last_modified)
+        return api_def
+
     def _add_api_method(self, api):
         """add an api method to the client"""
+        build_request = self._compile_request_builder(api)
+
         def api_method(*args, **kwargs):
-            query_params = {}
-            post_body = {}
-            target_endpoint = api.endpoint
-            for p in api.params:
-                # get the value or default
-                val, ok = self._get_param_val(kwargs, p)
-                if not ok:
-                    raise OpenAPIArgsException(f"missing required parameter {p.name}")
-                # if none continue
-                if val is None:
-                    continue
-                # check the type
-                if p.field.type.startswith("#/definitions/"):
-                    # TODO: validate the model
-                    pass
-                elif not self._is_valid_type(val, p.field):
-                    raise OpenAPIArgsException(f"type error for parameter {p.name}, expected: {p.field.type} got {type(val).__name__}", )
-                # check the ranges
-                if not self._is_valid_interval(val, p.field):
-                    raise OpenAPIArgsException(f"value error for parameter {p.name}, expected: {p.minimum} =< {val} =< {p.maximum}", )
-                # check allowed values
-                if len(p.field.values) > 0 and val not in p.field.values:
-                    raise OpenAPIArgsException(f"Invalid value for param {p.name}, allowed values are {','.join(p.values)}")
-                # if in path substitute
-                if p.pos == 'path':
-                    target_endpoint = target_endpoint.replace('{%s}' % p.name, str(val))
-                # if in query add to the query
-                if p.pos == 'query':
-                    query_params[p.raw] = val
-                if p.pos == 'body':
-                    post_body = val
+            target_endpoint, query_params, post_body = build_request(kwargs)
             # make the request
             if api.http_method == 'get':
-                http_reply = requests.get(target_endpoint, params=query_params)
-                api_response = api.responses.get(http_reply.status_code, None)
+                http_reply = self.session.get(target_endpoint, params=query_params, timeout=self.timeout)
                 self.logger.debug(f"GET {target_endpoint}, params:{query_params} --> {http_reply.text}")
             else:
-                http_reply = requests.post(target_endpoint, params=query_params, json=post_body)
-                api_response = api.responses.get(http_reply.status_code, None)
+                http_reply = self.session.post(target_endpoint, params=query_params, json=post_body, timeout=self.timeout)
                 self.logger.debug(f"POST {target_endpoint}, params:{query_params}, body: {post_body} --> {http_reply.text}", )
-            # unknown error
-            if api_response is None:
-                raise OpenAPIClientException(f"Unknown error {target_endpoint} {http_reply.status_code} - {http_reply.text}", code=http_reply.status_code)
-            # success
-            if http_reply.status_code == 200:
-                # parse the http_reply
-                if len(api_response.schema) == 0:
-                    return {}
-                if "inline_response_200" in api_response.schema:
-                    # this are raw values, doesnt make sense to parse into a dict
-                    raw = http_reply.json()
-                    return list(raw.values())[0]
-                jr = http_reply.json()
-                return Munch.fromDict(jr)
-            # error
-            raise OpenAPIClientException(f"{api_response.desc}", code=http_reply.status_code, data=http_reply.json())
-        # register the method
+            return self._process_reply(api, target_endpoint, http_reply.status_code, http_reply.text)
+        self._register_api_method(api, api_method)
+
+    def _register_api_method(self, api, api_method):
+        """register a generated method to the client"""
         api_method.__name__ = api.name
         api_method.__doc__ = api.doc
         setattr(self, api_method.__name__, api_method)
         self.api_methods.append(api)
 
+    def _compile_request_builder(self, api):
+        """
+        compile the request builder for an api method.
+
+        The parameters definitions, the type validators, the allowed values and the
+        path template are resolved once here instead of at every call.
+        The compiled builder only checks that the arguments are valid, when they are not
+        it falls back to _prepare_request to report the error.
+
+        :return: a function that takes the method kwargs and returns a tuple (target_endpoint, query_params, post_body)
+        """
+        params = []
+        for p in api.params:
+            is_model = p.field.type.startswith("#/definitions/")
+            # None never matches the type of a value, so unknown types are always rejected
+            py_type = None if is_model else self.oa2py_types.get(p.field.type)
+            has_range = p.field.minimum is not None or p.field.maximum is not None
+            params.append((p.name, p.raw, p.pos, p.field.default, p.field.required,
+                           is_model, py_type, has_range, p.field.minimum, p.field.maximum, frozenset(p.field.values)))
+        # the path parameters are substituted using the format syntax
+        path_template = api.endpoint.replace("{", "{{").replace("}", "}}")
+        for p in api.params:
+            if p.pos == 'path':
+                path_template = path_template.replace("{{%s}}" % p.name, "{%s}" % p.name)
+
+        def build_request(kwargs):
+            query_params = {}
+            post_body = {}
+            path_params = {}
+            for name, raw, pos, default, required, is_model, py_type, has_range, minimum, maximum, values in params:
+                val = kwargs.get(name)
+                if val is None:
+                    val = default
+                if val is None:
+                    if required or pos == 'path':
+                        # missing parameter
+                        return self._prepare_request(api, kwargs)
+                    continue
+                if not is_model and type(val) is not py_type:
+                    # type error
+                    return self._prepare_request(api, kwargs)
+                if has_range and isinstance(val, int) and ((minimum is not None and val < minimum) or (maximum is not None and val > maximum)):
+                    # out of range
+                    return self._prepare_request(api, kwargs)
+                if values and val not in values:
+                    # invalid value
+                    return self._prepare_request(api, kwargs)
+                if pos == 'path':
+                    path_params[name] = val
+                elif pos == 'query':
+                    query_params[raw] = val
+                elif pos == 'body':
+                    post_body = val
+            return path_template.format_map(path_params), query_params, post_body
+        return build_request
+
+    def _prepare_request(self, api, kwargs):
+        """
+        validate the method arguments and build the request
+
+        :return: a tuple (target_endpoint, query_params, post_body)
+        :raises OpenAPIArgsException: if the arguments are not valid
+        """
+        query_params = {}
+        post_body = {}
+        target_endpoint = api.endpoint
+        for p in api.params:
+            # get the value or default
+            val, ok = self._get_param_val(kwargs, p)
+            if not ok:
+                raise OpenAPIArgsException(f"missing required parameter {p.name}")
+            # if none continue
+            if val is None:
+                continue
+            # check the type
+            if p.field.type.startswith("#/definitions/"):
+                # TODO: validate the model
+                pass
+            elif not self._is_valid_type(val, p.field):
+                raise OpenAPIArgsException(f"type error for parameter {p.name}, expected: {p.field.type} got {type(val).__name__}", )
+            # check the ranges
+            if not self._is_valid_interval(val, p.field):
+                raise OpenAPIArgsException(f"value error for parameter {p.name}, expected: {p.field.minimum} =< {val} =< {p.field.maximum}", )
+            # check allowed values
+            if len(p.field.values) > 0 and val not in p.field.values:
+                raise OpenAPIArgsException(f"Invalid value for param {p.name}, allowed values are {','.join(p.field.values)}")
+            # if in path substitute
+            if p.pos == 'path':
+                target_endpoint = target_endpoint.replace('{%s}' % p.name, str(val))
+            # if in query add to the query
+            if p.pos == 'query':
+                query_params[p.raw] = val
+            if p.pos == 'body':
+                post_body = val
+        return target_endpoint, query_params, post_body
+
+    def _process_reply(self, api, target_endpoint, status_code, text):
+        """
+        parse the reply of a request
+
+        :return: the parsed reply
+        :raises OpenAPIClientException: if the request was not successful
+        """
+        api_response = api.responses.get(status_code, None)
+        # unknown error
+        if api_response is None:
+            raise OpenAPIClientException(f"Unknown error {target_endpoint} {status_code} - {text}", code=status_code)
+        # success
+        if status_code == 200:
+            # parse the http_reply
+            if len(api_response.schema) == 0:
+                return {}
+            if "inline_response_200" in api_response.schema:
+                # this are raw values, doesnt make sense to parse into a dict
+                raw = self.json_loads(text)
+                return list(raw.values())[0]
+            jr = self.json_loads(text)
+            return self.response_factory(jr)
+        # error
+        raise OpenAPIClientException(f"{api_response.desc}", code=status_code, data=self.json_loads(text))
+
     def _is_valid_interval(self, val, field):
         is_ok = True
         if not isinstance(val, int):
@@ -264,3 +652,83 @@ class OpenAPICli(object):
 
     def get_version(self):
         return self.version
+
+
+class AsyncOpenAPICli(OpenAPICli):
+    """
+    Generates an asyncio OpenAPI client, the api methods are generated
+    from the same definition of the OpenAPICli but are coroutines.
+
+    It requires the optional dependency aiohttp.
+
+    Args:
+        url (str): the base url of the api
+        url_internal (str): the base url of the internal api, if None the internal endpoints are not generated
+        debug (bool): enable debug logging
+        compatibility_version_range (tuple): the (min, max) api versions supported
+        force_compatibility (bool): ignore the version compatibility check
+        session (requests.Session): the http session used to retrieve the api definition
+        timeout (tuple): the (connect, read) timeouts in seconds for the requests
+        pool_maxsize (int): the maximum number of connections to keep open for a single host
+        keep_alive (bool): whenever to keep the connections open between requests
+        spec (dict|str): the api specification to use instead of downloading it from {url}/api, see load_spec
+        spec_cache (SpecCache): a persistent cache for the api specification downloaded from {url}/api
+        json_backend (str): the json backend used to decode the replies, see get_json_decoder
+        lazy_responses (bool): wrap the nested objects of the replies only when accessed, see LazyMunch
+    """
+
+    def __init__(self, url, url_internal=None, debug=False, compatibility_version_range=(None, None), force_compatibility=False,
+                 session=None, timeout=(defaults.HTTP_CONNECT_TIMEOUT, defaults.HTTP_READ_TIMEOUT),
+                 pool_maxsize=defaults.HTTP_POOL_MAXSIZE, keep_alive=defaults.HTTP_KEEP_ALIVE,
+                 spec=None, spec_cache=None,
+                 json_backend=defaults.API_JSON_BACKEND, lazy_responses=defaults.API_LAZY_RESPONSES):
+        if aiohttp is None:
+            raise ConfigException("The asyncio client requires the aiohttp package, install it with: pip install aiohttp")
+        self.pool_maxsize = pool_maxsize
+        self.keep_alive = keep_alive
+        # the aiohttp session is bound to an event loop, it is created with the first request
+        self.async_session = None
+        super().__init__(url, url_internal=url_internal, debug=debug,
+                         compatibility_version_range=compatibility_version_range,
+                         force_compatibility=force_compatibility,
+                         session=session, timeout=timeout,
+                         spec=spec, spec_cache=spec_cache,
+                         json_backend=json_backend, lazy_responses=lazy_responses)
+
+    def _get_async_session(self):
+        """get the aiohttp session, creating it if necessary"""
+        if self.async_session is None or self.async_session.closed:
+            connect_timeout, read_timeout = self.timeout
+            connector = aiohttp.TCPConnector(limit_per_host=self.pool_maxsize, force_close=not self.keep_alive)
+            self.async_session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(sock_connect=connect_timeout, sock_read=read_timeout)
+            )
+        return self.async_session
+
+    async def close(self):
+        """close the aiohttp session and the connections in the pool"""
+        if self.async_session is not None:
+            await self.async_session.close()
+            self.async_session = None
+
+    def _add_api_method(self, api):
+        """add an api coroutine to the client"""
+        build_request = self._compile_request_builder(api)
+
+        async def api_method(*args, **kwargs):
+            target_endpoint, query_params, post_body = build_request(kwargs)
+            # aiohttp only accepts str and int query parameters
+            query_params = {k: str(v).lower() if isinstance(v, bool) else v for k, v in query_params.items()}
+            session = self._get_async_session()
+            # make the request
+            if api.http_method == 'get':
+                async with session.get(target_endpoint, params=query_params) as http_reply:
+                    text = await http_reply.text()
+                self.logger.debug(f"GET {target_endpoint}, params:{query_params} --> {text}")
+            else:
+                async with session.post(target_endpoint, params=query_params, json=post_body) as http_reply:
+                    text = await http_reply.text()
+                self.logger.debug(f"POST {target_endpoint}, params:{query_params}, body: {post_body} --> {text}", )
+            return self._process_reply(api, target_endpoint, http_reply.status, text)
+        self._register_api_method(api, api_method)
@@ -0,0 +1,270 @@
+import logging
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from munch import Munch
+
+from aeternity import defaults, identifiers
+from aeternity.nonce_manager import _tx_sender_nonce
+from aeternity.openapi import OpenAPIClientException
+
+logger = logging.getLogger(__name__)
+
+
+class PendingTransaction:
+    """
+    A broadcast transaction tracked by a PendingTransactionManager
+    """
+
+    def __init__(self, tx, sender, nonce):
+        self.tx = tx
+        self.sender = sender
+        self.nonce = nonce
+        now = time.time()
+        # when the transaction was first recorded and when it was last broadcast
+        self.recorded_at = now
+        self.broadcast_at = now
+        self.rebroadcasts = 0
+        self.fee_bumps = 0
+
+
+class PendingTransactionManager:
+    """
+    Track the broadcast transactions until they are mined, watching the pending pool of the node.
+
+    The transactions are checked per sender, with the nonce of the account and the transactions
+    of the account in the pending pool, retrieved once for each sender in a check round:
+    - the transactions with a nonce lower or equal to the account nonce have been mined and are forgotten
+    - the transactions that are neither mined nor in the pending pool have been dropped and are broadcast again,
+      the ones rejected by the node (for example because their ttl has expired) are forgotten
+    - the transaction with the next nonce of the account that is in the pending pool since stuck_after seconds
+      is stuck: if a signer has been added for the sender it is replaced with a transaction with the fee
+      increased by fee_bump_factor, at most max_fee_bumps times
+    - the nonces between the account nonce and the highest pending nonce that are neither tracked
+      nor in the pending pool are reported as gaps, they block the following transactions of the account
+
+    The rounds are run by check, or in a background thread with start. The manager is thread safe.
+
+    Args:
+        client (NodeClient): the client used to query the node and to sign the replacement transactions
+        stuck_after (float): the time in seconds after which a pending transaction with the next nonce is stuck
+        fee_bump_factor (float): the factor applied to the fee of a stuck transaction
+        max_fee_bumps (int): the max number of fee increases for a transaction
+    """
+
+    def __init__(self, client,
+                 stuck_after=defaults.PENDING_STUCK_AFTER,
+                 fee_bump_factor=defaults.PENDING_FEE_BUMP_FACTOR,
+                 max_fee_bumps=defaults.PENDING_MAX_FEE_BUMPS):
+        self.client = client
+        self.stuck_after = stuck_after
+        self.fee_bump_factor = fee_bump_factor
+        self.max_fee_bumps = max_fee_bumps
+        self.lock = threading.Lock()
+        self.round_lock = threading.Lock()
+        # the tracked transactions, by sender and nonce
+        self.senders = {}
+        # the accounts used to sign the replacement transactions, by address
+        self.signers = {}
+        # the nonce gaps found by the last round, by sender
+        self.gaps = {}
+        # statistics
+        self.mined = 0
+        self.dropped = 0
+        self.rebroadcasts = 0
+        self.fee_bumps = 0
+        self.failed = 0
+        self._stop = None
+
+    def add_signer(self, account):
+        """
+        Allow the replacement of the stuck transactions of an account
+
+        :param account: the Account used to sign the replacement transactions
+        """
+        with self.lock:
+            self.signers[account.get_address()] = account
+
+    def record(self, tx):
+        """
+        Track a broadcast transaction, the transactions that do not use a nonce are ignored
+
+        :param tx: the signed TxObject of the transaction
+        """
+        sender, nonce = _tx_sender_nonce(tx)
+        if sender is None:
+            return
+        with self.lock:
+            self.senders.setdefault(sender, {})[nonce] = PendingTransaction(tx, sender, nonce)
+
+    def forget(self, tx_hash):
+        """
+        Stop tracking a transaction
+
+        :param tx_hash: the hash of the transaction
+        """
+        with self.lock:
+            for entry in [e for entries in self.senders.values() for e in entries.values() if e.tx.hash == tx_hash]:
+                self._remove(entry)
+
+    def _remove(self, entry):
+        entries = self.senders.get(entry.sender, {})
+        if entries.get(entry.nonce) is entry:
+            del entries[entry.nonce]
+        if len(entries) == 0:
+            self.senders.pop(entry.sender, None)
+
+    def _fetch(self, sender):
+        """
+        retrieve the account nonce and the pending transactions of a sender from the node,
+        None if the pending pool cannot be retrieved
+        """
+        # the pending transactions are retrieved first, so a transaction mined in between
+        # is accounted for by the account nonce
+        try:
+            pending = self.client.get_pending_account_transactions_by_pubkey(pubkey=sender).transactions
+        except OpenAPIClientException as e:
+            if e.code != 404:
+                logger.warning(f"cannot retrieve the pending transactions of {sender}: {e.message}")
+                return None
+            # the account is not yet known to the node
+            pending = []
+        try:
+            account_nonce = self.client.get_account_by_pubkey(pubkey=sender).nonce
+        except OpenAPIClientException:
+            # the account is not yet known to the node
+            account_nonce = 0
+        return account_nonce, {tx.hash: tx.get("tx", {}).get("nonce") for tx in pending}
+
+    def _broadcast(self, entry, tx):
+        """broadcast a transaction for an entry, return False if the node rejected it"""
+        try:
+            self.client.post_transaction(body={"tx": tx.tx})
+        except OpenAPIClientException as e:
+            logger.warning(f"transaction {tx.hash} with nonce {entry.nonce} of {entry.sender} rejected: {e.message}")
+            return False
+        entry.tx = tx
+        entry.broadcast_at = time.time()
+        return True
+
+    def _bump_fee(self, entry):
+        """replace a stuck transaction with one with a higher fee"""
+        signer = self.signers.get(entry.sender)
+        inner_tx = entry.tx.data.get("tx")
+        if signer is None or inner_tx is None or entry.fee_bumps >= self.max_fee_bumps:
+            return
+        if inner_tx.data.tag == identifiers.OBJECT_TAG_GA_META_TRANSACTION:
+            return
+        fee = int(math.ceil(inner_tx.data.fee * self.fee_bump_factor))
+        tx = self.client.sign_transaction(signer, self.client.tx_builder.tx_with_fee(inner_tx, fee))
+        logger.debug(f"replacing stuck transaction {entry.tx.hash} of {entry.sender} with {tx.hash}, fee {fee}")
+        if self._broadcast(entry, tx):
+            entry.fee_bumps += 1
+            self.fee_bumps += 1
+
+    def _check_sender(self, sender, entries, account_nonce, pending):
+        """update the transactions of a sender with its state on the node"""
+        now = time.time()
+        pending_nonces = set(nonce for nonce in pending.values() if nonce)
+        for nonce, entry in sorted(entries.items()):
+            if nonce <= account_nonce:
+                self.mined += 1
+                with self.lock:
+                    self._remove(entry)
+            elif entry.tx.hash not in pending:
+                self.dropped += 1
+                if self._broadcast(entry, entry.tx):
+                    entry.rebroadcasts += 1
+                    self.rebroadcasts += 1
+                    pending_nonces.add(nonce)
+                else:
+                    self.failed += 1
+                    with self.lock:
+                        self._remove(entry)
+                    if getattr(self.client, "nonce_manager", None) is not None:
+                        self.client.nonce_manager.release(sender, nonce)
+            elif nonce == account_nonce + 1 and now - entry.broadcast_at >= self.stuck_after:
+                self._bump_fee(entry)
+        # the nonces missing before the highest pending one
+        with self.lock:
+            tracked_nonces = set(self.senders.get(sender, {}).keys())
+        used_nonces = pending_nonces | tracked_nonces
+        gaps = [n for n in range(account_nonce + 1, max(used_nonces, default=0)) if n not in used_nonces]
+        with self.lock:
+            if len(gaps) > 0:
+                self.gaps[sender] = gaps
+            else:
+                self.gaps.pop(sender, None)
+
+    def check(self):
+        """
+        Run a check round on the tracked transactions
+
+        :return: the metrics after the round, see metrics
+        """
+        with self.round_lock:
+            with self.lock:
+                senders = {sender: dict(entries) for sender, entries in self.senders.items()}
+            if len(senders) > 0:
+                with ThreadPoolExecutor(max_workers=self.client.config.http_pool_maxsize) as executor:
+                    for sender, state in zip(senders.keys(), executor.map(self._fetch, senders.keys())):
+                        # without the pending pool the transactions of the sender cannot be told apart
+                        # from the dropped ones, the sender is checked in the next round
+                        if state is not None:
+                            self._check_sender(sender, senders[sender], *state)
+            return self.metrics()
+
+    def metrics(self):
+        """
+        Get the metrics of the tracked transactions
+
+        :return: a Munch with the fields:
+            depth (the number of tracked transactions), oldest_age and mean_age (the age in seconds
+            of the tracked transactions since they were recorded), senders (the depth and oldest_age for each sender),
+            gaps (the nonce gaps found by the last round, by sender) and the counters of the transactions
+            mined, dropped, rebroadcasts, fee_bumps and failed (rejected when broadcast again)
+        """
+        now = time.time()
+        with self.lock:
+            senders = {sender: [now - e.recorded_at for e in entries.values()] for sender, entries in self.senders.items()}
+            gaps = {sender: list(gaps) for sender, gaps in self.gaps.items()}
+        ages = [age for sender_ages in senders.values() for age in sender_ages]
+        return Munch(
+            depth=len(ages),
+            oldest_age=max(ages, default=0),
+            mean_age=sum(ages) / len(ages) if len(ages) > 0 else 0,
+            senders={sender: Munch(depth=len(a), oldest_age=max(a)) for sender, a in senders.items()},
+            gaps=gaps,
+            mined=self.mined,
+            dropped=self.dropped,
+            rebroadcasts=self.rebroadcasts,
+            fee_bumps=self.fee_bumps,
+            failed=self.failed,
+        )
+
+    def start(self, interval=defaults.PENDING_CHECK_INTERVAL):
+        """
+        Run the check rounds in a background thread
+
+        :param interval: the interval in seconds between rounds
+        """
+        if self._stop is not None:
+            return
+        self._stop = threading.Event()
+
+        def run(stop):
+            while not stop.wait(interval):
+                try:
+                    self.check()
+                except Exception as e:
+                    logger.warning(f"error checking the pending transactions: {e}")
+
+        threading.Thread(target=run, args=(self._stop,), name="pending-transactions", daemon=True).start()
+
+    def stop(self):
+        """stop the background rounds"""
+        if self._stop is not None:
+            self._stop.set()
+            self._stop = None
@@ -1,4 +1,5 @@
 import os
+import functools
 from datetime import datetime
 import json
 import uuid
@@ -11,7 +12,7 @@ from nacl import secret, utils as nacl_utils
 from aeternity.identifiers import ACCOUNT_ID, ACCOUNT_API_FORMAT, ACCOUNT_SOFIA_FORMAT, ACCOUNT_RAW_FORMAT
 from aeternity.identifiers import ACCOUNT_KIND_BASIC
 from aeternity.identifiers import SECRET_TYPE_SLIP0010
-from aeternity import hashing, utils
+from aeternity import hashing, utils, defaults
 
 
 class Account:
@@ -171,12 +172,10 @@ class Account:
 
         """
         try:
-            with open(path) as fp:
-                j = json.load(fp)
-                raw_private_key = keystore_open(j, password)
-                signing_key = SigningKey(seed=raw_private_key[0:32], encoder=RawEncoder)
-                kp = Account(signing_key, signing_key.verify_key)
-                return kp
+            raw_private_key = _keystore_file_open(path, password)
+            signing_key = SigningKey(seed=raw_private_key[0:32], encoder=RawEncoder)
+            kp = Account(signing_key, signing_key.verify_key)
+            return kp
         except CryptoError as e:
             raise ValueError(e)
 
@@ -245,6 +244,46 @@ def keystore_open(k, password):
     return private_key
 
 
+def _keystore_file_open(path, password) -> bytes:
+    """
+    Decrypt the secret key of a Keystore/JSON file
+    """
+    with open(path) as fp:
+        return keystore_open(json.load(fp), password)
+
+
+def _keystore_files_open(keystores: list) -> list:
+    """
+    Decrypt the secret keys of a list of (path, password) Keystore/JSON files
+    """
+    return [_keystore_file_open(path, password) for path, password in keystores]
+
+
+def open_keystores(keystores: list, processes: int = None) -> list:
+    """
+    Load many accounts from Keystore/JSON files, the key derivation of each keystore
+    takes hundreds of milliseconds and the keystores can be opened in parallel
+    :param keystores: a list of (path, password) tuples
+    :param processes: if set, the number of processes used to open the keystores in parallel,
+        each key derivation uses the memory set in the keystore (256MB for the keystores created by the sdk)
+    :return: the list of the accounts, in the same order of the keystores
+
+    raise ValueError if a keystore cannot be opened
+    """
+    try:
+        raw_private_keys = utils.map_chunks(_keystore_files_open, list(keystores), processes)
+    except CryptoError as e:
+        raise ValueError(e)
+    signing_keys = [SigningKey(seed=k[0:32], encoder=RawEncoder) for k in raw_private_keys]
+    return [Account(signing_key, signing_key.verify_key) for signing_key in signing_keys]
+
+
+@functools.lru_cache(maxsize=defaults.VERIFY_KEY_CACHE_SIZE)
+def _verify_key(account_id) -> VerifyKey:
+    """get the VerifyKey of an account id or raw public key, the keys are cached"""
+    return VerifyKey(hashing.decode(account_id) if isinstance(account_id, str) else account_id)
+
+
 def is_signature_valid(account_id, signature, data: bytes) -> bool:
     """
     Verify the signature of a message
@@ -254,14 +293,30 @@ def is_signature_valid(account_id, signature, data: bytes) -> bool:
     :return: true if the signature for the message is valid, false otherwise
     """
     try:
-        id = hashing.decode(account_id) if isinstance(account_id, str) else account_id
         sg = hashing.decode(signature) if isinstance(signature, str) else signature
-        VerifyKey(id).verify(data, sg)
+        _verify_key(account_id).verify(data, sg)
         return True
     except Exception:
         return False
 
 
+def _verify_signatures_batch(signatures: list) -> list:
+    """
+    Verify a list of (account_id, signature, data) tuples
+    """
+    return [is_signature_valid(account_id, signature, data) for account_id, signature, data in signatures]
+
+
+def verify_signatures(signatures: list, processes: int = None) -> list:
+    """
+    Verify a batch of signatures, the verification keys of the accounts are cached
+    :param signatures: a list of (account_id, signature, data) tuples, see is_signature_valid
+    :param processes: if set, the number of processes used to verify the signatures in parallel
+    :return: the list of the outcomes, true if the signature is valid, in the same order of the signatures
+    """
+    return utils.map_chunks(_verify_signatures_batch, list(signatures), processes)
+
+
 def save_keystore_to_file(path, keystore):
     """
     Utility method for save_to_keystore
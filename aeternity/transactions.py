@@ -1,12 +1,13 @@
-from aeternity.hashing import _int, _int_decode, _binary, _binary_decode, _id, _id_decode, encode, decode, hash_encode
+from aeternity.hashing import _int, _int_decode, _binary, _binary_decode, _id, _id_decode, encode, decode, hash_encode, hash as _hash
 from aeternity import identifiers as idf
-from aeternity import defaults
+from aeternity import defaults, utils
+from aeternity.signing import is_signature_valid
 
 import rlp
 import math
 import pprint
-import copy
 from munch import Munch
+from nacl.signing import SigningKey
 from deprecated import deprecated
 
 
@@ -390,40 +391,210 @@ tx_descriptors = {
 }
 
 
+def _rlp_length_prefix_size(length: int) -> int:
+    """
+    Size of the prefix that rlp prepends to a string or a list with a payload of the given length
+    """
+    if length <= 55:
+        return 1
+    return 1 + (length.bit_length() + 7) // 8
+
+
+def _rlp_item_size(item: bytes) -> int:
+    """
+    Size of the rlp encoding of a byte string
+    """
+    if len(item) == 1 and item[0] < 0x80:
+        # a single byte lower than 0x80 is its own encoding
+        return 1
+    return _rlp_length_prefix_size(len(item)) + len(item)
+
+
+def _field_encoder(label: str, fn: Fd):
+    """
+    Get the function that extracts a field from the transaction data and encodes it for rlp,
+    None if the field type is not encoded
+    """
+    if fn.field_type == _INT:
+        return lambda data: _int(data.get(label, 0))
+    if fn.field_type == _ID:
+        return lambda data: _id(data.get(label))
+    if fn.field_type == _ENC:
+        return lambda data: decode(data.get(label))
+    if fn.field_type == _OTTL_TYPE:
+        return lambda data: _int(idf.ORACLE_TTL_TYPES.get(data.get(label)))
+    if fn.field_type == _SG:
+        # signatures are always a list
+        return lambda data: [decode(sg) for sg in data.get(label, [])]
+    if fn.field_type == _VM_ABI:
+        # vm/abi are encoded in the same 32bit length block
+        return lambda data: _int(data.get("vm_version")) + _int(data.get("abi_version"), 2)
+    if fn.field_type == _BIN:
+        # this are binary string #TODO: may be byte array
+        return lambda data: _binary(data.get(label))
+    if fn.field_type == _PTR:
+        # this are name pointers
+        return lambda data: [[_binary(p.get("key")), _id(p.get("id"))] for p in data.get(label, [])]
+    if fn.field_type == _TX:
+        def encode_tx(data):
+            # this can be raw or tx object
+            tx = data.get(label).tx if hasattr(data.get(label), "tx") else data.get(label)
+            return decode(tx)
+        return encode_tx
+    return None
+
+
+def _field_decoders(label: str, fn: Fd):
+    """
+    Get the list of (key, function) that decode a rlp field to the transaction data,
+    the functions take the field value and the function used to decode the enclosed transactions
+    """
+    if fn.field_type == _INT:
+        return [(label, lambda value, decode_tx: _int_decode(value))]
+    if fn.field_type == _ID:
+        return [(label, lambda value, decode_tx: _id_decode(value))]
+    if fn.field_type == _ENC:
+        return [(label, lambda value, decode_tx: encode(fn.encoding_prefix, value))]
+    if fn.field_type == _OTTL_TYPE:
+        return [(label, lambda value, decode_tx: idf.ORACLE_TTL_TYPES_REV.get(_int_decode(value)))]
+    if fn.field_type == _SG:
+        # signatures are always a list
+        return [(label, lambda value, decode_tx: [encode(idf.SIGNATURE, sg) for sg in value])]
+    if fn.field_type == _VM_ABI:
+        # vm/abi are encoded in the same 32bit length block
+        return [("vm_version", lambda value, decode_tx: _int_decode(value[0:len(value) - 2])),
+                ("abi_version", lambda value, decode_tx: _int_decode(value[len(value) - 2:]))]
+    if fn.field_type == _BIN:
+        # this are byte arrays
+        return [(label, lambda value, decode_tx: _binary_decode(value, data_type=fn.data_type))]
+    if fn.field_type == _PTR:
+        # this are name pointers
+        return [(label, lambda value, decode_tx: [{"key": _binary_decode(p[0], data_type=str), "id": _id_decode(p[1])} for p in value])]
+    if fn.field_type == _TX:
+        # this can be raw or tx object
+        return [(label, lambda value, decode_tx: decode_tx(value))]
+    return []
+
+
+class _TxCodec:
+    """
+    The rlp encoder and decoder of a transaction descriptor,
+    the field types of the schema are resolved once when the codec is created
+    """
+
+    def __init__(self, descriptor: dict):
+        self.descriptor = descriptor
+        schema = descriptor.get("schema", {})
+        self.size = len(schema) + 1  # the +1 is for the tag
+        self.encoders = []
+        self.decoders = []
+        for label, fn in schema.items():
+            encoder = _field_encoder(label, fn)
+            if encoder is not None:
+                self.encoders.append((fn.index, encoder))
+            for key, decoder in _field_decoders(label, fn):
+                self.decoders.append((key, fn.index, decoder))
+
+    def encode(self, data: dict) -> list:
+        """build the rlp fields of a transaction from its data"""
+        raw_data = [0] * self.size
+        # set the tx tag first
+        raw_data[0] = _int(data.get("tag"))
+        for index, encoder in self.encoders:
+            raw_data[index] = encoder(data)
+        return raw_data
+
+    def decode(self, raw: list, decode_tx, tx_data: dict) -> dict:
+        """
+        set the data of a transaction decoded from its rlp fields into tx_data,
+        decode_tx is the function that decodes the enclosed transactions
+        """
+        for key, index, decoder in self.decoders:
+            tx_data[key] = decoder(raw[index], decode_tx)
+        return tx_data
+
+
+# the codecs of the transaction descriptors, by descriptor id
+_tx_codecs = {}
+
+
+def _get_tx_codec(descriptor: dict) -> _TxCodec:
+    """get the codec of a transaction descriptor, creating it on first use"""
+    codec = _tx_codecs.get(id(descriptor))
+    if codec is None or codec.descriptor is not descriptor:
+        codec = _TxCodec(descriptor)
+        _tx_codecs[id(descriptor)] = codec
+    return codec
+
+
 class TxObject:
     """
     This is a TxObject that is used throughout the SDK for transactions
     It contains all the info associated with a transaction
     """
 
+    __slots__ = ("data", "tx", "hash", "_metadata", "_lazy_metadata", "_index")
+
     def __init__(self, **kwargs):
-        self._index = {}
         self.set_data(kwargs.get("data", {}))
         self.tx = kwargs.get("tx", None)
         self.hash = kwargs.get("hash", None)
         self.set_metadata(kwargs.get("metadata", {}))
-        # self._build_index() # the index building is triggered by the set metadata
+
+    @property
+    def metadata(self):
+        """the metadata of the transaction, the lazy properties are computed on access"""
+        for name in list(self._lazy_metadata or []):
+            self._resolve_metadata(name)
+        return self._metadata
 
     def set_data(self, data):
+        # the conversion to Munch copies the containers, the values are shared
         self.data = Munch.fromDict(data)
+        self._index = None
 
     def set_metadata(self, metadata):
-        self.metadata = Munch.fromDict(metadata)
-        self._build_index()
+        self._metadata = Munch.fromDict(metadata)
+        self._lazy_metadata = None
+        self._index = None
+
+    def set_lazy_metadata(self, name, compute):
+        """
+        Set a metadata property that is computed on first access
+
+        :param name: the name of the meta property
+        :param compute: a function that takes the TxObject and returns the value of the property
+        """
+        if self._lazy_metadata is None:
+            self._lazy_metadata = {}
+        self._lazy_metadata[name] = compute
+
+    def _resolve_metadata(self, name):
+        """compute a lazy metadata property and store it in the metadata"""
+        value = self._lazy_metadata.pop(name)(self)
+        self._metadata[name] = value
+        if self._index is not None:
+            self._index[f"meta.{name}"] = value
+
+    def _get_index(self):
+        """get the index of the properties, building it on first access"""
+        if self._index is None:
+            self._build_index()
+        return self._index
 
     def _build_index(self):
         self._index = {}
-        for k, v in Munch.toDict(self.metadata).items():
+        for k, v in self._metadata.items():
             self._index[f"meta.{k}"] = v
 
         def __bi(data: dict):
             prefix = "ga." if data.get("tag", -1) == idf.OBJECT_TAG_GA_META_TRANSACTION else ""
-            for k, v in Munch.toDict(data).items():
+            for k, v in data.items():
                 if k == "tx":
-                    __bi(Munch.toDict(v.data))
+                    __bi(v.data)
                     continue
                 self._index[f"{prefix}{k}"] = v
-        __bi(Munch.toDict(self.data))
+        __bi(self.data)
 
     def asdict(self):
         t = dict(
@@ -449,7 +620,7 @@ class TxObject:
         :param name: the name of the property to get
         :return: the property value or None if there is no such property
         """
-        return self._index.get(name)
+        return self._get_index().get(name)
 
     def meta(self, name):
         """
@@ -458,7 +629,9 @@ class TxObject:
         :param name: the name of the meta property
         :return: the value of the meta property or none if not found
         """
-        return self._index.get(f"meta.{name}")
+        if self._lazy_metadata and name in self._lazy_metadata:
+            self._resolve_metadata(name)
+        return self._get_index().get(f"meta.{name}")
 
     def ga_meta(self, name):
         """
@@ -467,7 +640,7 @@ class TxObject:
         :param name: the name of the property to get
         :return: the property value or None if there is no such property
         """
-        return self._index.get(f"ga.{name}")
+        return self._get_index().get(f"ga.{name}")
 
     @deprecated(reason="This method has been deprecated in favour of get('signatures')")
     def get_signatures(self):
@@ -495,6 +668,116 @@ class TxObject:
         return pprint.pformat(self.data)
 
 
+def _parse_transactions_batch(transactions: list, tx_builder, compute_fee: bool, compute_hash: bool) -> list:
+    """
+    Parse a list of encoded transactions and/or node replies of transactions
+    """
+    txos = []
+    for tx in transactions:
+        if isinstance(tx, str):
+            txos.append(tx_builder._rlptx_to_txobject(decode(tx), compute_fee=compute_fee, compute_hash=compute_hash))
+        else:
+            api_data = tx if isinstance(tx, Munch) else Munch.fromDict(tx)
+            txos.append(tx_builder._jsontx_to_txobject(api_data, compute_fee=compute_fee, compute_hash=compute_hash))
+    return txos
+
+
+def _sign_transactions_batch(tx_raws: list, seed: bytes, prefix: bytes) -> list:
+    """
+    Sign a list of encoded transactions with the signing key seed
+    """
+    signing_key = SigningKey(seed)
+    return [encode(idf.SIGNATURE, signing_key.sign(prefix + tx_raw).signature) for tx_raw in tx_raws]
+
+
+# the transaction fields holding the accounts that must sign the transactions, by transaction tag
+_SIGNER_FIELDS = {
+    idf.OBJECT_TAG_SPEND_TRANSACTION: ["sender_id"],
+    idf.OBJECT_TAG_NAME_SERVICE_PRECLAIM_TRANSACTION: ["account_id"],
+    idf.OBJECT_TAG_NAME_SERVICE_CLAIM_TRANSACTION: ["account_id"],
+    idf.OBJECT_TAG_NAME_SERVICE_UPDATE_TRANSACTION: ["account_id"],
+    idf.OBJECT_TAG_NAME_SERVICE_TRANSFER_TRANSACTION: ["account_id"],
+    idf.OBJECT_TAG_NAME_SERVICE_REVOKE_TRANSACTION: ["account_id"],
+    idf.OBJECT_TAG_CONTRACT_CREATE_TRANSACTION: ["owner_id"],
+    idf.OBJECT_TAG_CONTRACT_CALL_TRANSACTION: ["caller_id"],
+    idf.OBJECT_TAG_CHANNEL_CREATE_TRANSACTION: ["initiator", "responder"],
+    idf.OBJECT_TAG_CHANNEL_CLOSE_SOLO_TRANSACTION: ["from_id"],
+    idf.OBJECT_TAG_CHANNEL_SLASH_TRANSACTION: ["from_id"],
+    idf.OBJECT_TAG_CHANNEL_SETTLE_TRANSACTION: ["from_id"],
+    idf.OBJECT_TAG_CHANNEL_SNAPSHOT_TRANSACTION: ["from_id"],
+    idf.OBJECT_TAG_CHANNEL_FORCE_PROGRESS_TRANSACTION: ["from_id"],
+    idf.OBJECT_TAG_ORACLE_REGISTER_TRANSACTION: ["account_id"],
+    idf.OBJECT_TAG_ORACLE_QUERY_TRANSACTION: ["sender_id"],
+    idf.OBJECT_TAG_ORACLE_RESPONSE_TRANSACTION: ["oracle_id"],
+    idf.OBJECT_TAG_ORACLE_EXTEND_TRANSACTION: ["oracle_id"],
+    idf.OBJECT_TAG_GA_ATTACH_TRANSACTION: ["owner_id"],
+}
+
+
+def _signer_ids(tx: TxObject):
+    """
+    get the account ids that must sign a transaction, None if they cannot be known from the transaction,
+    like for the channel transactions signed by both the participants (deposit, withdraw and close mutual)
+    """
+    fields = _SIGNER_FIELDS.get(tx.data.tag)
+    if fields is None:
+        return None
+    ids = [tx.data.get(name) for name in fields]
+    # the oracles are operated by the account with the same public key
+    return [f"{idf.ACCOUNT_ID}_{i[3:]}" if i.startswith(f"{idf.ORACLE_ID}_") else i for i in ids]
+
+
+def _verify_transactions_batch(transactions: list, prefix: bytes) -> list:
+    """
+    Verify a list of (tx_raw, signatures, signer_ids) tuples, a transaction is valid if each signer
+    has a valid signature, and there are no other signatures, as verified by the node.
+    The signatures can be over the transaction or, since the Lima protocol, over its hash.
+    """
+    results = []
+    for tx_raw, signatures, signer_ids in transactions:
+        if len(signatures) == 0 or signer_ids is None:
+            results.append(None)
+            continue
+        data = [prefix + tx_raw, prefix + _hash(tx_raw)]
+        remaining = list(signatures)
+        for signer_id in signer_ids:
+            sg = next((sg for sg in remaining if any(is_signature_valid(signer_id, sg, d) for d in data)), None)
+            if sg is None:
+                break
+            remaining.remove(sg)
+        else:
+            results.append(len(remaining) == 0)
+            continue
+        results.append(False)
+    return results
+
+
+def verify_transactions(transactions: list, network_id: str, processes: int = None) -> list:
+    """
+    Verify the signatures of a batch of signed transactions, the verification keys of the accounts are cached
+
+    Args:
+        transactions (list): the signed TxObjects to verify
+        network_id (str): the network id the transactions have been signed for
+        processes (int): if set, the number of processes used to verify the transactions in parallel
+    Returns:
+        the list of the outcomes, in the same order of the transactions: true if the transaction has exactly
+        one valid signature for each account that must sign it, false otherwise, None if the transaction
+        has no signatures (generalized accounts) or the accounts that must sign it depend on the state
+        of the chain (the channel deposit, withdraw and close mutual transactions)
+    Raises:
+        TypeError: if a transaction is not signed
+    """
+    prefix = _binary(network_id)
+    items = []
+    for tx in transactions:
+        if tx.data.tag != idf.OBJECT_TAG_SIGNED_TRANSACTION:
+            raise TypeError(f"The transaction {tx.hash} is not signed")
+        inner_tx = tx.data.tx
+        items.append((decode(inner_tx.tx), [decode(sg) for sg in tx.data.signatures], _signer_ids(inner_tx)))
+    return utils.map_chunks(_verify_transactions_batch, items, processes, prefix)
+
+
 class TxSigner:
     """
     TxSigner is used to compute the signature for transactions
@@ -512,6 +795,8 @@ class TxSigner:
             raise ValueError("Network ID must be set to sign transactions")
         self.account = account
         self.network_id = network_id
+        # the network id prefix of the signed data
+        self._prefix = _binary(network_id)
 
     def sign_transaction(self, transaction: TxObject, metadata: dict = None) -> str:
         """
@@ -526,10 +811,28 @@ class TxSigner:
         # get the transaction as byte list
         tx_raw = decode(transaction.tx)
         # sign the transaction
-        signature = self.account.sign(_binary(self.network_id) + tx_raw)
+        signature = self.account.sign(self._prefix + tx_raw)
         # pack and encode the transaction
         return encode(idf.SIGNATURE, signature)
 
+    def sign_transactions(self, transactions: list, processes: int = None) -> list:
+        """
+        Sign a batch of transactions
+
+        Args:
+            transactions (list): the TxObjects to be signed
+            processes (int): if set, the number of processes used to sign the transactions in parallel,
+                the signing key is sent to the worker processes
+
+        Returns:
+            the list of the encoded and prefixed signatures, in the same order of the transactions
+        """
+        tx_raws = [decode(tx.tx) for tx in transactions]
+        # the accounts without a signing key, for example the ones held by a key agent, sign in this process
+        if self.account.signing_key is None:
+            return [encode(idf.SIGNATURE, self.account.sign(self._prefix + tx_raw)) for tx_raw in tx_raws]
+        return utils.map_chunks(_sign_transactions_batch, tx_raws, processes, self.account.signing_key.encode(), self._prefix)
+
     def __str__(self):
         return f"{self.network_id}:{self.account.get_address()}"
 
@@ -567,14 +870,19 @@ class TxBuilder:
         tx_raw = decode(encoded_tx)
         return hash_encode(idf.TRANSACTION_HASH, tx_raw)
 
-    def compute_min_fee(self, tx_data: dict, tx_descriptor: dict, tx_raw: list) -> int:
+    def compute_min_fee(self, tx_data: dict, tx_descriptor: dict, tx_raw: list, tx_size: int = None) -> int:
         """
         Compute the minimum fee for a transaction
 
+        The size of the transaction depends on the fee itself, the transaction is
+        encoded at most once and the size for a given fee is computed from the
+        difference in length of the fee field and of the rlp list prefix.
+
         Args:
             tx_data (dict): the transaction data
             tx_descriptor (dict): the descriptor of the transaction fields
             tx_raw: the unencoded rlp data of the transaction
+            tx_size (int): the length of the rlp encoded tx_raw, if already known
         Returns:
             the minimum fee for the transaction
         """
@@ -598,18 +906,23 @@ class TxBuilder:
         # if the fee is for a ga meta compute the enclosed tx size based fee
         ga_surplus = 0
         if fee_type == GA_META:
-            tx_size = len(tx_raw[tx_descriptor.get("tx").index])
-            ga_surplus = (self.base_gas * base_gas_multiplier + tx_size * self.gas_per_byte)
+            inner_tx_size = len(tx_raw[tx_descriptor.get("tx").index])
+            ga_surplus = (self.base_gas * base_gas_multiplier + inner_tx_size * self.gas_per_byte)
+        # the length of the list payload without the fee field
+        if tx_size is None:
+            tx_size = len(rlp.encode(tx_raw))
+        payload_size = tx_size - _rlp_item_size(tx_raw[fee_field_index])
+        # the list prefix is the n bytes for which a payload of tx_size - n bytes has a prefix of n bytes
+        payload_size -= next(n for n in range(1, 10) if _rlp_length_prefix_size(tx_size - n) == n)
         # begin calculation
         current_fee, min_fee = -1, defaults.FEE
         while current_fee != min_fee:
             # save the min fee into current fee
             current_fee = min_fee
-            # update the fee value
-            tx_raw[fee_field_index] = _int(current_fee)
-            # first calculate the size part
-            tx_size = len(rlp.encode(tx_raw))
-            min_fee = self.base_gas * base_gas_multiplier + tx_size * self.gas_per_byte
+            # first calculate the size part, with the current fee in the fee field
+            fee_tx_size = payload_size + _rlp_item_size(_int(current_fee))
+            fee_tx_size += _rlp_length_prefix_size(fee_tx_size)
+            min_fee = self.base_gas * base_gas_multiplier + fee_tx_size * self.gas_per_byte
             # add the ttl_component
             min_fee += ttl_component
             # remove the ga_surplus
@@ -619,7 +932,7 @@ class TxBuilder:
 
         return min_fee
 
-    def _jsontx_to_txobject(self, api_data):
+    def _jsontx_to_txobject(self, api_data, compute_fee=True, compute_hash=True):
         """
         Transform a dictionary built from a json reply  from the node to a transaction object.
         a the input api_data must be obtained from a /transactions/tx_xyz endpoint.
@@ -628,6 +941,8 @@ class TxBuilder:
         a different ways from other transactions, and their data is mixed with block informations
 
         :param api_data: a namedtuple of the response obtained from the node api
+        :param compute_fee: whenever to compute the min_fee metadata
+        :param compute_hash: whenever to compute the hash of the signed transactions
         """
         # transform the data to a dict since the openapi module maps them to a named tuple
         tx_data = Munch.toDict(api_data)
@@ -636,7 +951,7 @@ class TxBuilder:
             tx_data["type"] = idf.TRANSACTION_TAG_TO_TYPE.get(idf.OBJECT_TAG_SIGNED_TRANSACTION)
             tx_data["version"] = 1
             # signed tx, extract the inner tx
-            tx_data["tx"] = self._jsontx_to_txobject(api_data.tx)
+            tx_data["tx"] = self._jsontx_to_txobject(api_data.tx, compute_fee=compute_fee, compute_hash=compute_hash)
         tx_data["tag"] = idf.TRANSACTION_TYPE_TO_TAG.get(tx_data.get("type"))
         # encode th tx in rlp
         tag = tx_data.get("tag")
@@ -662,68 +977,69 @@ class TxBuilder:
             flatten_ttl("response_ttl", tx_data)
 
         # do not compute the fee for a signed transaction
-        compute_hash = True if tag == idf.OBJECT_TAG_SIGNED_TRANSACTION else False
-        return self._txdata_to_txobject(tx_data, descriptor, compute_hash=compute_hash)
-
-    def _txdata_to_txobject(self, data: dict, descriptor: dict, metadata: dict = {}, compute_hash=True) -> TxObject:
-        # initialize the right data size
-        # this is PYTHON to POSTBODY
-        schema = descriptor.get("schema", [])
-        raw_data = [0] * (len(schema) + 1)  # the +1 is for the tag
-        # set the tx tag first
-        raw_data[0] = _int(data.get("tag"))
-        # parse fields and encode them
-        for label, fn in schema.items():
-            if fn.field_type == _INT:
-                raw_data[fn.index] = _int(data.get(label, 0))
-            elif fn.field_type == _ID:
-                raw_data[fn.index] = _id(data.get(label))
-            elif fn.field_type == _ENC:
-                raw_data[fn.index] = decode(data.get(label))
-            elif fn.field_type == _OTTL_TYPE:
-                raw_data[fn.index] = _int(idf.ORACLE_TTL_TYPES.get(data.get(label)))
-            elif fn.field_type == _SG:
-                # signatures are always a list
-                raw_data[fn.index] = [decode(sg) for sg in data.get(label, [])]
-            elif fn.field_type == _VM_ABI:
-                # vm/abi are encoded in the same 32bit length block
-                raw_data[fn.index] = _int(data.get("vm_version")) + _int(data.get("abi_version"), 2)
-            elif fn.field_type == _BIN:
-                # this are binary string #TODO: may be byte array
-                raw_data[fn.index] = _binary(data.get(label))
-            elif fn.field_type == _PTR:
-                # this are name pointers
-                raw_data[fn.index] = [[_binary(p.get("key")), _id(p.get("id"))] for p in data.get(label, [])]
-            elif fn.field_type == _TX:
-                # this can be raw or tx object
-                tx = data.get(label).tx if hasattr(data.get(label), "tx") else data.get(label)
-                raw_data[fn.index] = decode(tx)
-        # encode the transaction in rlp
-        rlp_tx = rlp.encode(raw_data)
+        compute_hash = compute_hash and tag == idf.OBJECT_TAG_SIGNED_TRANSACTION
+        return self._txdata_to_txobject(tx_data, descriptor, compute_hash=compute_hash, compute_fee=compute_fee, lazy_fee=True)
+
+    def _txdata_to_txobject(self, data: dict, descriptor: dict, metadata: dict = {},
+                            compute_hash=True, auto_fee=False, compute_fee=True, lazy_fee=False, rlp_tx=None) -> TxObject:
+        """
+        Transform the transaction data to a transaction object,
+        if auto_fee is True and the fee is 0 the fee is set to the minimum fee,
+        if compute_fee is False the min_fee metadata is not computed,
+        if lazy_fee is True the min_fee metadata is computed on first access,
+        if rlp_tx is set it is used as the encoding of the transaction instead of encoding the data
+        """
+        raw_data = None
+        min_fee = None
+        if rlp_tx is None:
+            # this is PYTHON to POSTBODY
+            raw_data = _get_tx_codec(descriptor).encode(data)
+            # set the minimum fee if required
+            if auto_fee and descriptor.get("fee") is not None and data.get("fee", -1) == 0:
+                min_fee = self.compute_min_fee(data, descriptor, raw_data)
+                data["fee"] = min_fee
+                raw_data[descriptor.get("schema").get("fee").index] = _int(min_fee)
+            # encode the transaction in rlp
+            rlp_tx = rlp.encode(raw_data)
         # encode the tx in base64
         rlp_b64_tx = encode(idf.TRANSACTION, rlp_tx)
-        # copy the data before modifying
-        tx_data = copy.deepcopy(data)
-        # build the tx object
+        # build the tx object, the data containers are copied by the TxObject
         txo = TxObject(
-            data=Munch.fromDict(tx_data),
+            data=data,
             tx=rlp_b64_tx,
         )
         # compute the tx hash
         if compute_hash:
             txo.hash = hash_encode(idf.TRANSACTION_HASH, rlp_tx)
         # copy the metadata if exists or initialize it if None
-        tx_meta = copy.deepcopy(metadata) if metadata is not None else {}
+        tx_meta = dict(metadata) if metadata is not None else {}
         # compute the minimum fee
-        if descriptor.get("fee") is not None:
-            tx_meta["min_fee"] = self.compute_min_fee(data, descriptor, raw_data)
+        if min_fee is not None:
+            # the minimum fee does not depend on the value of the fee field
+            tx_meta["min_fee"] = min_fee
+        elif compute_fee and not lazy_fee and descriptor.get("fee") is not None:
+            if raw_data is None:
+                raw_data = rlp.decode(rlp_tx)
+            tx_meta["min_fee"] = self.compute_min_fee(data, descriptor, raw_data, tx_size=len(rlp_tx))
         # only set the metadata if it is not empty
         txo.set_metadata(tx_meta)
+        if compute_fee and lazy_fee and min_fee is None and descriptor.get("fee") is not None:
+            txo.set_lazy_metadata("min_fee", self._txobject_min_fee)
         return txo
 
-    def _rlptx_to_txobject(self, rlp_data: bytes) -> TxObject:
+    def _txobject_min_fee(self, txo: TxObject) -> int:
+        """compute the minimum fee of a TxObject from its encoded transaction"""
+        descriptor = tx_descriptors.get((txo.data.tag, txo.data.version))
+        rlp_tx = decode(txo.tx)
+        return self.compute_min_fee(txo.data, descriptor, rlp.decode(rlp_tx), tx_size=len(rlp_tx))
+
+    def _rlptx_to_txobject(self, rlp_data: bytes, compute_fee=True, compute_hash=True) -> TxObject:
         """
         Transform an rlp encoded byte array transaction to a transaction object
+
+        :param rlp_data: the rlp encoded transaction
+        :param compute_fee: whenever to compute the min_fee metadata
+        :param compute_hash: whenever to compute the hash of the signed transactions
         """
         # decode the rlp
         raw = rlp.decode(rlp_data)
@@ -734,38 +1050,15 @@ class TxBuilder:
         if descriptor is None:
             # the transaction is not defined
             raise TypeError(f"Unknown transaction tag/version: {tag}/{vsn}")
-        schema = descriptor.get("schema")
         tx_data = {"tag": tag, "type": idf.TRANSACTION_TAG_TO_TYPE.get(tag)}
-        for label, fn in schema.items():
-            if fn.field_type == _INT:
-                tx_data[label] = _int_decode(raw[fn.index])
-            if fn.field_type == _ID:
-                tx_data[label] = _id_decode(raw[fn.index])
-            elif fn.field_type == _ENC:
-                tx_data[label] = encode(fn.encoding_prefix, raw[fn.index])
-            elif fn.field_type == _OTTL_TYPE:
-                ttl_type = _int_decode(raw[fn.index])
-                tx_data[fn.index] = idf.ORACLE_TTL_TYPES_REV.get(ttl_type)
-            elif fn.field_type == _SG:
-                # signatures are always a list
-                tx_data[label] = [encode(idf.SIGNATURE, sg) for sg in raw[fn.index]]
-            elif fn.field_type == _VM_ABI:
-                vml = len(raw[fn.index])
-                # vm/abi are encoded in the same 32bit length block
-                tx_data["vm_version"] = _int_decode(raw[fn.index][0:vml - 2])
-                tx_data["abi_version"] = _int_decode(raw[fn.index][vml - 2:])
-            elif fn.field_type == _BIN:
-                # this are byte arrays
-                tx_data[label] = _binary_decode(raw[fn.index], data_type=fn.data_type)
-            elif fn.field_type == _PTR:
-                # this are name pointers
-                tx_data[label] = [{"key": _binary_decode(p[0], data_type=str), "id": _id_decode(p[1])} for p in raw[fn.index]]
-            elif fn.field_type == _TX:
-                # this can be raw or tx object
-                tx_data[label] = self._rlptx_to_txobject(raw[fn.index])
-        # re-encode the decode object
-        compute_hash = True if tag == idf.OBJECT_TAG_SIGNED_TRANSACTION else False
-        return self._txdata_to_txobject(tx_data, descriptor, compute_hash=compute_hash)
+
+        def decode_tx(rlp_tx):
+            return self._rlptx_to_txobject(rlp_tx, compute_fee=compute_fee, compute_hash=compute_hash)
+        _get_tx_codec(descriptor).decode(raw, decode_tx, tx_data)
+        # the original encoding is used for the tx and the hash
+        compute_hash = compute_hash and tag == idf.OBJECT_TAG_SIGNED_TRANSACTION
+        return self._txdata_to_txobject(tx_data, descriptor, compute_hash=compute_hash, compute_fee=compute_fee,
+                                        lazy_fee=True, rlp_tx=rlp_data)
 
     def _build_txobject(self, tx_data, metadata={}) -> TxObject:
         """
@@ -782,14 +1075,8 @@ class TxBuilder:
         if descriptor is None:
             # the transaction is not defined
             raise TypeError(f"Unknown transaction tag/version: {tag}/{vsn}")
-        # build the tx object
-        txo = self._txdata_to_txobject(tx_data, descriptor, metadata=metadata)
-        # check whenever we need to automatically assign the fee
-        # we use -1 as default since for the signed tx there is no field fee
-        if tx_data.get("fee", -1) == 0:
-            tx_data["fee"] = txo.metadata.min_fee
-            txo = self._txdata_to_txobject(tx_data, descriptor, metadata)
-        return txo
+        # build the tx object, automatically assigning the fee if it is 0
+        return self._txdata_to_txobject(tx_data, descriptor, metadata=metadata, auto_fee=True)
 
     def parse_node_reply(self, tx_data) -> TxObject:
         """
@@ -807,6 +1094,46 @@ class TxBuilder:
         rlp_data = decode(tx_string)
         return self._rlptx_to_txobject(rlp_data)
 
+    def parse_transactions(self, transactions, compute_fee=True, compute_hash=True, processes=None) -> list:
+        """
+        Parse a batch of transactions to transaction objects
+
+        Args:
+            transactions: a list of encoded transactions (tx_...) and/or node api replies of transactions,
+                or a node reply with a list of transactions, like the one of get_micro_block_transactions_by_hash
+            compute_fee (bool): whenever to compute the min_fee metadata of the transactions
+            compute_hash (bool): whenever to compute the hash of the signed transactions
+            processes (int): if set, the number of processes used to parse the transactions in parallel
+        Returns:
+            the list of TxObject, in the same order of the input
+        """
+        if isinstance(transactions, dict):
+            transactions = transactions.get("transactions", [])
+        if processes and processes > 1:
+            # the node replies are sent to the workers as plain dictionaries
+            transactions = [tx if isinstance(tx, str) else Munch.toDict(tx) for tx in transactions]
+        return utils.map_chunks(_parse_transactions_batch, transactions, processes, self, compute_fee, compute_hash)
+
+    def tx_with_fee(self, tx: TxObject, fee: int) -> TxObject:
+        """
+        Rebuild an unsigned transaction with a different fee, for example to replace
+        a transaction that is stuck in the pending pool.
+        If the fee is lower than the minimum fee of the rebuilt transaction the minimum fee is used.
+
+        :param tx: the TxObject of the transaction to rebuild
+        :param fee: the new fee
+        :return: the TxObject of the rebuilt transaction
+        """
+        if tx.data.get("fee") is None:
+            raise TypeError(f"The transaction of type {tx.data.get('type')} has no fee")
+        data = dict(tx.data)
+        data["fee"] = fee
+        txo = self._build_txobject(data)
+        if txo.meta("min_fee") > fee:
+            data["fee"] = 0
+            txo = self._build_txobject(data)
+        return txo
+
     def tx_signed(self, signatures: list, tx: TxObject, metadata={}) -> TxObject:
         """
         Create a signed transaction. This is a special type of transaction
@@ -1,5 +1,7 @@
+import math
 import validators
 
+from concurrent.futures import ProcessPoolExecutor
 from decimal import Decimal
 from aeternity import hashing
 
@@ -16,21 +18,14 @@ def is_valid_hash(hash_str: str, prefix: str = None) -> bool:
     try:
         if hash_str is None:
             return False
-        # decode the hash
+        # check the prefix first, it is cheaper than decoding
+        if prefix is not None:
+            if not isinstance(prefix, list):
+                prefix = [prefix]
+            if not any(prefix_match(p, hash_str) for p in prefix):
+                return False
+        # decode the hash, the decoding of the known identifiers is cached
         hashing.decode(hash_str)
-        # if prefix is not set then is valid
-        if prefix is None:
-            return True
-        # let's check the prefix
-        if not isinstance(prefix, list):
-            prefix = [prefix]
-        # if a match is not found then raise ValueError
-        match = False
-        for p in prefix:
-            match = match or prefix_match(p, hash_str)
-        if not match:
-            raise ValueError('Invalid prefix')
-        # a match was found
         return True
     except ValueError:
         return False
@@ -121,3 +116,22 @@ def _amounts_to_aettos(*values):
     Shortcut function to convert multiple values in one call
     """
     return [amount_to_aettos(x) for x in values]
+
+
+def map_chunks(fn, items, processes: int = None, *args) -> list:
+    """
+    Apply a batch function to a list of items, in parallel on a process pool if processes is set.
+    The items are split in about 4 chunks per process, fn must be a module function taking a chunk
+    of items and the args and returning a list with one result per item.
+    :param fn: the batch function, called as fn(chunk, *args)
+    :param items: the items to process, a sequence supporting len and slicing
+    :param processes: if set, the number of processes used to process the chunks in parallel
+    :return: the list of the results, in the same order of the items
+    """
+    if not processes or processes < 2 or len(items) < 2:
+        return fn(items, *args)
+    chunk_size = math.ceil(len(items) / (processes * 4))
+    chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        futures = [executor.submit(fn, chunk, *args) for chunk in chunks]
+        return [result for future in futures for result in future.result()]
@@ -0,0 +1,64 @@
+import time
+
+from munch import Munch
+
+from aeternity.chain_cache import ChainCache
+
+
+class ChainApi:
+    """an api client serving a chain of generations with one micro block and one transaction each"""
+
+    def __init__(self, height):
+        self.height = height
+        self.calls = []
+
+    def get_current_key_block_height(self):
+        return self.height
+
+    def get_generation_by_height(self, height):
+        self.calls.append(("get_generation_by_height", height))
+        return Munch.fromDict({"key_block": {"height": height, "hash": f"kh_{height}"}, "micro_blocks": [f"mh_{height}"]})
+
+    def get_micro_block_transactions_by_hash(self, hash):
+        self.calls.append(("get_micro_block_transactions_by_hash", hash))
+        height = int(hash[3:])
+        return Munch.fromDict({"transactions": [{"hash": f"th_{height}", "block_hash": hash, "block_height": height, "tx": {"amount": 10 ** 30}}]})
+
+    def get_transaction_by_hash(self, hash):
+        self.calls.append(("get_transaction_by_hash", hash))
+        return Munch.fromDict({"hash": hash, "block_height": -1})
+
+
+def test_chain_cache(tmp_path):
+    path = str(tmp_path / "chain.db")
+    api = ChainApi(200)
+    cache = ChainCache(api, path, finality_depth=10, max_mutable_entries=3)
+    for height in range(180, 201):
+        cache.get_micro_block_transactions_by_hash(hash=cache.get_generation_by_height(height=height).micro_blocks[0])
+    assert cache.misses == 42
+    # the final blocks are kept, only the 3 most recently used mutable entries are
+    assert cache.db.execute("SELECT count(*) FROM entries WHERE final = 1").fetchone()[0] == 2 * 11
+    assert cache.db.execute("SELECT count(*) FROM entries WHERE final = 0").fetchone()[0] == 3
+    # the cache is persistent
+    cache.close()
+    api.calls = []
+    cache = ChainCache(api, path, finality_depth=10, max_mutable_entries=3, mutable_max_age=0.2)
+    assert cache.get_generation_by_height(height=185).key_block.hash == "kh_185"
+    assert cache.get_micro_block_transactions_by_hash(hash="mh_185").transactions[0].tx.amount == 10 ** 30
+    # the transactions are served from the index
+    assert cache.get_transaction_block("th_185") == ("mh_185", 185)
+    assert cache.get_transaction_by_hash(hash="th_185").block_height == 185
+    assert api.calls == []
+    # the pending transactions are not cached
+    cache.get_transaction_by_hash(hash="th_pending")
+    cache.get_transaction_by_hash(hash="th_pending")
+    assert api.calls == [("get_transaction_by_hash", "th_pending")] * 2
+    # the mutable entries expire
+    api.calls = []
+    cache.get_generation_by_height(height=195)
+    cache.get_generation_by_height(height=195)
+    time.sleep(0.2)
+    cache.get_generation_by_height(height=195)
+    assert api.calls == [("get_generation_by_height", 195)] * 2
+    # the other attributes are the ones of the api
+    assert cache.height == 200
@@ -0,0 +1,181 @@
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+import websockets
+from munch import Munch
+
+from aeternity.chain_events import ChainEvents, _websocket_endpoint
+from aeternity.exceptions import TransactionWaitTimeoutExpired
+from aeternity.openapi import OpenAPIClientException
+
+
+def wait_until(condition, timeout=5):
+    deadline = time.time() + timeout
+    while not condition():
+        assert time.time() < deadline
+        time.sleep(0.01)
+
+
+class EventsNode:
+    """a node serving the key block and micro block events of a chain through a websocket"""
+
+    def __init__(self):
+        self.height = 10
+        self.transactions = {}
+        self.micro_blocks = {}
+        self.dropped = set()
+        self.calls = []
+        self.clients = set()
+        self.loop = asyncio.new_event_loop()
+        started = threading.Event()
+        threading.Thread(target=self._serve, args=(started,), daemon=True).start()
+        started.wait()
+
+    def _serve(self, started):
+        asyncio.set_event_loop(self.loop)
+        self.server = self.loop.run_until_complete(self._start_server())
+        self.url = f"http://127.0.0.1:{self.server.sockets[0].getsockname()[1]}"
+        started.set()
+        self.loop.run_forever()
+
+    async def _start_server(self):
+        return await websockets.serve(self._handler, "127.0.0.1", 0)
+
+    async def _handler(self, ws, *args):
+        for _ in range(2):
+            json.loads(await ws.recv())
+        self.clients.add(ws)
+        await ws.send(json.dumps(["KeyBlocks", "MicroBlocks"]))
+        try:
+            await ws.wait_closed()
+        finally:
+            self.clients.discard(ws)
+
+    def _publish(self, subscription, payload):
+        async def send():
+            for ws in list(self.clients):
+                await ws.send(json.dumps({"subscription": subscription, "payload": payload}))
+        asyncio.run_coroutine_threadsafe(send(), self.loop).result()
+
+    def mine_key_block(self):
+        self.height += 1
+        self._publish("KeyBlocks", {"height": self.height, "hash": f"kh_{self.height}"})
+
+    def mine_micro_block(self, tx_hashes):
+        block_hash = f"mh_{len(self.micro_blocks)}"
+        self.micro_blocks[block_hash] = tx_hashes
+        for tx_hash in tx_hashes:
+            self.transactions[tx_hash] = self.height
+        self._publish("MicroBlocks", {"height": self.height, "hash": block_hash})
+
+    def disconnect(self):
+        async def close():
+            for ws in list(self.clients):
+                await ws.close()
+        asyncio.run_coroutine_threadsafe(close(), self.loop).result()
+
+    # the node api
+    def get_current_key_block_height(self):
+        return self.height
+
+    def get_transaction_by_hash(self, hash):
+        self.calls.append(("get_transaction_by_hash", hash))
+        if hash in self.dropped:
+            raise OpenAPIClientException("Transaction not found", code=404)
+        return Munch(hash=hash, block_height=self.transactions.get(hash, -1))
+
+    def get_micro_block_transactions_by_hash(self, hash):
+        self.calls.append(("get_micro_block_transactions_by_hash", hash))
+        return Munch(transactions=[Munch(hash=h, block_height=self.transactions[h]) for h in self.micro_blocks[hash]])
+
+
+def test_chain_events_endpoint():
+    assert _websocket_endpoint("http://localhost:3014") == "ws://localhost:3014/websocket"
+    assert _websocket_endpoint("https://node.example.com/") == "wss://node.example.com/websocket"
+    assert _websocket_endpoint("ws://localhost:3014/ws") == "ws://localhost:3014/ws"
+
+
+def test_chain_events_waits():
+    node = EventsNode()
+    events = ChainEvents(node, node.url, reconnect_interval=0.1)
+    assert events.start()
+    wait_until(lambda: len(node.clients) > 0)
+    try:
+        # a transaction included in a micro block
+        waiter = threading.Thread(target=lambda: results.append(events.wait_for_transaction("th_1", 5)))
+        results = []
+        waiter.start()
+        wait_until(lambda: "th_1" in events.tx_waiters)
+        node.mine_micro_block(["th_0", "th_1"])
+        waiter.join()
+        assert results == [10]
+        assert node.calls == [("get_transaction_by_hash", "th_1"), ("get_micro_block_transactions_by_hash", "mh_0")]
+        # the micro blocks are not retrieved when no transaction is awaited
+        node.calls = []
+        node.mine_micro_block(["th_2"])
+        node.mine_key_block()
+        wait_until(lambda: events.height == 11)
+        assert node.calls == []
+        # an included transaction is found without events
+        assert events.wait_for_transaction("th_2", 5) == 10
+        assert node.calls == [("get_transaction_by_hash", "th_2")]
+        # a height reached with the key blocks
+        waiter = threading.Thread(target=lambda: results.append(events.wait_for_height(12, 5)))
+        results = []
+        waiter.start()
+        wait_until(lambda: len(events.height_waiters) > 0)
+        node.mine_key_block()
+        waiter.join()
+        assert results == [12]
+        with pytest.raises(TransactionWaitTimeoutExpired):
+            events.wait_for_height(20, 0.2)
+        # the waits fail when the connection is lost, and resume after reconnection
+        waiter = threading.Thread(target=lambda: results.append(pytest.raises(ConnectionError, events.wait_for_transaction, "th_3", 5)))
+        waiter.start()
+        wait_until(lambda: "th_3" in events.tx_waiters)
+        node.disconnect()
+        waiter.join()
+        wait_until(lambda: len(node.clients) > 0)
+        node.mine_micro_block(["th_3"])
+        assert events.wait_for_transaction("th_3", 5) == 12
+    finally:
+        events.stop()
+
+
+def test_chain_events_dropped_transactions():
+    node = EventsNode()
+    results = []
+
+    def wait(events, tx_hash):
+        results.append(pytest.raises(TransactionWaitTimeoutExpired, events.wait_for_transaction, tx_hash, 30))
+
+    # a transaction dropped by the node is detected at the next key block
+    events = ChainEvents(node, node.url, recheck_interval=60)
+    assert events.start()
+    wait_until(lambda: len(node.clients) > 0)
+    try:
+        waiter = threading.Thread(target=wait, args=(events, "th_1"))
+        waiter.start()
+        wait_until(lambda: "th_1" in events.tx_waiters)
+        node.dropped.add("th_1")
+        node.mine_key_block()
+        waiter.join(5)
+        assert results[0].value.tx_hash == "th_1"
+    finally:
+        events.stop()
+    # and without key blocks by the periodic checks
+    events = ChainEvents(node, node.url, recheck_interval=0.2)
+    assert events.start()
+    try:
+        waiter = threading.Thread(target=wait, args=(events, "th_2"))
+        waiter.start()
+        wait_until(lambda: "th_2" in events.tx_waiters)
+        node.dropped.add("th_2")
+        waiter.join(5)
+        assert results[1].value.tx_hash == "th_2"
+        assert events.tx_waiters == {}
+    finally:
+        events.stop()
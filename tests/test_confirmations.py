@@ -0,0 +1,95 @@
+from munch import Munch
+
+from aeternity.confirmations import ConfirmationTracker
+from aeternity.exceptions import TransactionWaitTimeoutExpired
+from aeternity.openapi import OpenAPIClientException
+
+
+class ChainClient:
+    """a client of a chain where the transactions are mined on demand"""
+
+    def __init__(self, height):
+        self.config = Munch(key_block_confirmation_num=2, http_pool_maxsize=4)
+        self.height = height
+        self.generations = {height: []}
+        self.transactions = {}
+        self.nonces = {}
+        self.calls = []
+
+    def submit(self, tx_hash, sender, nonce, ttl=0):
+        self.transactions[tx_hash] = Munch(hash=tx_hash, block_height=-1, tx=Munch(sender_id=sender, nonce=nonce, ttl=ttl))
+
+    def mine_micro_block(self, tx_hashes):
+        mb_hash = f"mh_{self.height}_{len(self.generations[self.height])}"
+        self.generations[self.height].append((mb_hash, tx_hashes))
+        for tx_hash in tx_hashes:
+            tx = self.transactions[tx_hash]
+            tx.block_height = self.height
+            self.nonces[tx.tx.sender_id] = max(self.nonces.get(tx.tx.sender_id, 0), tx.tx.nonce)
+
+    def mine_key_block(self):
+        self.height += 1
+        self.generations[self.height] = []
+
+    def get_current_key_block_height(self):
+        self.calls.append("get_current_key_block_height")
+        return self.height
+
+    def get_generation_by_height(self, height):
+        self.calls.append("get_generation_by_height")
+        return Munch(micro_blocks=[mb_hash for mb_hash, _ in self.generations[height]])
+
+    def get_micro_block_transactions_by_hash(self, hash):
+        self.calls.append("get_micro_block_transactions_by_hash")
+        txs = [txs for generation in self.generations.values() for mb_hash, txs in generation if mb_hash == hash][0]
+        return Munch(transactions=[self.transactions[tx_hash] for tx_hash in txs])
+
+    def get_transaction_by_hash(self, hash):
+        self.calls.append("get_transaction_by_hash")
+        if hash not in self.transactions:
+            raise OpenAPIClientException("Transaction not found", code=404)
+        return self.transactions[hash]
+
+    def get_account_by_pubkey(self, pubkey):
+        self.calls.append("get_account_by_pubkey")
+        return Munch(nonce=self.nonces.get(pubkey, 0))
+
+
+def test_confirmation_tracker():
+    client = ChainClient(10)
+    for i in range(100):
+        client.submit(f"th_{i}", "ak_bulk", i + 1)
+    client.submit("th_mined", "ak_a", 1)
+    client.submit("th_ttl", "ak_b", 1, ttl=11)
+    client.submit("th_replaced", "ak_c", 1)
+    client.submit("th_other", "ak_c", 1)
+    client.mine_micro_block(["th_mined"])
+    tracker = ConfirmationTracker(client)
+    completed = []
+    futures = tracker.track_many([f"th_{i}" for i in range(100)], callback=completed.append)
+    mined, ttl, replaced, unknown = tracker.track_many(["th_mined", "th_ttl", "th_replaced", "th_unknown"])
+    # the first round looks up the new transactions
+    assert tracker.poll() == 103
+    assert isinstance(unknown.exception(), TransactionWaitTimeoutExpired)
+    # the next rounds only scan the new blocks
+    client.mine_micro_block([f"th_{i}" for i in range(50)] + ["th_other"])
+    client.mine_key_block()
+    client.mine_micro_block([f"th_{i}" for i in range(50, 100)])
+    client.calls = []
+    assert tracker.poll() == 102
+    assert client.calls.count("get_transaction_by_hash") == 1
+    assert client.calls.count("get_account_by_pubkey") == 2
+    assert isinstance(replaced.exception(), TransactionWaitTimeoutExpired)
+    assert not mined.done() and not ttl.done()
+    client.mine_key_block()
+    client.calls = []
+    assert tracker.poll() == 50
+    assert mined.result() == 10
+    assert isinstance(ttl.exception(), TransactionWaitTimeoutExpired)
+    assert [f.result() for f in futures[:50]] == [10] * 50
+    # the confirmed transactions are verified once
+    assert client.calls.count("get_transaction_by_hash") == 51
+    client.mine_key_block()
+    assert tracker.poll() == 0
+    assert [f.result() for f in futures[50:]] == [11] * 50
+    assert len(completed) == 100
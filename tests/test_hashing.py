@@ -1,4 +1,6 @@
-from aeternity import hashing, transactions
+import secrets
+
+from aeternity import hashing, transactions, utils
 from pytest import raises
 
 
@@ -94,6 +96,30 @@ def test_hashing_base58_encode():
             assert i.get("raise_error") is True
 
 
+def test_hashing_base58_backends():
+    lib_encode, lib_decode = hashing.BASE58_BACKENDS["base58"]
+    encode, decode = hashing.BASE58_BACKENDS["table"]
+    payloads = [b"", b"\0", b"\0\0\xff"] + [b"\0" * (i % 3) + secrets.token_bytes(i) for i in range(80)]
+    for data in payloads:
+        encoded = lib_encode(data)
+        assert encode(data) == encoded
+        assert decode(encoded) == data
+        assert decode(encoded.encode("ascii")) == data
+    for invalid in ["", "1", "LUC1eAJa", "LUC1eAJa5jX", "LUC1eAJa5j0", "LUC1eAJa5jl"]:
+        with raises(ValueError):
+            decode(invalid)
+        with raises(ValueError):
+            lib_decode(invalid)
+    with raises(ValueError):
+        hashing.set_base58_backend("unknown")
+    # custom codecs can be plugged in
+    try:
+        hashing.set_base58_backend((lib_encode, lib_decode))
+        assert hashing._base58_decode(hashing._base58_encode(b"test")) == b"test"
+    finally:
+        hashing.set_base58_backend()
+
+
 def test_hashing_transactions_binary():
     tts = [
         {"in": "test", "bval": "test".encode("utf-8"), "match": True, "err": False},
@@ -178,3 +204,34 @@ def test_hashing_committment_id():
     for t in tests:
         cid, salt = hashing.commitment_id(t.get("domain"), t.get("salt"))
         assert t.get("commitment_id") == cid
+
+
+def test_hashing_identifier_cache():
+    accounts = [hashing.encode("ak", secrets.token_bytes(32)) for _ in range(10)]
+    hashing.cache_clear()
+    for _ in range(100):
+        for account in accounts:
+            raw = hashing._id(account)
+            assert hashing._id_decode(raw) == account
+            assert utils.is_valid_hash(account, prefix="ak")
+    info = hashing.cache_info()
+    assert info["decode"]["misses"] == 10 and info["decode"]["hits"] == 100 * 2 * 10 - 10
+    assert info["encode"]["misses"] == 10 and info["encode"]["hits"] == 100 * 10 - 10
+    # the invalid identifiers are never cached
+    invalid = accounts[0][:-1] + ("1" if accounts[0][-1] != "1" else "2")
+    for _ in range(2):
+        assert not utils.is_valid_hash(invalid, prefix="ak")
+        with raises(ValueError):
+            hashing.decode(invalid)
+    assert hashing.cache_info()["decode"]["currsize"] == 10
+    # the prefix is checked before decoding
+    assert not utils.is_valid_hash(accounts[0], prefix="ct")
+    # the hashes are not cached
+    hashing.decode(hashing.hash_encode("th", b"data"))
+    assert hashing.cache_info()["decode"]["currsize"] == 10
+    # the cache can be skipped when encoding
+    raw = secrets.token_bytes(32)
+    info = hashing.cache_info()
+    encoded = hashing.encode("ak", raw, cache=False)
+    assert hashing.cache_info() == info
+    assert encoded == hashing.encode("ak", raw)
@@ -76,6 +76,34 @@ def test_hdwallet_path_derivation():
     assert child_account.address == expected_address
     assert child_account.get_secret_key() == expected_private_key
 
+def test_hdwallet_derive_children():
+    mnemonic = "energy pass install genuine sell enroll wear announce brother marble test cruise"
+    hdwallet = HDWallet(mnemonic)
+
+    children = hdwallet.derive_children(account_index=12, count=2)
+    assert [path for path, _ in children] == ["m/44'/457'/12'/0'/0'", "m/44'/457'/12'/0'/1'"]
+    assert [account.address for _, account in children] == [
+        "ak_2FZU4teXWLyHWVbvf1ajejzKrcuyXffP4jaoedRDvv579mEjiY",
+        "ak_hPd6XVrLFxBGcKwBbeVA3PWNqE5YJk2NrPuUNp9Lp5q4KHvUX",
+    ]
+    assert children[1][1].get_secret_key() == "96bab5642835618383a48bb759d4179dbc9a0e9bbd79424c973cdfa694fc5c485bb5e51e9d1d7fcf3bd17cd7ae3af549addf1dd4fe66365c72757796e47d5639"
+    # the addresses match the ones derived one at a time from the master key
+    count = 200
+    expected = []
+    for address_index in range(5, 5 + count):
+        path = HDWallet.AETERNITY_DERIVATION_PATH % (3, address_index)
+        key = HDWallet._from_path(path, hdwallet.master_key)[-1]
+        expected.append(HDWallet._get_account(key["secret_key"]).address)
+    addresses = hdwallet.derive_children(account_index=3, start=5, count=count, addresses_only=True)
+    assert addresses == expected
+    assert hdwallet.derive_children(account_index=3, start=5, count=count, addresses_only=True, processes=2) == expected
+    accounts = hdwallet.derive_children(account_index=3, start=5, count=count, processes=2)
+    assert [account.address for _, account in accounts] == expected
+    assert hdwallet.derive_child(account_index=3, address_index=6)[1].address == expected[1]
+    # the account index is incremented as by derive_child
+    assert hdwallet.derive_children(count=1)[0][0] == "m/44'/457'/0'/0'/0'"
+    assert hdwallet.derive_child()[0] == "m/44'/457'/1'/0'/0'"
+
 # ref: https://github.com/satoshilabs/slips/blob/master/slip-0010.md
 def test_hdwallet_slip0010():
     test_data = [{
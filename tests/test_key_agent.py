@@ -0,0 +1,81 @@
+import os
+import stat
+import time
+
+from pytest import raises
+
+from aeternity import transactions
+from aeternity.exceptions import KeyAgentException
+from aeternity.key_agent import KeyAgent, KeyAgentClient
+from aeternity.signing import Account, open_keystores
+
+KEYSTORE = os.path.join(os.path.dirname(os.path.realpath(__file__)), "testdata", "keystore.json")
+KEYSTORE_ADDRESS = "ak_2hSFmdK98bhUw4ar7MUdTRzNQuMJfBFQYxdhN9kaiopDGqj3Cr"
+
+
+def test_key_agent_open_keystores(tempdir):
+    account = Account.generate()
+    path = os.path.join(tempdir, "account.json")
+    account.save_to_keystore_file(path, "secret")
+    keystores = [(KEYSTORE, "aeternity"), (path, "secret")]
+    accounts = open_keystores(keystores)
+    assert [a.get_address() for a in accounts] == [KEYSTORE_ADDRESS, account.get_address()]
+    accounts = open_keystores(keystores, processes=2)
+    assert [a.get_address() for a in accounts] == [KEYSTORE_ADDRESS, account.get_address()]
+    with raises(ValueError):
+        open_keystores([(KEYSTORE, "aeternity"), (path, "wrong")], processes=2)
+    assert open_keystores([]) == []
+
+
+def test_key_agent(tempdir):
+    socket_path = os.path.join(tempdir, "agent", "agent.sock")
+    agent = KeyAgent(socket_path, idle_timeout=60)
+    account = Account.generate()
+    agent.add_account(account)
+    agent.start(poll_interval=0.1)
+    try:
+        assert stat.S_IMODE(os.stat(socket_path).st_mode) == 0o600
+        # a second agent cannot replace the running one
+        with raises(KeyAgentException):
+            KeyAgent(socket_path).start()
+        client = KeyAgentClient(socket_path)
+        assert client.is_running()
+        assert client.add_keystore(KEYSTORE, "aeternity") == KEYSTORE_ADDRESS
+        with raises(KeyAgentException):
+            client.add_keystore(KEYSTORE, "wrong")
+        assert sorted(a["address"] for a in client.list()) == sorted([account.get_address(), KEYSTORE_ADDRESS])
+        # the accounts sign through the agent
+        assert client.account(path=os.path.join(tempdir, "unknown.json")) is None
+        agent_account = client.account(path=KEYSTORE)
+        assert agent_account.get_address() == KEYSTORE_ADDRESS
+        with raises(ValueError):
+            agent_account.get_secret_key()
+        agent_account = client.account(address=account.get_address())
+        assert agent_account.sign(b"data") == account.sign(b"data")
+        tx_builder = transactions.TxBuilder()
+        txs = [tx_builder.tx_spend(account.get_address(), KEYSTORE_ADDRESS, 1, "", 0, 0, nonce) for nonce in range(1, 4)]
+        signer = transactions.TxSigner(agent_account, "ae_test")
+        assert signer.sign_transactions(txs, processes=2) == transactions.TxSigner(account, "ae_test").sign_transactions(txs)
+        assert client.remove(account.get_address())
+        with raises(KeyAgentException):
+            agent_account.sign(b"data")
+        # the idle accounts are removed
+        agent.idle_timeout = 0.2
+        time.sleep(0.5)
+        assert client.list() == []
+        client.close()
+    finally:
+        agent.stop()
+    with raises(KeyAgentException):
+        KeyAgentClient(socket_path).list()
+
+
+def test_key_agent_socket_path_not_a_socket(tempdir):
+    path = os.path.join(tempdir, "agent.sock")
+    with open(path, "w") as fp:
+        fp.write("data")
+    with raises(KeyAgentException):
+        KeyAgent(path).start()
+    # the file is not removed
+    with open(path) as fp:
+        assert fp.read() == "data"
@@ -1,7 +1,15 @@
 from aeternity.signing import Account
+from aeternity.node import Config, NodeClient, AccountCache, HeightCache
+from aeternity.node_pool import NodePool
+from aeternity.exceptions import ConfigException, TransactionNotSent
+from aeternity.openapi import OpenAPIClientException
 from aeternity import defaults, identifiers, hashing, utils
 import pytest
 import random
+import time
+from munch import Munch
+
+from tests.conftest import NODE_URL, NODE_URL_DEBUG, NETWORK_ID, FORCE_COMPATIBILITY
 # from aeternity.exceptions import TransactionNotFoundException
 
 
@@ -135,3 +143,185 @@ def test_node_ga_meta_spend(chain_fixture, compiler_fixture):
     print(f"GA_META_TX {tx_hash}")
     # check that the account received the tokens
     assert ae_cli.get_account_by_pubkey(pubkey=recipient_id).balance == amount
+
+
+def test_node_config_http_session():
+    # the session is created lazily and shared by the clients using the same config
+    config = Config(http_pool_connections=2, http_pool_maxsize=32, http_connect_timeout=1, http_read_timeout=5)
+    session = config.http_session
+    assert session is config.http_session
+    adapter = session.get_adapter("http://localhost:3013")
+    assert adapter._pool_connections == 2
+    assert adapter._pool_maxsize == 32
+    assert config.http_timeout == (1, 5)
+    # disable keep-alive
+    config = Config(http_keep_alive=False)
+    assert config.http_session.headers.get("Connection") == "close"
+    # provide an external session
+    shared = Config().http_session
+    assert Config(http_session=shared).http_session is shared
+
+
+def test_node_config_nodes():
+    assert Config(external_url="http://localhost:3013").nodes is None
+    config = Config(external_url=["http://node1:3013", "http://node2:3013"], internal_url="http://node1:3113")
+    assert config.nodes == [("http://node1:3013", "http://node1:3113"), ("http://node2:3013", None)]
+    with pytest.raises(ConfigException):
+        NodeClient(Config(external_url=["http://localhost:3013"], node_pool_strategy="random"))
+
+
+def test_node_pool():
+    config = Config(external_url=[NODE_URL, "http://localhost:1"],
+                    internal_url=NODE_URL_DEBUG,
+                    network_id=NETWORK_ID,
+                    force_compatibility=FORCE_COMPATIBILITY)
+    client = NodeClient(config)
+    primary, unavailable = client.api.nodes
+    assert primary.healthy
+    assert not unavailable.healthy
+    # requests are served by the healthy node
+    assert client.get_current_key_block_height() == primary.height
+    assert client.get_status().network_id == NETWORK_ID
+    # the internal endpoints are available on the primary node
+    assert hasattr(client, "get_pending_transactions")
+
+
+def test_node_pool_background_health_check():
+    class Api:
+        def get_api_methods(self):
+            return [Munch(name="get_status", http_method="get")]
+
+        def get_status(self):
+            return Munch(top_block_height=10)
+
+    def client_factory(url, url_internal):
+        if url == "http://dead":
+            # a node that does not reply, the connection times out
+            time.sleep(0.5)
+            raise ConfigException(f"Error connecting to the node at {url}, timeout expired")
+        return Api()
+
+    pool = NodePool([("http://alive", None), ("http://dead", None)], client_factory, health_check_interval=0)
+    alive, dead = pool.nodes
+    assert alive.healthy and not dead.healthy
+    # the health checks do not delay the requests
+    start = time.time()
+    assert pool.get_status().top_block_height == 10
+    assert time.time() - start < 0.25
+    assert pool.health_check_lock.locked()
+    assert pool.get_status().top_block_height == 10
+    while pool.health_check_lock.locked():
+        time.sleep(0.05)
+    assert alive.healthy and not dead.healthy
+
+
+def test_node_spend_many(chain_fixture):
+    sender_account = chain_fixture.ALICE
+    ae_cli = chain_fixture.NODE_CLI
+    ae_cli.config.blocking_mode = False
+    recipients = [Account.generate().get_address() for _ in range(20)]
+    payments = [(recipient_id, f"{i + 1}AE") for i, recipient_id in enumerate(recipients)]
+    results = ae_cli.spend_many(sender_account, payments, max_in_flight=4)
+    assert len(results) == len(payments)
+    assert all(r.error is None for r in results)
+    # consecutive nonces in the order of the payments
+    nonces = [r.tx.data.tx.data.nonce for r in results]
+    assert nonces == list(range(nonces[0], nonces[0] + len(payments)))
+    for r in results:
+        ae_cli.wait_for_transaction(r.tx_hash)
+    for i, recipient_id in enumerate(recipients):
+        assert ae_cli.get_balance(recipient_id) == utils.amount_to_aettos(f"{i + 1}AE")
+    # invalid recipients are reported before sending anything
+    with pytest.raises(TypeError):
+        ae_cli.spend_many(sender_account, [(recipients[0], 1), ("xxx", 1)])
+
+
+def test_node_spend_many_rejected(chain_fixture, monkeypatch):
+    sender_account = chain_fixture.ALICE
+    ae_cli = chain_fixture.NODE_CLI
+    ae_cli.config.blocking_mode = False
+    rejected_nonce = ae_cli.get_next_nonce(sender_account.get_address()) + 5
+    broadcast_transaction = ae_cli.broadcast_transaction
+
+    def reject_nonce(tx):
+        if tx.data.tx.data.nonce == rejected_nonce:
+            raise OpenAPIClientException("Invalid tx", code=400)
+        return broadcast_transaction(tx)
+
+    monkeypatch.setattr(ae_cli, "broadcast_transaction", reject_nonce)
+    payments = [(Account.generate().get_address(), 1) for _ in range(10)]
+    results = ae_cli.spend_many(sender_account, payments, max_in_flight=2)
+    assert all(r.error is None for r in results[:5])
+    assert isinstance(results[5].error, OpenAPIClientException)
+    # the broadcast stops at the rejected nonce
+    assert all(isinstance(r.error, TransactionNotSent) for r in results[6:])
+    assert sender_account.nonce == rejected_nonce - 1
+    for r in results[:5]:
+        ae_cli.wait_for_transaction(r.tx_hash)
+
+
+def test_node_iter_generations(chain_fixture):
+    ae_cli = chain_fixture.NODE_CLI
+    recipient_id = Account.generate().get_address()
+    tx = ae_cli.spend(chain_fixture.ALICE, recipient_id, 100)
+    height = ae_cli.wait_for_transaction(tx)
+    top = ae_cli.get_current_key_block_height()
+    from_height = max(0, height - 3)
+    # forward and backward walks yield the same generations
+    generations = list(ae_cli.iter_generations(from_height, top, window=2))
+    assert [g.height for g in generations] == list(range(from_height, top + 1))
+    backward = list(ae_cli.iter_generations(from_height, top, reverse=True))
+    assert [g.key_block.hash for g in backward] == [g.key_block.hash for g in reversed(generations)]
+    for g in generations:
+        assert [mb.hash for mb in g.micro_blocks] == ae_cli.get_generation_by_height(height=g.height).micro_blocks
+    # the spend transaction is decoded
+    hashes = [txo.hash for txo in ae_cli.iter_transactions(height, height)]
+    assert tx.hash in hashes
+
+
+def test_node_height_cache():
+    heights = iter(range(100, 200))
+    cache = HeightCache(lambda: next(heights), max_age=60)
+    assert cache.age is None
+    assert cache.get() == 100
+    # the cached value is used until it expires
+    assert cache.get() == 100
+    assert cache.age < 60
+    # updates from external sources
+    cache.update(110)
+    assert cache.get() == 110
+    cache.update(105)
+    assert cache.get() == 110
+    # expired values are retrieved again
+    cache.max_age = 0
+    assert cache.get() == 101
+
+
+def test_node_account_cache():
+    address = Account.generate().get_address()
+    cache = AccountCache(max_age=60)
+    assert cache.get(address) is None
+    cache.put(address, identifiers.ACCOUNT_KIND_BASIC)
+    assert cache.get(address).kind == identifiers.ACCOUNT_KIND_BASIC
+    cache.put(address, identifiers.ACCOUNT_KIND_GENERALIZED, auth_fun="authorize", contract_id="ct_xyz")
+    assert cache.get(address).contract_id == "ct_xyz"
+    cache.invalidate(address)
+    assert cache.get(address) is None
+    # expired entries are dropped
+    cache.put(address, identifiers.ACCOUNT_KIND_BASIC)
+    cache.max_age = 0
+    assert cache.get(address) is None
+
+
+def test_node_sign_offline():
+    # in offline mode the declared kind of the account is used and the node is never contacted
+    spec = {"swagger": "2.0", "info": {"version": "5.5.0"}, "basePath": "/v2", "paths": {}}
+    client = NodeClient(Config(external_url="http://localhost:1", internal_url=None,
+                               network_id=NETWORK_ID, api_spec=spec, offline=True))
+    # the account cache is opt-in
+    assert client.account_cache is None
+    sender, recipient = Account.generate(), Account.generate()
+    tx = client.tx_builder.tx_spend(sender.get_address(), recipient.get_address(), 100, "", defaults.FEE, 0, 1)
+    signed_tx = client.sign_transaction(sender, tx)
+    assert len(signed_tx.data.signatures) == 1
+    assert client.verify(signed_tx.tx).hash == signed_tx.hash
@@ -0,0 +1,26 @@
+import asyncio
+from aeternity.signing import Account
+from aeternity.node_async import AsyncNodeClient
+
+
+def test_node_async_spend(chain_fixture):
+    sender = chain_fixture.ALICE
+    recipients = [Account.generate().get_address() for _ in range(5)]
+
+    async def run():
+        async with AsyncNodeClient(chain_fixture.NODE_CLI.config) as client:
+            # spend sequentially since the transactions share the sender nonce
+            txs = []
+            for r in recipients:
+                txs.append(await client.spend(sender, r, 100))
+            # wait and read concurrently
+            await asyncio.gather(*[client.wait_for_transaction(tx) for tx in txs])
+            balances = await asyncio.gather(*[client.get_balance(r) for r in recipients])
+            on_chain = await asyncio.gather(*[client.get_transaction(tx.hash) for tx in txs])
+            return txs, balances, on_chain
+
+    txs, balances, on_chain = asyncio.run(run())
+    assert balances == [100] * len(recipients)
+    for tx, tx_chain in zip(txs, on_chain):
+        assert tx.hash == tx_chain.hash
+        assert tx_chain.data.tx.data.sender_id == sender.get_address()
@@ -0,0 +1,45 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from aeternity.signing import Account
+from aeternity.nonce_manager import NonceManager
+from aeternity import utils
+
+
+def test_nonce_manager_reclaim():
+    address = Account.generate().get_address()
+    manager = NonceManager(None, reclaim_after=10)
+    # the account has mined nonce 3, and 5 and 7 are in the pending pool
+    manager._apply_sync(address, 3, {5, 7}, time.time())
+    # the gaps are used first
+    assert [manager._allocate(address) for _ in range(4)] == [4, 6, 8, 9]
+    # a released nonce is used by the next reservation
+    manager.release(address, 6)
+    assert manager._allocate(address) == 6
+    # 4 and 6 have been mined, 8 is pending, 9 is recent and not yet known to the node
+    manager._apply_sync(address, 7, {8}, time.time())
+    assert manager._allocate(address) == 10
+    # after reclaim_after seconds 9 and 10 are considered lost
+    manager._apply_sync(address, 7, {8}, time.time() + 11)
+    assert [manager._allocate(address) for _ in range(3)] == [9, 10, 11]
+    # when the pending pool cannot be retrieved the reserved nonces are kept
+    manager._apply_sync(address, 8, None, time.time() + 11)
+    assert manager._allocate(address) == 12
+    manager._apply_sync(address, 8, set(), time.time() + 11)
+    assert [manager._allocate(address) for _ in range(2)] == [9, 10]
+
+
+def test_nonce_manager_concurrent_spend(chain_fixture):
+    sender_account = chain_fixture.ALICE
+    ae_cli = chain_fixture.NODE_CLI
+    ae_cli.config.blocking_mode = False
+    ae_cli.nonce_manager = NonceManager(ae_cli)
+    recipient_account = Account.generate().get_address()
+    # send the spends from multiple threads
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        txs = list(executor.map(lambda _: ae_cli.spend(sender_account, recipient_account, "1AE"), range(40)))
+    nonces = [tx.data.tx.data.nonce for tx in txs]
+    assert len(set(nonces)) == len(nonces)
+    for tx in txs:
+        ae_cli.wait_for_transaction(tx.hash)
+    assert ae_cli.get_balance(recipient_account) == utils.amount_to_aettos("40ae")
@@ -1,5 +1,9 @@
+import os
+import json
 import pytest
-from aeternity.openapi import OpenAPICli
+from munch import Munch
+from aeternity.openapi import OpenAPICli, OpenAPIArgsException, SpecCache, load_spec, JSON_BACKENDS, get_json_decoder, lazy_munch
+from aeternity.exceptions import ConfigException
 from tests.conftest import NODE_URL, NODE_URL_DEBUG, PUBLIC_KEY
 
 client, priv_key, pub_key = None, None, None
@@ -103,3 +107,146 @@ def test_generatedcli():
             except Exception as e:
                 if not s.get("wantErr"):
                     pytest.fail(f"{c.get('method')}/{s.get('name')} wantErr = false , got {e} ")
+
+
+def test_openapi_spec_cache(tempdir):
+    spec = {
+        "swagger": "2.0",
+        "info": {"version": "5.5.0"},
+        "basePath": "/v2",
+        "paths": {
+            "/status": {"get": {"operationId": "GetStatus", "responses": {"200": {"description": "ok"}}}},
+        }
+    }
+    url = "http://localhost:3013"
+    cache = SpecCache(tempdir)
+    assert cache.get(url) is None
+    cache.put(url, spec, etag='"abc"')
+    entry = cache.get(url)
+    assert entry.get("spec") == spec
+    assert entry.get("version") == "5.5.0"
+    assert entry.get("etag") == '"abc"'
+    assert cache.is_fresh(entry)
+    assert not SpecCache(tempdir, max_age=0).is_fresh(entry)
+    # entries are keyed by url and version
+    assert cache.get("http://localhost:3014") is None
+    assert cache.get(url, version="5.5.0") == entry
+    assert cache.get(url, version="6.0.0") is None
+    # a fresh entry is used without contacting the node
+    client = OpenAPICli(url, spec_cache=cache)
+    assert client.get_version() == "5.5.0"
+    assert hasattr(client, "get_status")
+    # the replies of the node are cached only when successful
+    replies = []
+
+    class Session:
+        def get(self, url, headers=None, timeout=None):
+            status_code, body = replies.pop(0)
+            return Munch(status_code=status_code, headers={"ETag": '"def"'}, json=lambda: body)
+
+    stale_cache = SpecCache(tempdir, max_age=0)
+    replies.append((500, {"reason": "Internal error"}))
+    with pytest.raises(ConfigException):
+        OpenAPICli(url, session=Session(), spec_cache=stale_cache)
+    assert stale_cache.get(url) == entry
+    replies.append((304, None))
+    assert OpenAPICli(url, session=Session(), spec_cache=stale_cache).get_version() == "5.5.0"
+    assert stale_cache.get(url).get("etag") == '"def"'
+    # a new version of the node gets its own entry
+    new_spec = dict(spec, info={"version": "6.0.0"})
+    replies.append((200, new_spec))
+    assert OpenAPICli(url, session=Session(), spec_cache=stale_cache).get_version() == "6.0.0"
+    assert stale_cache.get(url).get("version") == "6.0.0"
+    assert stale_cache.get(url, version="5.5.0").get("spec") == spec
+    # the specification can be provided as a dict or as a file
+    client = OpenAPICli("http://localhost:1", spec=spec)
+    assert [a.name for a in client.get_api_methods()] == ["get_status"]
+    spec_file = os.path.join(tempdir, "spec.json")
+    with open(spec_file, "w") as fp:
+        json.dump(spec, fp)
+    assert load_spec(spec_file) == spec
+    with pytest.raises(ConfigException):
+        load_spec("0.0.0-missing")
+
+
+def test_openapi_compiled_request_builder():
+    def param(name, pos="path", type_="string", required=True, **kw):
+        return {"name": name, "in": pos, "type": type_, "required": required, **kw}
+
+    def op(op_id, params):
+        return {"operationId": op_id, "parameters": params, "responses": {"200": {"description": "ok"}}}
+
+    spec = {
+        "swagger": "2.0",
+        "info": {"version": "5.5.0"},
+        "basePath": "/v2",
+        "paths": {
+            "/accounts/{pubkey}": {"get": op("GetAccountByPubkey", [param("pubkey")])},
+            "/transactions/{hash}": {"get": op("GetTransactionByHash", [param("hash")])},
+            "/transactions": {"post": op("PostTransaction", [{"name": "body", "in": "body", "required": True, "schema": {"$ref": "#/definitions/Tx"}}])},
+            "/key-blocks/height/{height}": {"get": op("GetKeyBlockByHeight", [param("height", type_="integer", minimum=0)])},
+            "/names/{name}": {"get": op("GetNameEntryByName", [param("name"), param("strategy", pos="query", required=False, enum=["max", "min"])])},
+        }
+    }
+    client = OpenAPICli("http://localhost:1", spec=spec)
+    apis = {a.name: a for a in client.get_api_methods()}
+    calls = [
+        ("get_account_by_pubkey", {"pubkey": "ak_2swhLkgBPeeADxVTAVCJnZLY5NZtCFiM93JxsEaMuC59euuFRQ"}),
+        ("get_transaction_by_hash", {"hash": "th_2CKnN6EorvNiwwqRjSzXLrPLiHmcwo4Ny22dwCrSYRoD6MVGK1"}),
+        ("post_transaction", {"body": {"tx": "tx_+E8MAaEBzqet5HDJ+Z2dTkAIgKhvHUm7REti8Rqeu2S7z+tz/vOhAR8To7CL8AFABmKmi2nYdfeAPOxMCGR/btXYTHiXvVCjCoJOIIKSAQAAQAFIA3"}}),
+        ("get_key_block_by_height", {"height": 10}),
+        ("get_name_entry_by_name", {"name": "aeternity.chain", "strategy": "max"}),
+        ("get_name_entry_by_name", {"name": "aeternity.chain"}),
+    ]
+    builders = {name: client._compile_request_builder(api) for name, api in apis.items()}
+    # the compiled builders produce the same requests of the reference implementation
+    for name, kwargs in calls:
+        assert builders[name](kwargs) == client._prepare_request(apis[name], kwargs)
+    # and report the same errors
+    invalid_calls = [
+        ("get_account_by_pubkey", {}),
+        ("get_key_block_by_height", {"height": "10"}),
+        ("get_key_block_by_height", {"height": -1}),
+        ("get_name_entry_by_name", {"name": "aeternity.chain", "strategy": "avg"}),
+        ("post_transaction", {}),
+    ]
+    for name, kwargs in invalid_calls:
+        with pytest.raises(OpenAPIArgsException):
+            builders[name](kwargs)
+
+
+def test_openapi_json_backends():
+    # amounts in aettos do not fit in 64 bits
+    text = '{"balance": 100000000000000000000000, "fee": 16660000000000, "sync_progress": 99.5, "id": "ak_2swhLkgBPeeADxVTAVCJnZLY5NZtCFiM93JxsEaMuC59euuFRQ"}'
+    expected = {"balance": 100000000000000000000000, "fee": 16660000000000, "sync_progress": 99.5, "id": "ak_2swhLkgBPeeADxVTAVCJnZLY5NZtCFiM93JxsEaMuC59euuFRQ"}
+    for backend in ["auto", *JSON_BACKENDS]:
+        loads = get_json_decoder(backend)
+        assert loads(text) == expected
+        assert loads(text.encode()) == expected
+        assert type(loads(text).get("balance")) is int
+    with pytest.raises(ConfigException):
+        get_json_decoder("yaml")
+
+
+def test_openapi_lazy_responses():
+    reply = {
+        "key_block": {"height": 10, "info": {"version": 4}},
+        "micro_blocks": ["mh_1", "mh_2"],
+        "transactions": [{"hash": "th_1", "tx": {"amount": 1}}, {"hash": "th_2", "tx": {"amount": 2}}],
+    }
+    r = lazy_munch(json.loads(json.dumps(reply)))
+    assert isinstance(r, Munch)
+    # nested objects are not wrapped until accessed
+    assert type(dict.__getitem__(r, "key_block")) is dict
+    assert r.key_block.info.version == 4
+    assert r.key_block is r["key_block"]
+    assert isinstance(dict.__getitem__(r, "key_block"), Munch)
+    assert r.transactions[1].tx.amount == 2
+    assert r.get("micro_blocks") == ["mh_1", "mh_2"]
+    assert r.get("missing") is None
+    assert hasattr(r, "key_block") and not hasattr(r, "missing")
+    assert [v.height for k, v in r.items() if k == "key_block"] == [10]
+    # compatible with the Munch conversions and the json encoders
+    assert r == reply
+    assert Munch.toDict(r) == reply
+    assert json.loads(json.dumps(r)) == reply
@@ -0,0 +1,93 @@
+from munch import Munch
+
+from aeternity import transactions
+from aeternity.openapi import OpenAPIClientException
+from aeternity.pending_transactions import PendingTransactionManager
+from aeternity.signing import Account
+
+
+class PoolClient:
+    """a client of a node with a pending pool, where the transactions are mined on demand"""
+
+    def __init__(self):
+        self.config = Munch(http_pool_maxsize=4, network_id="ae_test")
+        self.tx_builder = transactions.TxBuilder()
+        self.nonce_manager = None
+        self.pool = {}
+        self.nonces = {}
+        self.posted = []
+        self.rejected = set()
+        self.pool_error = None
+
+    def post_transaction(self, body):
+        tx = self.tx_builder.parse_tx_string(body["tx"])
+        if tx.hash in self.rejected:
+            raise OpenAPIClientException("Invalid tx", code=400)
+        self.posted.append(tx.hash)
+        self.pool[tx.hash] = tx
+        return Munch(tx_hash=tx.hash)
+
+    def mine(self, sender, nonce):
+        self.nonces[sender] = nonce
+        self.pool = {h: tx for h, tx in self.pool.items() if tx.get("sender_id") != sender or tx.get("nonce") > nonce}
+
+    def get_pending_account_transactions_by_pubkey(self, pubkey):
+        if self.pool_error is not None:
+            raise OpenAPIClientException("Internal error", code=self.pool_error)
+        return Munch(transactions=[Munch(hash=h, tx=Munch(nonce=tx.get("nonce"))) for h, tx in self.pool.items() if tx.get("sender_id") == pubkey])
+
+    def get_account_by_pubkey(self, pubkey):
+        return Munch(nonce=self.nonces.get(pubkey, 0))
+
+    def sign_transaction(self, account, tx):
+        signer = transactions.TxSigner(account, self.config.network_id)
+        return self.tx_builder.tx_signed([signer.sign_transaction(tx)], tx)
+
+
+def test_pending_transactions_manager():
+    client = PoolClient()
+    account = Account.generate()
+    sender = account.get_address()
+    recipient = Account.generate().get_address()
+    manager = PendingTransactionManager(client, stuck_after=0, fee_bump_factor=2, max_fee_bumps=1)
+    txs = []
+    for nonce in [1, 2, 3, 5]:
+        tx = client.sign_transaction(account, client.tx_builder.tx_spend(sender, recipient, 100, "", 0, 0, nonce))
+        client.post_transaction({"tx": tx.tx})
+        manager.record(tx)
+        txs.append(tx)
+    # the first transaction is mined, the second is dropped, the nonce 4 is missing
+    client.mine(sender, 1)
+    del client.pool[txs[1].hash]
+    client.posted = []
+    metrics = manager.check()
+    assert metrics.depth == 3
+    assert metrics.mined == 1
+    assert metrics.dropped == 1 and metrics.rebroadcasts == 1
+    assert client.posted == [txs[1].hash]
+    assert metrics.gaps == {sender: [4]}
+    # without a signer the stuck transaction is not replaced
+    assert manager.check().fee_bumps == 0
+    # the stuck transaction is replaced with a higher fee, once
+    manager.add_signer(account)
+    client.posted = []
+    assert manager.check().fee_bumps == 1
+    assert len(client.posted) == 1
+    bumped = client.pool[client.posted[0]]
+    assert bumped.get("nonce") == 2 and bumped.get("fee") == 2 * txs[1].get("fee")
+    assert manager.check().fee_bumps == 1
+    # when the pending pool cannot be retrieved the sender is skipped
+    client.pool_error = 500
+    client.posted = []
+    metrics = manager.check()
+    assert metrics.depth == 3 and metrics.dropped == 1 and client.posted == []
+    client.pool_error = None
+    # a dropped transaction rejected by the node is forgotten
+    del client.pool[txs[2].hash]
+    client.rejected.add(txs[2].hash)
+    metrics = manager.check()
+    assert metrics.failed == 1
+    assert metrics.gaps == {sender: [3, 4]}
+    client.mine(sender, 5)
+    metrics = manager.check()
+    assert metrics.depth == 0 and metrics.mined == 3 and metrics.gaps == {}
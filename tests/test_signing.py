@@ -1,6 +1,6 @@
 from pytest import raises
 from tests import TEST_TTL
-from aeternity.signing import Account, is_signature_valid
+from aeternity.signing import Account, is_signature_valid, verify_signatures, _verify_key
 from aeternity.utils import is_valid_hash
 from aeternity import hashing, identifiers
 import os
@@ -109,3 +109,18 @@ def test_signing_get_address():
     assert(a.get_address(format=identifiers.ACCOUNT_SOFIA_FORMAT) != '8134464ef14b1433790e259d40b6ad8ca39f397a2bbc5261eeba1018a67ce35a')
     assert(a.get_address(format=identifiers.ACCOUNT_RAW_FORMAT) == b'\x814FN\xf1K\x143y\x0e%\x9d@\xb6\xad\x8c\xa3\x9f9z+\xbcRa\xee\xba\x10\x18\xa6|\xe3Z')
     assert(a.get_address(format=identifiers.ACCOUNT_RAW_FORMAT) != b'\x814FN\xf1K\x143y\x0e%\x9d@\xb6\x00\x8c\xa3\x9f9z+\xbcRa\xee\xba\x10\x18\xa6|\xe3Z')
+
+
+def test_signing_verify_signatures():
+    accounts = [Account.generate() for _ in range(3)]
+    messages = [f"message {i}".encode("utf-8") for i in range(30)]
+    signatures = [(accounts[i % 3].get_address(), accounts[i % 3].sign(msg), msg) for i, msg in enumerate(messages)]
+    _verify_key.cache_clear()
+    assert verify_signatures(signatures) == [True] * 30
+    # the verification keys are cached by account
+    assert _verify_key.cache_info().misses == 3
+    assert verify_signatures(signatures, processes=2) == [True] * 30
+    # a signature of another message or account
+    signatures[0] = (signatures[0][0], signatures[1][1], signatures[0][2])
+    signatures[2] = (accounts[1].get_address(), signatures[2][1], signatures[2][2])
+    assert verify_signatures(signatures) == [False, True, False] + [True] * 27
@@ -4,6 +4,10 @@ from aeternity import transactions, exceptions, identifiers as idf, hashing
 import pytest
 from pytest import raises
 import json
+import math
+import random
+import secrets
+import rlp
 from munch import Munch
 
 
@@ -73,6 +77,113 @@ def test_transaction_fee_calculation():
             assert(tt["want_err"])
         # get a debug transaction
 
+def _reference_min_fee(txb, tx_data, descriptor, tx_raw):
+    """the minimum fee computed re-encoding the transaction until the fee is stable"""
+    fee = descriptor.get("fee")
+    multiplier = fee.base_gas_multiplier
+    if isinstance(multiplier, tuple):
+        multiplier = multiplier[1].get(tx_data.get(multiplier[0]))
+    ttl_component = 0
+    if fee.fee_type == transactions.TTL_BASED:
+        ttl_component = math.ceil(32000 * tx_data.get(fee.ttl_field) / math.floor(60 * 24 * 365 / txb.key_block_interval))
+    tx_raw = list(tx_raw)
+    current_fee, min_fee = -1, transactions.defaults.FEE
+    while current_fee != min_fee:
+        current_fee = min_fee
+        tx_raw[descriptor.get("schema").get("fee").index] = hashing._int(current_fee)
+        tx_size = len(rlp.encode(tx_raw))
+        min_fee = (txb.base_gas * multiplier + tx_size * txb.gas_per_byte + ttl_component) * txb.gas_price
+    return min_fee
+
+
+def _random_tx_raw(descriptor, payload_size):
+    """a random rlp structure for a transaction descriptor"""
+    tx_raw = [hashing._int(random.randint(1, 255))] * (len(descriptor.get("schema")) + 1)
+    for label, fn in descriptor.get("schema").items():
+        if fn.field_type == transactions._ID:
+            tx_raw[fn.index] = secrets.token_bytes(33)
+        elif fn.field_type in (transactions._ENC, transactions._BIN, transactions._TX):
+            tx_raw[fn.index] = secrets.token_bytes(payload_size)
+        elif fn.field_type == transactions._SG:
+            tx_raw[fn.index] = [secrets.token_bytes(64)]
+        elif fn.field_type == transactions._PTR:
+            tx_raw[fn.index] = [[b"account_pubkey", secrets.token_bytes(33)]]
+        elif fn.field_type == transactions._VM_ABI:
+            tx_raw[fn.index] = secrets.token_bytes(3)
+        else:
+            tx_raw[fn.index] = hashing._int(random.choice([0, 1, 127, 128, 2 ** 32, 2 ** 70]))
+    return tx_raw
+
+
+def test_transaction_min_fee_all_descriptors():
+    random.seed(42)
+    txb = transactions.TxBuilder()
+    cases = []
+    for descriptor in transactions.tx_descriptors.values():
+        if descriptor.get("fee") is None:
+            continue
+        # the payload sizes cross the rlp length prefix boundaries
+        for payload_size in [0, 1, 20, 55, 56, 255, 256, 70000]:
+            tx_data = {
+                "abi_version": random.choice([idf.ABI_FATE, idf.ABI_SOPHIA]),
+                "oracle_ttl_value": random.randint(0, 10000),
+                "query_ttl_value": random.randint(0, 10000),
+                "response_ttl_value": random.randint(0, 10000),
+            }
+            cases.append((tx_data, descriptor, _random_tx_raw(descriptor, payload_size)))
+    for tx_data, descriptor, tx_raw in cases:
+        assert txb.compute_min_fee(tx_data, descriptor, list(tx_raw)) == _reference_min_fee(txb, tx_data, descriptor, tx_raw)
+    # a transaction of 56 bytes, a list payload of 55 bytes with a single byte prefix
+    descriptor = transactions.tx_descriptors.get((idf.OBJECT_TAG_SPEND_TRANSACTION, 1))
+    tx_raw = [b"\x0c", b"\x01", b"\x01" * 33, b"\x01" * 5, b"\x01", b"\x00", b"\x00", b"\x00", b"\x01" * 8]
+    assert len(rlp.encode(tx_raw)) == 56
+    assert txb.compute_min_fee({}, descriptor, tx_raw) == _reference_min_fee(txb, {}, descriptor, tx_raw)
+
+
+def _sample_tx_raw(tag, vsn, descriptor, inner_tx):
+    """a valid rlp structure for a transaction descriptor, with random values"""
+    tx_raw = [hashing._int(tag)] + [hashing._int(random.randint(0, 2 ** 64))] * len(descriptor.get("schema"))
+    for label, fn in descriptor.get("schema").items():
+        if label == "version":
+            tx_raw[fn.index] = hashing._int(vsn)
+        elif label == "abi_version" and fn.field_type == transactions._INT:
+            tx_raw[fn.index] = hashing._int(random.choice([idf.ABI_FATE, idf.ABI_SOPHIA]))
+        elif fn.field_type == transactions._ID:
+            tx_raw[fn.index] = hashing._int(idf.ID_PREFIX_TO_TAG.get(idf.ACCOUNT_ID)) + secrets.token_bytes(32)
+        elif fn.field_type == transactions._ENC:
+            tx_raw[fn.index] = secrets.token_bytes(random.randint(0, 200))
+        elif fn.field_type == transactions._BIN:
+            tx_raw[fn.index] = "".join(random.choices("abcdefghijklmnopqrstuvwxyz", k=16)).encode("utf-8")
+        elif fn.field_type == transactions._OTTL_TYPE:
+            tx_raw[fn.index] = hashing._int(random.choice([0, 1]))
+        elif fn.field_type == transactions._SG:
+            tx_raw[fn.index] = [secrets.token_bytes(64)]
+        elif fn.field_type == transactions._PTR:
+            tx_raw[fn.index] = [[b"account_pubkey", hashing._int(idf.ID_PREFIX_TO_TAG.get(idf.ACCOUNT_ID)) + secrets.token_bytes(32)]]
+        elif fn.field_type == transactions._VM_ABI:
+            tx_raw[fn.index] = hashing._int(random.randint(1, 7)) + hashing._int(random.randint(1, 3), 2)
+        elif fn.field_type == transactions._TX:
+            tx_raw[fn.index] = inner_tx
+    return tx_raw
+
+
+def test_transaction_rlp_round_trip_all_descriptors():
+    random.seed(42)
+    txb = transactions.TxBuilder()
+    inner_tx = hashing.decode(txb.tx_spend(Account.generate().get_address(), Account.generate().get_address(), 1, "", 0, 0, 1).tx)
+    # the field types that are decoded without loss of information
+    lossless = (transactions._INT, transactions._ID, transactions._ENC, transactions._OTTL_TYPE,
+                transactions._SG, transactions._VM_ABI, transactions._PTR, transactions._TX)
+    for (tag, vsn), descriptor in transactions.tx_descriptors.items():
+        rlp_tx = rlp.encode(_sample_tx_raw(tag, vsn, descriptor, inner_tx))
+        txo = txb._rlptx_to_txobject(rlp_tx)
+        # the original encoding is kept
+        assert hashing.decode(txo.tx) == rlp_tx
+        if all(fn.field_type in lossless or fn.data_type == str for fn in descriptor.get("schema").values()):
+            # encoding the decoded data gives back the same transaction
+            assert txb._build_txobject(txo.data).tx == txo.tx
+
+
 def test_transaction_tx_signer():
     sk = 'ed067bef18b3e2be42822b32e3fa468ceee1c8c2c8744ca15e96855b0db10199af08c7e24c71c39f119f07616621cb86d774c7af07b84e9fd82cc9592c7f7d0a'
     pk = 'ak_2L61wjvTKBKK985sbgn7vryr66K8F4ZwyUVrzYYvro85j5sCeU'
@@ -98,6 +209,43 @@ def test_transaction_tx_signer():
     assert signature != sg
 
 
+def test_transaction_sign_verify_transactions():
+    txb = transactions.TxBuilder()
+    network_id = "ae_testnet"
+    accounts = [Account.generate() for _ in range(4)]
+    txs = [txb.tx_spend(accounts[i % 4].get_address(), Account.generate().get_address(), i, "", 0, 0, i + 1) for i in range(40)]
+    signed = []
+    for account in accounts:
+        signer = transactions.TxSigner(account, network_id)
+        account_txs = [tx for tx in txs if tx.data.sender_id == account.get_address()]
+        signatures = signer.sign_transactions(account_txs)
+        assert signatures == [signer.sign_transaction(tx) for tx in account_txs]
+        assert signer.sign_transactions(account_txs, processes=2) == signatures
+        signed += [txb.tx_signed([sg], tx) for sg, tx in zip(signatures, account_txs)]
+    assert transactions.verify_transactions(signed, network_id) == [True] * len(signed)
+    assert transactions.verify_transactions(signed, network_id, processes=2) == [True] * len(signed)
+    assert transactions.verify_transactions(signed, "ae_mainnet") == [False] * len(signed)
+    # a signature of another account
+    forged = txb.tx_signed(signed[1].data.signatures, signed[0].data.tx)
+    assert transactions.verify_transactions([forged, signed[0]], network_id) == [False, True]
+    # a signature of the recipient
+    recipient = Account.generate()
+    tx = txb.tx_spend(accounts[0].get_address(), recipient.get_address(), 1, "", 0, 0, 1)
+    by_recipient = txb.tx_signed([transactions.TxSigner(recipient, network_id).sign_transaction(tx)], tx)
+    assert transactions.verify_transactions([by_recipient], network_id) == [False]
+    # a signature of the hash of the transaction, accepted since lima
+    data = hashing._binary(network_id) + hashing.hash(hashing.decode(tx.tx))
+    by_hash = txb.tx_signed([hashing.encode(idf.SIGNATURE, accounts[0].sign(data))], tx)
+    assert transactions.verify_transactions([by_hash], network_id) == [True]
+    # a signature in excess
+    extra = txb.tx_signed(by_hash.data.signatures + by_recipient.data.signatures, tx)
+    assert transactions.verify_transactions([extra], network_id) == [False]
+    # the transactions without signatures cannot be verified
+    assert transactions.verify_transactions([txb.tx_signed([], txs[0])], network_id) == [None]
+    with raises(TypeError):
+        transactions.verify_transactions([txs[0]], network_id)
+
+
 def test_transaction_tx_object_signed():
     sk = 'ed067bef18b3e2be42822b32e3fa468ceee1c8c2c8744ca15e96855b0db10199af08c7e24c71c39f119f07616621cb86d774c7af07b84e9fd82cc9592c7f7d0a'
     pk = 'ak_2L61wjvTKBKK985sbgn7vryr66K8F4ZwyUVrzYYvro85j5sCeU'
@@ -116,6 +264,61 @@ def test_transaction_tx_object_signed():
     assert txs.get("signatures")[0] == sg
 
 
+def test_transaction_tx_object_lazy_index():
+    txb = transactions.TxBuilder()
+    sender_id = Account.generate().get_address()
+    txo = txb.tx_spend(sender_id, sender_id, 100, "", 0, 0, 1)
+    txs = txb.tx_signed(["sg_Tzrf8pDzK53RVfiTdr3GnM86E4jWoGmA2RR6XaCws4PFfnbUTGQ2adRWc8Y55NpxXBaEYD5b1FP5RzNST1GpBZUVfZrLo"], txo)
+    assert not hasattr(txs, "__dict__")
+    # the index is built on first access
+    assert txs._index is None
+    assert txs.get("amount") == 100
+    assert txs.get("sender_id") == sender_id
+    assert txs.meta("min_fee") is None
+    assert txo.meta("min_fee") == txo.get("fee")
+    assert txs._index is not None
+    # the index follows the changes of the metadata
+    txs.set_metadata({"salt": 42})
+    assert txs.meta("salt") == 42
+    # the data is not shared with the input dictionary
+    data = {"tag": idf.OBJECT_TAG_SPEND_TRANSACTION, "pointers": [{"key": "account_pubkey", "id": sender_id}]}
+    txo = transactions.TxObject(data=data)
+    data["pointers"].append({})
+    assert len(txo.data.pointers) == 1
+    assert txo.data.pointers[0].id == sender_id
+
+
+def test_transaction_parse_transactions():
+    txb = transactions.TxBuilder()
+    account = Account.generate()
+    signer = transactions.TxSigner(account, "ae_testnet")
+    encoded_txs = []
+    for nonce in range(1, 11):
+        tx = txb.tx_spend(account.get_address(), Account.generate().get_address(), nonce, "payload", 0, 0, nonce)
+        encoded_txs.append(txb.tx_signed([signer.sign_transaction(tx)], tx).tx)
+    expected = [txb.parse_tx_string(tx) for tx in encoded_txs]
+    # a micro block transactions reply
+    reply = Munch.fromDict({"transactions": [{
+        "block_height": 10,
+        "hash": txo.hash,
+        "signatures": txo.get("signatures"),
+        "tx": {**Munch.toDict(txo.data.tx.data), "type": "SpendTx"},
+    } for txo in expected]})
+    for txos in [txb.parse_transactions(encoded_txs), txb.parse_transactions(reply), txb.parse_transactions(encoded_txs, processes=2)]:
+        assert [txo.tx for txo in txos] == encoded_txs
+        assert [txo.hash for txo in txos] == [txo.hash for txo in expected]
+        assert [txo.data.tx.meta("min_fee") for txo in txos] == [txo.data.tx.meta("min_fee") for txo in expected]
+    # the min fee of the parsed transactions is computed on first access
+    txos = txb.parse_transactions(encoded_txs)
+    assert "min_fee" not in txos[0].data.tx._metadata
+    assert txos[0].data.tx.meta("min_fee") == expected[0].data.tx.meta("min_fee") > 0
+    assert txos[1].data.tx.metadata.min_fee == txos[1].data.tx.asdict()["metadata"]["min_fee"] > 0
+    # skip the fee and the hash computation
+    txos = txb.parse_transactions(encoded_txs, compute_fee=False, compute_hash=False)
+    assert [txo.tx for txo in txos] == encoded_txs
+    assert all(txo.hash is None and txo.data.tx.meta("min_fee") is None for txo in txos)
+
+
 def test_transaction_tx_object_spend():
     amount=1870600000000000000
     fee=20500000000000
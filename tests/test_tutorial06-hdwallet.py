@@ -19,4 +19,10 @@ def test_tutorial_hdwallet():
     # By default, every time you generate a child key, the account index is auto generated
     key_path, account = hdwallet.derive_child()
 
-    assert key_path is not None and account is not None
\ No newline at end of file
+    assert key_path is not None and account is not None
+    # Derive many addresses of an account at once
+    # the keys shared by the addresses are derived once, the derivation can run on many processes
+    # and only the addresses are returned if you do not need the accounts
+    addresses = hdwallet.derive_children(account_index=0, start=0, count=100, addresses_only=True)
+
+    assert len(addresses) == 100
@@ -115,3 +115,16 @@ def test_utils_amount_to_aettos():
         else:
             got = utils.amount_to_aettos(a[0])
             assert got == expected
+
+
+def _double_batch(items, offset):
+    return [2 * i + offset for i in items]
+
+
+def test_utils_map_chunks():
+    items = list(range(50))
+    expected = [2 * i + 1 for i in items]
+    assert utils.map_chunks(_double_batch, items, None, 1) == expected
+    assert utils.map_chunks(_double_batch, items, 2, 1) == expected
+    assert utils.map_chunks(_double_batch, range(50), 3, 1) == expected
+    assert utils.map_chunks(_double_batch, [], 2, 1) == []